@@ -0,0 +1,295 @@
+import argparse
+import math
+import sys
+import time
+import numpy as np
+import estadisticas
+import generadores
+'''
+Pruebas de independencia para las uniformes del TP2, pensadas para muestras muy grandes
+(10**8 valores o más): la secuencia se genera y se analiza de a bloques, en una sola
+pasada, sin guardarla.
+
+- Autocorrelación en los retardos 1..K: con pocos retardos (K <= 64) un producto escalar
+  por retardo, y con más por FFT sobre tramos de ~8K valores (más los K anteriores), con
+  costo O(n log K) en lugar de O(n·K).
+- Prueba de corridas arriba/abajo (cantidad total de corridas y distribución de largos).
+- Chi-cuadrado de pares seriales: pares (x_2i, x_2i+1) no solapados en una grilla d×d.
+- Opcionalmente, las mismas pruebas sobre un bit del valor entero de 32 bits (floor(u·2**32)).
+  En el LCG módulo 2**32 el bit k tiene período 2**(k+1), así que los bits bajos son malos.
+
+Uso por lotes: python analisis.py -n 100000000 --generador lcg --retardos 32 --bit 0
+'''
+
+# Largo máximo de corrida que se informa por separado (los más largos van juntos)
+LARGO_CORRIDAS = 6
+
+# Hasta esta cantidad de retardos la autocorrelación con un producto escalar por retardo es
+# más rápida que por FFT (ver verificar_analisis en benchmarks.py). Los productos se hacen
+# por tramos de TRAMO_DIRECTA valores (512 KB), que se releen desde la caché en cada retardo
+RETARDOS_DIRECTA = 64
+TRAMO_DIRECTA = 65536
+
+
+def _largo_fft(minimo):
+    # Menor 2**a * 3**b que no es menor que 'minimo' (tamaños rápidos para la FFT de numpy)
+    mejor = 1 << max(minimo - 1, 0).bit_length()
+    potencia_tres = 1
+    while potencia_tres < mejor:
+        largo = potencia_tres
+        while largo < minimo:
+            largo *= 2
+        mejor = min(mejor, largo)
+        potencia_tres *= 3
+    return mejor
+
+
+def _p_valor_normal(z):
+    # P(|Z| > |z|) para Z normal estándar
+    erfc = np.frompyfunc(math.erfc, 1, 1)
+    return np.asarray(erfc(np.abs(np.asarray(z, dtype=np.float64)) / math.sqrt(2.0)), dtype=np.float64)
+
+
+class AutocorrelacionIncremental:
+    """
+    Sumas Σ (x_i - media)(x_i+k - media) para k = 1..max_lag, acumuladas bloque a bloque.
+    Con hasta RETARDOS_DIRECTA retardos se hace un producto escalar por retardo entre el
+    bloque y el bloque con los max_lag valores anteriores, de a tramos. Con más, cada bloque
+    se parte en tramos cortos; cada tramo se correlaciona por FFT con él mismo más los
+    max_lag valores anteriores, y los espectros de todos los tramos se suman antes de una
+    sola FFT inversa. Así se cuentan todos los pares exactamente una vez, sin importar
+    cómo se corte la secuencia, con FFT chicas (que entran en la caché) en lugar de una
+    del tamaño del bloque.
+    Se centra con la media y varianza teóricas (0,5 y 1/12 para U[0;1)): bajo independencia
+    r_k·sqrt(n - k) es aproximadamente normal estándar.
+    """
+
+    def __init__(self, max_lag, media=0.5, varianza=1.0 / 12.0):
+        self.max_lag = max_lag
+        self.media = media
+        self.varianza = varianza
+        self.sumas = np.zeros(max_lag + 1)
+        # Antes del primer valor se supone una cola de ceros (centrados), que no suma nada
+        self.cola = np.zeros(max_lag)
+        self.total = 0
+        # Cada tramo ocupa una FFT de 'largo' puntos: max_lag valores anteriores más el tramo
+        self.largo = _largo_fft(max(8 * max_lag, 4096))
+        self.tramo = self.largo - max_lag
+        self.directa = max_lag <= RETARDOS_DIRECTA
+
+    def actualizar(self, bloque):
+        x = np.asarray(bloque, dtype=np.float64) - self.media
+        if len(x) == 0:
+            return
+        if self.directa:
+            # segmento[max_lag + j] es x[j]; el valor k lugares antes está en segmento[max_lag - k + j]
+            segmento = np.concatenate((self.cola, x))
+            for inicio in range(0, len(x), TRAMO_DIRECTA):
+                tramo = x[inicio:inicio + TRAMO_DIRECTA]
+                for k in range(1, self.max_lag + 1):
+                    desde = self.max_lag - k + inicio
+                    self.sumas[k] += np.dot(tramo, segmento[desde:desde + len(tramo)])
+            self.cola = segmento[len(x):].copy()
+            self.total += len(x)
+            return
+        filas = -(-len(x) // self.tramo)
+        segmento = np.zeros(self.max_lag + filas * self.tramo)
+        segmento[:self.max_lag] = self.cola
+        segmento[self.max_lag:self.max_lag + len(x)] = x
+        # Fila r: los max_lag valores anteriores al tramo r y el tramo (completado con ceros)
+        ventanas = np.lib.stride_tricks.sliding_window_view(segmento, self.largo)[::self.tramo]
+        espectro_ventanas = np.fft.rfft(ventanas, axis=1)
+        espectro_tramos = np.fft.rfft(ventanas[:, self.max_lag:], self.largo, axis=1)
+        # Correlación circular: c[d] = Σ_j tramo[j] · ventana[j + d]; el retardo k es d = max_lag - k
+        # (con largo >= max_lag + tramo no hay vuelta)
+        correlacion = np.fft.irfft(np.sum(np.conj(espectro_tramos) * espectro_ventanas, axis=0), self.largo)
+        self.sumas[1:] += correlacion[self.max_lag - np.arange(1, self.max_lag + 1)]
+        self.cola = np.concatenate((self.cola, x))[-self.max_lag:]
+        self.total += len(x)
+
+    def resultado(self):
+        retardos = np.arange(1, self.max_lag + 1)
+        pares = np.maximum(self.total - retardos, 1)
+        r = self.sumas[1:] / pares / self.varianza
+        z = r * np.sqrt(pares)
+        return {"retardos": retardos, "r": r, "z": z, "p": _p_valor_normal(z)}
+
+
+def autocorrelacion_directa(x, max_lag, media=0.5, varianza=1.0 / 12.0):
+    # Versión O(n·K) con un producto escalar por retardo, para comparar
+    x = np.asarray(x, dtype=np.float64) - media
+    return np.array([np.dot(x[:-k], x[k:]) / (len(x) - k) / varianza for k in range(1, max_lag + 1)])
+
+
+class CorridasIncrementales:
+    """
+    Prueba de corridas arriba/abajo: una corrida es un tramo de diferencias consecutivas
+    con el mismo signo. Para n valores independientes la cantidad de corridas tiene media
+    (2n - 1)/3 y varianza (16n - 29)/90. También se cuentan los largos (los empates cuentan
+    como bajada; con 32 bits o más casi no hay).
+    """
+
+    def __init__(self):
+        self.ultimo = None
+        self.direccion = None
+        self.largo_actual = 0
+        self.largos = np.zeros(LARGO_CORRIDAS + 1, dtype=np.int64)
+        self.total = 0
+
+    def actualizar(self, bloque):
+        x = np.asarray(bloque)
+        if len(x) == 0:
+            return
+        self.total += len(x)
+        segmento = x if self.ultimo is None else np.concatenate(([self.ultimo], x))
+        self.ultimo = x[-1]
+        if len(segmento) < 2:
+            return
+        direcciones = segmento[1:] > segmento[:-1]
+        inicios = np.flatnonzero(direcciones[1:] != direcciones[:-1]) + 1
+        if self.direccion is not None and direcciones[0] != self.direccion:
+            inicios = np.concatenate(([0], inicios))
+        if len(inicios) > 0:
+            terminadas = np.diff(inicios, prepend=0)
+            terminadas[0] += self.largo_actual
+            terminadas = terminadas[terminadas > 0]
+            self.largos += np.bincount(np.minimum(terminadas, LARGO_CORRIDAS), minlength=LARGO_CORRIDAS + 1)
+            self.largo_actual = len(direcciones) - inicios[-1]
+        else:
+            self.largo_actual += len(direcciones)
+        self.direccion = direcciones[-1]
+
+    def resultado(self):
+        largos = self.largos.copy()
+        if self.largo_actual > 0:
+            largos[min(self.largo_actual, LARGO_CORRIDAS)] += 1
+        n = self.total
+        corridas = int(largos.sum())
+        media = (2 * n - 1) / 3
+        desvio = math.sqrt(max((16 * n - 29) / 90, 1e-300))
+        z = (corridas - media) / desvio
+        # Cantidad esperada de corridas de largo k (Levene y Wolfowitz); la última clase es ≥ k
+        esperadas = np.array([0.0] + [2 * (n * (k * k + 3 * k + 1) - (k ** 3 + 3 * k * k - k - 4)) / math.factorial(k + 3)
+                                      for k in range(1, LARGO_CORRIDAS)])
+        esperadas = np.append(esperadas, media - esperadas.sum())
+        return {"corridas": corridas, "esperadas": media, "z": z, "p": float(_p_valor_normal(z)),
+                "largos": largos[1:], "largos_esperados": esperadas[1:]}
+
+
+class ParesSeriales:
+    """
+    Chi-cuadrado de pares seriales: los pares no solapados (x_2i, x_2i+1) se cuentan en una
+    grilla de divisiones × divisiones celdas, que bajo independencia son equiprobables
+    (divisiones**2 - 1 grados de libertad). Si un bloque tiene cantidad impar, el último
+    valor espera al bloque siguiente.
+    """
+
+    def __init__(self, divisiones=16):
+        self.divisiones = divisiones
+        self.counts = np.zeros(divisiones * divisiones, dtype=np.int64)
+        self.pendiente = np.empty(0)
+
+    def actualizar(self, bloque):
+        x = np.concatenate((self.pendiente, np.asarray(bloque, dtype=np.float64)))
+        pares = len(x) // 2
+        self.pendiente = x[2 * pares:]
+        celdas = np.minimum((x[:2 * pares] * self.divisiones).astype(np.intp), self.divisiones - 1)
+        self.counts += np.bincount(celdas[0::2] * self.divisiones + celdas[1::2],
+                                   minlength=self.divisiones * self.divisiones)
+
+    def resultado(self):
+        esperadas = np.full(len(self.counts), self.counts.sum() / len(self.counts))
+        chi2, p, grados_libertad = estadisticas.chi_cuadrado(self.counts, esperadas)
+        return {"counts": self.counts.reshape(self.divisiones, self.divisiones), "chi2": float(chi2),
+                "p": float(p), "grados_libertad": grados_libertad}
+
+
+def extraer_bit(u, bit):
+    # Bit 'bit' de floor(u·2**32) (0 es el menos significativo), como 0,25 o 0,75 para que
+    # las pruebas de pares con 2 divisiones lo traten como una uniforme de dos valores
+    enteros = (np.asarray(u) * 2.0**32).astype(np.uint64)
+    return ((enteros >> np.uint64(bit)) & np.uint64(1)).astype(np.float64) * 0.5 + 0.25
+
+
+def analizar(semilla, tamaño_muestra, generador="lcg", max_lag=32, divisiones=16, bit=None,
+             tamaño_bloque=generadores.TAMAÑO_BLOQUE_MUESTRA, progreso=None):
+    """
+    Genera tamaño_muestra uniformes de la fuente elegida de a bloques y les aplica las
+    pruebas en una sola pasada. Con 'bit' se analiza además ese bit de cada valor
+    (autocorrelación y pares con 2 divisiones). progreso(hechos, total) se llama después
+    de cada bloque.
+    """
+    autocorrelacion = AutocorrelacionIncremental(max_lag)
+    corridas = CorridasIncrementales()
+    pares = ParesSeriales(divisiones)
+    if bit is not None:
+        autocorrelacion_bit = AutocorrelacionIncremental(max_lag, varianza=1.0 / 16.0)
+        pares_bit = ParesSeriales(2)
+
+    for inicio in range(0, tamaño_muestra, tamaño_bloque):
+        u = generadores.uniformes(semilla, inicio, min(tamaño_bloque, tamaño_muestra - inicio), generador)
+        autocorrelacion.actualizar(u)
+        corridas.actualizar(u)
+        pares.actualizar(u)
+        if bit is not None:
+            bits = extraer_bit(u, bit)
+            autocorrelacion_bit.actualizar(bits)
+            pares_bit.actualizar(bits)
+        if progreso is not None:
+            progreso(inicio + len(u), tamaño_muestra)
+
+    resultado = {"autocorrelacion": autocorrelacion.resultado(), "corridas": corridas.resultado(),
+                 "pares": pares.resultado()}
+    if bit is not None:
+        resultado["bit"] = {"bit": bit, "autocorrelacion": autocorrelacion_bit.resultado(),
+                            "pares": pares_bit.resultado()}
+    return resultado
+
+
+def _imprimir_autocorrelacion(resultado, mostrar):
+    orden = np.argsort(resultado["p"])[:mostrar]
+    for i in sorted(orden):
+        print(f"  retardo {resultado['retardos'][i]:3d}: r = {resultado['r'][i]: .6f}  z = {resultado['z'][i]: 8.2f}"
+              f"  p = {resultado['p'][i]:.4f}")
+    # Con K retardos se espera que alguno tenga p < 0,05 por azar: se informa el mínimo corregido
+    print(f"  p mínimo corregido (Bonferroni, {len(resultado['p'])} retardos): "
+          f"{min(1.0, resultado['p'].min() * len(resultado['p'])):.4f}")
+
+
+def main(argumentos=None):
+    parser = argparse.ArgumentParser(description="Pruebas de independencia de las uniformes del TP2")
+    parser.add_argument("-n", "--tamano", type=int, default=10**8, help="Cantidad de uniformes")
+    parser.add_argument("--semilla", type=int, default=12345)
+    parser.add_argument("--generador", choices=generadores.GENERADORES, default="lcg")
+    parser.add_argument("--retardos", type=int, default=32, help="Retardo máximo de la autocorrelación")
+    parser.add_argument("--divisiones", type=int, default=16, help="Divisiones por eje de los pares seriales")
+    parser.add_argument("--bit", type=int, help="Analizar también este bit de floor(u·2**32)")
+    parser.add_argument("--bloque", type=int, default=generadores.TAMAÑO_BLOQUE_MUESTRA)
+    args = parser.parse_args(argumentos)
+
+    inicio = time.perf_counter()
+    resultado = analizar(args.semilla, args.tamano, args.generador, args.retardos, args.divisiones, args.bit,
+                         args.bloque)
+    print(f"{args.generador}, semilla {args.semilla}, n = {args.tamano}:")
+    print("Autocorrelación (retardos con menor p-valor):")
+    _imprimir_autocorrelacion(resultado["autocorrelacion"], 5)
+    corridas = resultado["corridas"]
+    print(f"Corridas arriba/abajo: {corridas['corridas']} (esperadas {corridas['esperadas']:.1f}), "
+          f"z = {corridas['z']:.2f}, p = {corridas['p']:.4f}")
+    print("  largos 1.." + str(LARGO_CORRIDAS) + "+: " + ", ".join(
+        f"{o} ({e:.0f})" for o, e in zip(corridas["largos"], corridas["largos_esperados"])))
+    pares = resultado["pares"]
+    print(f"Pares seriales {args.divisiones}x{args.divisiones}: chi2 = {pares['chi2']:.2f} "
+          f"({pares['grados_libertad']} g.l.), p = {pares['p']:.4f}")
+    if args.bit is not None:
+        print(f"Bit {args.bit}:")
+        _imprimir_autocorrelacion(resultado["bit"]["autocorrelacion"], 3)
+        pares_bit = resultado["bit"]["pares"]
+        print(f"  pares 2x2: {pares_bit['counts'].ravel().tolist()}, chi2 = {pares_bit['chi2']:.2f}, "
+              f"p = {pares_bit['p']:.4f}")
+    print(f"{time.perf_counter() - inicio:.1f} s", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
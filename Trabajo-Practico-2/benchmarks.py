@@ -0,0 +1,423 @@
+import time
+import analisis
+import distribuciones
+import generadores
+import estadisticas
+import exportar
+'''
+Verificaciones y mediciones de rendimiento del núcleo de generación del TP2.
+
+Uso: python benchmarks.py
+'''
+
+
+def medir(funcion, *args, repeticiones=3):
+    # Devuelve el mejor tiempo (en segundos) de varias ejecuciones
+    mejor = float("inf")
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        funcion(*args)
+        mejor = min(mejor, time.perf_counter() - inicio)
+    return mejor
+
+
+def verificar_paridad_rnd():
+    # El motor vectorizado tiene que dar exactamente la misma secuencia que el bucle
+    semillas = [0, 1, 12345, 4294967295, 4294967295 + 1000]
+    tamaños = [0, 1, 1000, generadores.TAMAÑO_BLOQUE, generadores.TAMAÑO_BLOQUE + 1, 200001]
+    for semilla in semillas:
+        for n in tamaños:
+            vectorizado = generadores.generar_rnd(semilla, n)
+            referencia = generadores.generar_rnd_bucle(semilla, n)
+            assert vectorizado.tolist() == referencia, f"Diferencia con semilla={semilla}, n={n}"
+    print("generar_rnd: paridad exacta con el bucle original [OK]")
+
+
+def rendimiento_rnd(n=1000000, objetivo=20):
+    t_bucle = medir(generadores.generar_rnd_bucle, 12345, n, repeticiones=1)
+    t_vector = medir(generadores.generar_rnd, 12345, n)
+    aceleracion = t_bucle / t_vector
+    estado = "OK" if aceleracion >= objetivo else "POR DEBAJO DEL OBJETIVO"
+    print(f"generar_rnd n={n}: bucle {t_bucle:.3f} s, vectorizado {t_vector:.4f} s, "
+          f"{aceleracion:.1f}x (objetivo {objetivo}x) [{estado}]")
+
+
+def verificar_salto():
+    # Saltar k pasos tiene que coincidir con avanzar el generador k veces
+    for semilla in [0, 7, 4294967295]:
+        for k in [0, 1, 2, 3, 1000, 65537]:
+            estado = semilla % generadores.M_LCG
+            for _ in range(k):
+                estado = (generadores.A_LCG * estado + generadores.C_LCG) % generadores.M_LCG
+            assert generadores.saltar_estado(semilla, k) == estado, f"Salto incorrecto k={k}"
+    # La concatenación de los subflujos reproduce la secuencia serial
+    serial = generadores.generar_rnd(2025, 1000003)
+    for partes in [1, 2, 7]:
+        tramos = [generadores.generar_rnd(e, c) for e, c in generadores.dividir_semilla(2025, 1000003, partes)]
+        assert (generadores.np.concatenate(tramos) == serial).all(), f"Subflujos distintos con {partes} partes"
+    paralelo = generadores.generar_rnd_paralelo(2025, 1000003, procesos=4)
+    assert (paralelo == serial).all(), "La generación paralela no reproduce la serial"
+    print("saltar_estado / generar_rnd_paralelo: reproducen la secuencia serial [OK]")
+
+
+def rendimiento_paralelo(n=50000000, procesos=4):
+    t_serial = medir(generadores.generar_rnd, 12345, n, repeticiones=1)
+    t_paralelo = medir(generadores.generar_rnd_paralelo, 12345, n, procesos, repeticiones=1)
+    print(f"generar_rnd n={n}: serial {t_serial:.2f} s, paralelo ({procesos} procesos) {t_paralelo:.2f} s")
+
+
+def verificar_normal():
+    # Box-Muller vectorizado contra el bucle original. numpy y math pueden diferir en el
+    # último bit del logaritmo, por eso se compara con tolerancia y después del redondeo
+    # a 4 decimales que aplica la interfaz
+    u = generadores.generar_rnd(1000, 1000000)
+    vectorizado = generadores.generar_normal(u, 10, 2)
+    referencia = generadores.np.array(generadores.generar_normal_bucle(u.tolist(), 10, 2))
+    diferencia = generadores.np.abs(vectorizado - referencia).max()
+    assert diferencia < 1e-12, f"Box-Muller difiere en {diferencia}"
+    assert (generadores.np.round(vectorizado, 4) == generadores.np.round(referencia, 4)).all()
+    print(f"generar_normal box_muller: diferencia máxima {diferencia:.1e}, igual tras redondear [OK]")
+
+
+def informe_normal(n=3000000):
+    u = generadores.generar_rnd(2025, n)
+    t_bucle = medir(generadores.generar_normal_bucle, u.tolist(), 0, 1, repeticiones=1)
+    print(f"generar_normal bucle original: {n / t_bucle:,.0f} muestras/s")
+    for metodo in generadores.METODOS_NORMAL:
+        generadores.generar_normal(u, 0, 1, metodo)  # Arma las tablas antes de medir
+        z, informe = generadores.generar_normal(u, 0, 1, metodo, devolver_informe=True)
+        print(f"generar_normal {metodo}: {informe['muestras_por_seg']:,.0f} muestras/s, "
+              f"rechazo {informe['tasa_rechazo']:.2%}, media {z.mean():.4f}, desvío {z.std():.4f}")
+
+
+def verificar_reserva_ziggurat(n=3000000):
+    # Con la reserva casi vacía, los intentos de la cola rechazados se tienen que repetir con
+    # uniformes de intentos descartados del final, no perderse: todo intento que queda con
+    # |x| >= r en la capa 0 termina como un valor de la cola
+    np = generadores.np
+    u = generadores.generar_rnd(5, n)
+    x_tabla, _ = generadores._tabla_ziggurat_normal()
+    for tamaño_reserva in [0, 5, None]:
+        z, intentos, usadas = generadores._normal_ziggurat(u, tamaño_reserva)
+        capa = (u[0:3 * intentos:3] * generadores.CAPAS_ZIGGURAT).astype(np.intp)
+        x = (2.0 * u[1:3 * intentos:3] - 1.0) * x_tabla[capa]
+        en_cola = ((capa == 0) & (np.abs(x) >= x_tabla[1])).sum()
+        assert usadas <= n and np.isfinite(z).all(), f"Uniformes de más con reserva {tamaño_reserva}"
+        assert (np.abs(z) > generadores.R_ZIGGURAT_NORMAL).sum() == en_cola, \
+            f"Intentos de la cola perdidos con reserva {tamaño_reserva}"
+    print(f"generar_normal ziggurat: reserva agotada sin perder intentos de la cola ({en_cola}) [OK]")
+
+
+def verificar_exponencial(n=1000000, lambda_val=2.5):
+    np = generadores.np
+    u = generadores.generar_rnd(77, n)
+    exacta = np.array(generadores.generar_exponencial_bucle(u.tolist(), lambda_val))
+
+    # Transformada inversa en el lugar contra la transformada exacta con math
+    salida = np.empty(n)
+    inversa = generadores.generar_exponencial(u, lambda_val, salida=salida)
+    assert inversa is salida, "La transformada inversa no escribió en el buffer recibido"
+    error_relativo = (np.abs(inversa - exacta) / np.maximum(exacta, 1e-300)).max()
+    assert error_relativo < 1e-12, f"Error relativo {error_relativo}"
+    print(f"generar_exponencial inversa: error relativo máximo {error_relativo:.1e} [OK]")
+
+    # El ziggurat no usa las mismas uniformes, se compara la distribución (estadístico KS)
+    ziggurat = np.sort(generadores.generar_exponencial(generadores.generar_rnd(77, 3 * n), lambda_val,
+                                                        metodo="ziggurat"))
+    teorica = 1.0 - np.exp(-lambda_val * ziggurat)
+    empirica = np.arange(1, len(ziggurat) + 1) / len(ziggurat)
+    ks = np.abs(teorica - empirica).max()
+    limite = 1.95 / np.sqrt(len(ziggurat))  # Valor crítico al 0,1%
+    estado = "OK" if ks < limite else "FALLA"
+    print(f"generar_exponencial ziggurat: KS {ks:.5f} (crítico 0,1% {limite:.5f}) [{estado}]")
+
+    t_bucle = medir(generadores.generar_exponencial_bucle, u.tolist(), lambda_val, repeticiones=1)
+    t_inversa = medir(generadores.generar_exponencial, u, lambda_val, salida)
+    u3 = generadores.generar_rnd(77, 3 * n)
+    t_ziggurat = medir(lambda: generadores.generar_exponencial(u3, lambda_val, metodo="ziggurat"))
+    print(f"generar_exponencial: bucle {n / t_bucle:,.0f}/s, inversa {n / t_inversa:,.0f}/s, "
+          f"ziggurat {len(ziggurat) / t_ziggurat:,.0f}/s")
+
+
+def verificar_flujo(n=2500001, n_bins=15):
+    # Las frecuencias calculadas por bloques tienen que ser iguales a las de la muestra completa
+    np = generadores.np
+    casos = [("uniforme", {"a": 2, "b": 5}),
+             ("exponencial", {"lambda_val": 0.7}),
+             ("normal", {"mu": 1, "sigma": 2, "metodo": "ziggurat"})]
+    for distribucion, parametros in casos:
+        bosquejo = generadores.BosquejoCuantiles()
+        muestra = generadores.generar_muestra(distribucion, parametros, 123, n, bosquejo=bosquejo)
+        max_val = bosquejo.percentil(99.5) if distribucion == "exponencial" else None
+        bins = generadores.calcular_intervalos(distribucion, parametros, n_bins, max_val)
+        esperados, _ = np.histogram(muestra, bins=bins)
+        counts, bins_flujo = generadores.tabla_frecuencias_flujo(distribucion, parametros, 123, n, n_bins,
+                                                                 tamaño_bloque=100000)
+        assert (bins_flujo == bins).all() and (counts == esperados).all(), f"Diferencias en {distribucion}"
+    print("tabla_frecuencias_flujo: igual a la muestra completa [OK]")
+
+
+def verificar_bosquejo(n=2000001):
+    # El percentil estimado tiene que estar dentro del error relativo del bosquejo (más la
+    # resolución del redondeo a 4 decimales), y el bosquejo combinado desde varios procesos
+    # tiene que ser idéntico al armado en serie
+    np = generadores.np
+    parametros = {"lambda_val": 0.5}
+    bosquejo = generadores.BosquejoCuantiles(error_relativo=0.001)
+    muestra = generadores.generar_muestra("exponencial", parametros, 31, n, bosquejo=bosquejo)
+    for q in [1, 50, 90, 99.5]:
+        estimado, exacto = bosquejo.percentil(q), np.percentile(muestra, q)
+        assert abs(estimado - exacto) <= 0.001 * exacto + 1e-4, f"Percentil {q}: {estimado} vs {exacto}"
+    paralelo = generadores.bosquejo_paralelo("exponencial", parametros, 31, n, procesos=3)
+    assert paralelo.percentil(99.5) == bosquejo.percentil(99.5) and paralelo.total == n
+    t_percentil = medir(np.percentile, muestra, 99.5)
+    t_bosquejo = medir(lambda: generadores.BosquejoCuantiles().actualizar(muestra))
+    print(f"BosquejoCuantiles: p99.5 {bosquejo.percentil(99.5):.4f} vs exacto {np.percentile(muestra, 99.5):.4f}, "
+          f"combinable en paralelo [OK] (np.percentile {t_percentil * 1000:.1f} ms, "
+          f"bosquejo {t_bosquejo * 1000:.1f} ms)")
+
+
+def verificar_tipos(n=2000001):
+    # Con float32 la muestra ocupa la mitad; la tabla por bloques, la de la muestra completa y
+    # la del índice ordenado tienen que coincidir también con ese tipo de dato
+    np = generadores.np
+    parametros = {"lambda_val": 0.5}
+    for dtype in (np.float64, np.float32):
+        bosquejo = generadores.BosquejoCuantiles()
+        inicio = time.perf_counter()
+        muestra = generadores.generar_muestra("exponencial", parametros, 8, n, bosquejo=bosquejo, dtype=dtype)
+        segundos = time.perf_counter() - inicio
+        bins = generadores.calcular_intervalos("exponencial", parametros, 20, bosquejo.percentil(99.5))
+        counts, _ = generadores.tabla_frecuencias_flujo("exponencial", parametros, 8, n, 20, tamaño_bloque=300000,
+                                                        dtype=dtype)
+        assert muestra.dtype == dtype
+        assert (counts == np.histogram(muestra, bins)[0]).all()
+        assert (generadores.IndiceOrdenado(muestra).contar(bins) == counts).all()
+        print(f"generar_muestra {np.dtype(dtype).name}: {muestra.nbytes / 1024**2:.1f} MB en {segundos * 1000:.0f} ms, "
+              f"tablas iguales [OK]")
+
+
+def verificar_indice(n=1000000):
+    # Las frecuencias con searchsorted sobre la muestra ordenada tienen que ser iguales a las
+    # de np.histogram, con intervalos regulares y con límites propios
+    np = generadores.np
+    muestra = generadores.generar_muestra("normal", {"mu": 0, "sigma": 1}, 99, n)
+    t_orden = medir(generadores.IndiceOrdenado, muestra, repeticiones=1)
+    indice = generadores.IndiceOrdenado(muestra)
+    for bins in [generadores.calcular_intervalos("normal", {"mu": 0, "sigma": 1}, k) for k in (10, 15, 20, 30)] + \
+            [np.array([-5.0, -1.0, 0.0, 0.1234, 2.0, 5.0])]:
+        assert (indice.contar(bins) == np.histogram(muestra, bins)[0]).all(), f"Diferencia con {len(bins) - 1} intervalos"
+    bins = generadores.calcular_intervalos("normal", {"mu": 0, "sigma": 1}, 30)
+    t_indice = medir(indice.contar, bins)
+    t_histograma = medir(np.histogram, muestra, bins)
+    print(f"IndiceOrdenado n={n}: igual a np.histogram [OK] (ordenar {t_orden * 1000:.0f} ms una vez, "
+          f"30 intervalos {t_indice * 1e6:.0f} µs vs np.histogram {t_histograma * 1000:.1f} ms)")
+
+
+def verificar_lote(muestras=1000, n=1000):
+    # Cada fila de generar_matriz tiene que ser la muestra de su semilla; se compara el tiempo
+    # con generar las muestras una por una (la ventaja está en muchas muestras chicas)
+    np = generadores.np
+    semillas = generadores.semillas_lote(8, muestras)
+    for distribucion, parametros in (("uniforme", {"a": 0.0, "b": 1.0}),
+                                     ("normal", {"mu": 0.0, "sigma": 1.0, "metodo": "box_muller"}),
+                                     ("exponencial", {"lambda_val": 1.0, "metodo": "inversa"})):
+        matriz = generadores.generar_matriz(distribucion, parametros, semillas, n)
+        for i in (0, muestras // 2, muestras - 1):
+            assert np.array_equal(matriz[i], generadores.generar_muestra(distribucion, parametros, semillas[i], n))
+        bins = generadores.calcular_intervalos(distribucion, parametros, 20, max_val=5.0)
+        counts = generadores.IndiceOrdenado(matriz).contar(bins)
+        assert (counts[1] == np.histogram(matriz[1], bins)[0]).all()
+        t_matriz = medir(generadores.generar_matriz, distribucion, parametros, semillas, n)
+        t_filas = medir(lambda: [generadores.generar_muestra(distribucion, parametros, s, n) for s in semillas])
+        print(f"generar_matriz {distribucion} {parametros.get('metodo', '')} {muestras}x{n}: igual fila por fila [OK], "
+              f"{t_matriz * 1000:.0f} ms vs {t_filas * 1000:.0f} ms de a una")
+
+
+def verificar_bondad(semillas=400, n=10000):
+    # Con semillas independientes, la proporción de rechazos al 5% tiene que rondar el 5%
+    inicio = time.perf_counter()
+    resultado = estadisticas.evaluar_semillas(range(semillas), n, 10)
+    segundos = time.perf_counter() - inicio
+    rechazos = (resultado["p_chi2"] < 0.05).mean()
+    estado = "OK" if 0.01 < rechazos < 0.10 else "REVISAR"
+    print(f"evaluar_semillas: {semillas} semillas de n={n} en {segundos:.2f} s, "
+          f"{rechazos:.1%} rechazadas por chi-cuadrado al 5% [{estado}]")
+
+
+def rendimiento_distribuciones(n=2000000):
+    # Distribuciones del registro: armado de la tabla (alias o inversa), transformación de
+    # uniformes ya generadas, generación completa y ajuste con chi-cuadrado
+    np = generadores.np
+    u = generadores.generar_rnd(123, n)
+    for nombre, distribucion in distribuciones.REGISTRO.items():
+        parametros = distribucion.leer({})
+        distribuciones._tabla_alias.cache_clear()
+        distribuciones._tabla_gamma_estandar.cache_clear()
+        distribuciones._tabla_normal_estandar.cache_clear()
+        inicio = time.perf_counter()
+        transformar, _ = distribucion.transformacion(parametros)
+        transformar(u[:1])
+        t_tabla = time.perf_counter() - inicio
+        t_transformar = medir(transformar, u)
+        t_muestra = medir(generadores.generar_muestra, nombre, parametros, 123, n)
+        bins = generadores.calcular_intervalos(nombre, parametros, 20)
+        pruebas = estadisticas.pruebas_bondad(nombre, parametros, generadores.contar_frecuencias(transformar(u), bins),
+                                              bins)
+        estado = "OK" if float(pruebas["p_chi2"]) > 0.001 else "REVISAR"
+        print(f"{nombre}: tabla {t_tabla * 1000:.1f} ms, transformación {n / t_transformar:,.0f}/s, "
+              f"generar_muestra {n / t_muestra:,.0f}/s, chi2 p = {float(pruebas['p_chi2']):.3f} [{estado}]")
+
+    # Error de la inversa interpolada contra la inversa exacta (en uniformes del LCG)
+    for nombre, parametros in (("gamma", {"k": 0.5, "theta": 1.0}), ("gamma", {"k": 2.0, "theta": 1.0}),
+                               ("lognormal", {"mu": 0.0, "sigma": 1.0})):
+        distribucion = distribuciones.REGISTRO[nombre]
+        muestra = u[:200000]
+        exacta = distribucion.cuantil(parametros, muestra)
+        error = (np.abs(distribucion.muestrear(parametros, muestra) - exacta) / np.maximum(exacta, 1e-300)).max()
+        estado = "OK" if error < 1e-3 else "REVISAR"
+        print(f"{nombre} {parametros}: error relativo máximo de la tabla {error:.1e} [{estado}]")
+
+
+def comparar_fuentes(n=10000000, semillas=200, n_semilla=10000):
+    # Velocidad y calidad de cada fuente de uniformes con las mismas pruebas
+    np = generadores.np
+    print(f"{'fuente':8} {'valores/s':>14} {'salto 1e15':>11} {'rechazo chi2':>13} {'correl. lag 1':>14} "
+          f"{'cambios bit 0':>14}")
+    for generador in generadores.GENERADORES:
+        t_generar = medir(generadores.uniformes, 12345, 0, n, generador)
+        t_salto = medir(generadores.uniformes, 12345, 10**15, 1000, generador)
+        # Proporción de semillas rechazadas al 5% (tiene que rondar el 5%, salvo con Sobol, que
+        # no es aleatoria y casi nunca se rechaza; ver comparar_qmc)
+        resultado = estadisticas.evaluar_semillas(range(semillas), n_semilla, 10,
+                                                  parametros={"a": 0.0, "b": 1.0, "generador": generador}, procesos=1)
+        rechazos = (resultado["p_chi2"] < 0.05).mean()
+        u = generadores.uniformes(12345, 0, 1000000, generador)
+        correlacion = np.corrcoef(u[:-1], u[1:])[0, 1]
+        # Bit menos significativo de los 32 altos: en el LCG módulo 2**32 alterna siempre
+        # (período 2); en una fuente buena cambia la mitad de las veces
+        bit = (u * 2.0**32).astype(np.uint64) & np.uint64(1)
+        cambios = (bit[1:] != bit[:-1]).mean()
+        print(f"{generador:8} {n / t_generar:>14,.0f} {t_salto * 1000:>9.2f}ms {rechazos:>13.1%} {correlacion:>14.5f} "
+              f"{cambios:>14.3f}")
+
+
+def comparar_qmc(semillas=16, n_bins=20):
+    # Error máximo de la frecuencia relativa por intervalo contra la probabilidad teórica,
+    # promediado entre semillas, a medida que crece n: con el LCG baja como 1/sqrt(n) (÷2 cada
+    # vez que n se multiplica por 4) y con Sobol e inversa, cerca de 1/n (÷4). En Box-Muller cada
+    # intervalo de z es una región curva del cuadrado (u1, u2) y la mejora es menor (~n**-0.75)
+    np = generadores.np
+    casos = [("exponencial", {"lambda_val": 2.0, "metodo": "inversa"},
+              np.linspace(0, -np.log(0.005) / 2.0, n_bins + 1)),
+             ("normal", {"mu": 0.0, "sigma": 1.0, "metodo": "box_muller"},
+              generadores.calcular_intervalos("normal", {"mu": 0.0, "sigma": 1.0}, n_bins))]
+    for distribucion, parametros, bins in casos:
+        probabilidades = np.diff(estadisticas.cdf(distribucion, parametros, bins))
+        print(f"{distribucion} ({parametros['metodo']}), {n_bins} intervalos: error máximo de frecuencia relativa")
+        print(f"{'n':>10} {'lcg':>10} {'sobol':>10} {'lcg/sobol':>10}")
+        for exponente in range(10, 23, 2):
+            n = 2**exponente
+            errores = {}
+            for generador in ("lcg", "sobol"):
+                total = 0.0
+                for semilla in range(semillas):
+                    muestra = generadores.generar_muestra(distribucion, dict(parametros, generador=generador),
+                                                          semilla, n)
+                    counts, _ = np.histogram(muestra, bins)
+                    total += np.abs(counts / n - probabilidades).max()
+                errores[generador] = total / semillas
+            print(f"{n:>10} {errores['lcg']:>10.2e} {errores['sobol']:>10.2e} "
+                  f"{errores['lcg'] / errores['sobol']:>10.1f}")
+
+
+def verificar_analisis(n=2000003):
+    # La autocorrelación incremental, por producto escalar o por FFT y alimentada en bloques
+    # de cualquier tamaño, tiene que dar lo mismo que autocorrelacion_directa; se compara el
+    # tiempo de los dos caminos con pocos y muchos retardos
+    np = generadores.np
+    u = generadores.generar_rnd(31, n)
+    for max_lag in (32, 1000):
+        directa = analisis.autocorrelacion_directa(u, max_lag)
+        velocidades = {}
+        for por_producto in (True, False):
+            incremental = analisis.AutocorrelacionIncremental(max_lag)
+            incremental.directa = por_producto
+            for bloque in np.array_split(u, 7):
+                incremental.actualizar(bloque)
+            diferencia = np.abs(incremental.resultado()["r"] - directa).max()
+            assert diferencia < 1e-12, f"Diferencia {diferencia} (K={max_lag}, producto escalar {por_producto})"
+
+            def acumular():
+                acumulador = analisis.AutocorrelacionIncremental(max_lag)
+                acumulador.directa = por_producto
+                acumulador.actualizar(u)
+            velocidades[por_producto] = n / medir(acumular)
+        elegido = "producto escalar" if analisis.AutocorrelacionIncremental(max_lag).directa else "FFT"
+        print(f"Autocorrelación K={max_lag}: igual a la directa [OK], producto escalar {velocidades[True]:,.0f}/s, "
+              f"FFT {velocidades[False]:,.0f}/s (se usa {elegido})")
+
+
+def rendimiento_exportar(n=1000000):
+    # El CSV armado con numpy tiene que ser idéntico al de "%.6f" valor por valor
+    np = generadores.np
+    muestra = generadores.generar_muestra("normal", {"mu": 0.0, "sigma": 50.0}, 5, n)
+    rapido = exportar.formatear_bloque(muestra)
+    con_formato = ("%.6f\n" * n % tuple(muestra.tolist())).encode("ascii")
+    assert rapido == con_formato, "El CSV no coincide con %.6f"
+    # Valores a mitad de camino entre dos de 10**-decimales: el producto en float cae en .5
+    # pero el valor guardado está apenas por encima o por debajo (y con pocos decimales hay
+    # empates exactos, que van al par)
+    for decimales in [0, 1, 2, 6]:
+        empates = (np.arange(-n, n) + 0.5) / 10 ** decimales
+        formato = f"%.{decimales}f\n"
+        esperado = (formato * len(empates) % tuple(empates.tolist())).encode("ascii")
+        assert exportar.formatear_bloque(empates, decimales) == esperado, \
+            f"El CSV no coincide con {formato.strip()} en los empates"
+    t_rapido = medir(exportar.formatear_bloque, muestra)
+    t_formato = medir(lambda: ("%.6f\n" * n % tuple(muestra.tolist())).encode("ascii"), repeticiones=1)
+    print(f"exportar.formatear_bloque: igual a %.6f (también en empates) [OK], {n / t_rapido:,.0f} valores/s "
+          f"({len(rapido) / t_rapido / 1024**2:.0f} MB/s) contra {n / t_formato:,.0f} valores/s con %")
+
+
+def rendimiento_histograma(n_bins=30, repeticiones=50):
+    # Redibujo del histograma con las barras reutilizadas (blitting) contra un dibujo completo.
+    # Se usa el backend Agg, que no necesita pantalla
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+    from histograma import HistogramaRapido
+    np = generadores.np
+    fig, ax = plt.subplots(figsize=(8, 4))
+    histograma = HistogramaRapido(fig, ax, fig.canvas)
+    bins = np.linspace(0, 1, n_bins + 1)
+    counts = np.full(n_bins, 100000)
+    histograma.actualizar(counts, bins, "Uniforme")
+    t_blit = medir(lambda: [histograma.actualizar(counts + i % 7, bins, "Uniforme") for i in range(repeticiones)])
+    t_completo = medir(lambda: [histograma.actualizar(counts, bins * (1 + i % 2), "Uniforme") for i in range(10)])
+    print(f"HistogramaRapido {n_bins} intervalos: redibujo con blitting {t_blit / repeticiones * 1000:.1f} ms, "
+          f"dibujo completo {t_completo / 10 * 1000:.1f} ms")
+    plt.close(fig)
+
+
+if __name__ == "__main__":
+    verificar_paridad_rnd()
+    rendimiento_rnd()
+    verificar_salto()
+    rendimiento_paralelo()
+    verificar_normal()
+    informe_normal()
+    verificar_reserva_ziggurat()
+    verificar_exponencial()
+    verificar_flujo()
+    verificar_bosquejo()
+    verificar_tipos()
+    verificar_indice()
+    verificar_lote()
+    verificar_bondad()
+    rendimiento_distribuciones()
+    comparar_fuentes()
+    comparar_qmc()
+    verificar_analisis()
+    rendimiento_exportar()
+    rendimiento_histograma()
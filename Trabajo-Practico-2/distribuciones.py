@@ -0,0 +1,444 @@
+import math
+import re
+from functools import lru_cache
+import numpy as np
+'''
+Registro de distribuciones adicionales del TP2 (además de uniforme, exponencial y normal).
+
+Todas transforman uniformes U[0;1) de generar_rnd, una por valor y sin rechazo, así que
+funcionan igual con la generación por bloques, en paralelo y en el modo por lotes:
+- Discretas (Poisson, binomial, empírica): método alias de Walker, con una tabla armada
+  una vez por juego de parámetros y un costo constante por valor.
+- Gamma y lognormal: inversa de la función de distribución tabulada e interpolada, porque
+  no tiene fórmula cerrada.
+- Weibull: la inversa tiene fórmula cerrada, x = λ·(-ln(1-u))^(1/k), y se usa directamente.
+
+Para agregar una distribución se define una subclase de Distribucion y se la pasa a
+registrar(); la interfaz arma los campos de parámetros a partir de 'parametros'.
+'''
+
+# Probabilidad que se deja afuera en cada cola al armar las tablas de Poisson y binomial
+COLA_DESPRECIABLE = 1e-12
+# Nodos equiespaciados de la tabla de la inversa en la parte central [1/8; 7/8] de (0;1)
+NODOS_CENTRALES = 4096
+# En las colas los nodos son geométricos, NODOS_POR_OCTAVA por cada potencia de 2, desde 2**-3
+# hasta 2**-34 (menos que la resolución 2**-32 del LCG)
+NODOS_POR_OCTAVA = 32
+EXPONENTES_COLAS = (3, 34)
+
+REGISTRO = {}
+
+
+def registrar(distribucion):
+    REGISTRO[distribucion.nombre] = distribucion
+    return distribucion
+
+
+def _leer_lista(texto):
+    # Lista de números separados por ';', ',' o espacios
+    if isinstance(texto, (tuple, list)):
+        return tuple(float(valor) for valor in texto)
+    return tuple(float(valor) for valor in re.split(r"[;,\s]+", str(texto).strip()) if valor)
+
+
+_lgamma = np.frompyfunc(math.lgamma, 1, 1)
+
+
+def _log_gamma(x):
+    return np.asarray(_lgamma(np.asarray(x, dtype=np.float64)), dtype=np.float64)
+
+
+class TablaAlias:
+    """
+    Método alias de Walker para una distribución discreta finita, armado con el algoritmo
+    de Vose en O(K). Cada columna de la tabla tiene un umbral y un alias: con una uniforme
+    u se elige la columna floor(u·K) y con la parte fraccionaria de u·K se decide entre el
+    valor de la columna y su alias. Una sola uniforme y tiempo constante por valor.
+    Con las uniformes de 32 bits del LCG quedan 32 - log2(K) bits para la decisión.
+    """
+
+    def __init__(self, valores, probabilidades):
+        probabilidades = np.asarray(probabilidades, dtype=np.float64)
+        self.valores = np.asarray(valores, dtype=np.float64)
+        self.probabilidades = probabilidades / probabilidades.sum()
+        cantidad = len(self.probabilidades)
+        escaladas = self.probabilidades * cantidad
+        self.umbral = np.ones(cantidad)
+        self.alias = np.arange(cantidad)
+        chicos = [i for i in range(cantidad) if escaladas[i] < 1.0]
+        grandes = [i for i in range(cantidad) if escaladas[i] >= 1.0]
+        while chicos and grandes:
+            chico = chicos.pop()
+            grande = grandes.pop()
+            self.umbral[chico] = escaladas[chico]
+            self.alias[chico] = grande
+            escaladas[grande] -= 1.0 - escaladas[chico]
+            (chicos if escaladas[grande] < 1.0 else grandes).append(grande)
+        # Las columnas que quedan sin par tienen umbral 1 (solo difieren por redondeo)
+
+    def muestrear(self, u):
+        escaladas = np.asarray(u, dtype=np.float64) * len(self.umbral)
+        columnas = escaladas.astype(np.intp)
+        np.minimum(columnas, len(self.umbral) - 1, out=columnas)
+        restos = escaladas - columnas
+        return np.where(restos < self.umbral[columnas], self.valores[columnas], self.valores[self.alias[columnas]])
+
+
+def nodos_inversa():
+    # Nodos de (0;1) para tabular la inversa: equiespaciados en el centro y geométricos en
+    # las colas, donde la inversa cambia rápido
+    desde, hasta = EXPONENTES_COLAS
+    centro = np.linspace(2.0 ** -desde, 1.0 - 2.0 ** -desde, NODOS_CENTRALES + 1)
+    exponentes = np.arange(desde * NODOS_POR_OCTAVA, hasta * NODOS_POR_OCTAVA + 1) / NODOS_POR_OCTAVA
+    colas = 2.0 ** -exponentes
+    return np.unique(np.concatenate(([0.0], colas, centro, 1.0 - colas)))
+
+
+class TablaInversa:
+    """
+    Inversa de la función de distribución tabulada en los nodos de nodos_inversa() y
+    evaluada con interpolación lineal. 'cuantil' es la inversa exacta (puede ser lenta:
+    se llama una sola vez con todos los nodos). Las uniformes del LCG nunca superan
+    1 - 2**-32, así que siempre caen entre dos nodos; con las de 53 bits (PCG64, Philox)
+    las mayores que 1 - 2**-34 (probabilidad ~6e-11) toman el valor del último nodo.
+    """
+
+    def __init__(self, cuantil):
+        self.u = nodos_inversa()
+        self.x = np.asarray(cuantil(self.u), dtype=np.float64)
+
+    def muestrear(self, u):
+        return np.interp(u, self.u, self.x)
+
+
+def _cuantil_normal_estandar(u):
+    # Aproximación racional de Acklam (error relativo ~1e-9) más un paso de Halley con erfc
+    u = np.asarray(u, dtype=np.float64)
+    a = [-3.969683028665376e+01, 2.209460984245205e+02, -2.759285104469687e+02,
+         1.383577518672690e+02, -3.066479806614716e+01, 2.506628277459239e+00]
+    b = [-5.447609879822406e+01, 1.615858368580409e+02, -1.556989798598866e+02,
+         6.680131188771972e+01, -1.328068155288572e+01]
+    c = [-7.784894002430293e-03, -3.223964580411365e-01, -2.400758277161838e+00,
+         -2.549732539343734e+00, 4.374664141464968e+00, 2.938163982698783e+00]
+    d = [7.784695709041462e-03, 3.224671290700398e-01, 2.445134137142996e+00, 3.754408661907416e+00]
+    z = np.empty_like(u)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        cola = np.minimum(u, 1.0 - u)
+        q = np.sqrt(-2.0 * np.log(np.where(cola > 0, cola, 1.0)))
+        z_cola = (((((c[0] * q + c[1]) * q + c[2]) * q + c[3]) * q + c[4]) * q + c[5]) / \
+                 ((((d[0] * q + d[1]) * q + d[2]) * q + d[3]) * q + 1.0)
+        r = (u - 0.5) ** 2
+        z_centro = (((((a[0] * r + a[1]) * r + a[2]) * r + a[3]) * r + a[4]) * r + a[5]) * (u - 0.5) / \
+                   (((((b[0] * r + b[1]) * r + b[2]) * r + b[3]) * r + b[4]) * r + 1.0)
+    central = (u >= 0.02425) & (u <= 1.0 - 0.02425)
+    z[:] = np.where(central, z_centro, np.where(u < 0.5, z_cola, -z_cola))
+
+    erfc = np.frompyfunc(math.erfc, 1, 1)
+    finitos = (u > 0) & (u < 1)
+    zf = z[finitos]
+    error = 0.5 * np.asarray(erfc(-zf / math.sqrt(2.0)), dtype=np.float64) - u[finitos]
+    paso = error * math.sqrt(2.0 * math.pi) * np.exp(zf * zf / 2.0)
+    z[finitos] = zf - paso / (1.0 + zf * paso / 2.0)
+    z[u <= 0] = -np.inf
+    z[u >= 1] = np.inf
+    return z
+
+
+def _gamma_inferior_regularizada(a, x):
+    # P(a, x) = γ(a, x) / Γ(a) para un arreglo x: serie si x < a + 1, fracción continua de
+    # Lentz si no (la misma separación que estadisticas._gamma_regularizada_superior)
+    x = np.asarray(x, dtype=np.float64)
+    p = np.zeros_like(x)
+    serie = (x > 0) & (x < a + 1)
+    if serie.any():
+        xs = x[serie]
+        termino = np.full_like(xs, 1.0 / a)
+        suma = termino.copy()
+        ap = a
+        for _ in range(100000):
+            ap += 1
+            termino *= xs / ap
+            suma += termino
+            if np.all(termino < suma * 1e-16):
+                break
+        p[serie] = suma * np.exp(-xs + a * np.log(xs) - math.lgamma(a))
+    fraccion = x >= a + 1
+    if fraccion.any():
+        xs = x[fraccion]
+        b = xs + 1 - a
+        c = np.full_like(xs, 1e300)
+        d = 1.0 / b
+        h = d.copy()
+        for i in range(1, 100000):
+            an = -i * (i - a)
+            b = b + 2
+            d = an * d + b
+            d = np.where(np.abs(d) < 1e-300, 1e-300, d)
+            c = b + an / c
+            c = np.where(np.abs(c) < 1e-300, 1e-300, c)
+            d = 1.0 / d
+            delta = d * c
+            h *= delta
+            if np.all(np.abs(delta - 1.0) < 1e-15):
+                break
+        p[fraccion] = 1.0 - np.exp(-xs + a * np.log(xs) - math.lgamma(a)) * h
+    return p
+
+
+def _cuantil_gamma_estandar(forma, u):
+    # Inversa de la gamma(forma, 1) por bisección sobre log(x), con error relativo ~1e-15
+    u = np.asarray(u, dtype=np.float64)
+    x = np.zeros_like(u)
+    positivos = u > 0
+    objetivo = u[positivos]
+    alto = forma + 40.0 * math.sqrt(forma) + 40.0
+    while _gamma_inferior_regularizada(forma, np.array([alto]))[0] < 1.0 - 2.0 ** -40:
+        alto *= 2
+    log_bajo = np.full_like(objetivo, math.log(1e-300))
+    log_alto = np.full_like(objetivo, math.log(alto))
+    for _ in range(100):
+        log_medio = 0.5 * (log_bajo + log_alto)
+        menor = _gamma_inferior_regularizada(forma, np.exp(log_medio)) < objetivo
+        log_bajo = np.where(menor, log_medio, log_bajo)
+        log_alto = np.where(menor, log_alto, log_medio)
+    x[positivos] = np.exp(0.5 * (log_bajo + log_alto))
+    return x
+
+
+@lru_cache(maxsize=1)
+def _tabla_normal_estandar():
+    return TablaInversa(_cuantil_normal_estandar)
+
+
+@lru_cache(maxsize=32)
+def _tabla_gamma_estandar(forma):
+    return TablaInversa(lambda u: _cuantil_gamma_estandar(forma, u))
+
+
+class Distribucion:
+    """
+    Distribución del registro. 'parametros' es una lista de (clave, etiqueta, valor por
+    defecto, conversión) que usan la interfaz y el modo por lotes para pedirlos.
+    """
+    nombre = ""
+    discreta = False
+    parametros = []
+
+    def leer(self, textos):
+        # Convierte los textos ingresados (o los valores por defecto) y valida los parámetros
+        parametros = {}
+        for clave, etiqueta, defecto, conversion in self.parametros:
+            texto = textos.get(clave)
+            texto = defecto if texto is None or str(texto).strip() == "" else texto
+            try:
+                parametros[clave] = conversion(texto)
+            except ValueError:
+                raise ValueError(f"Valor inválido para {etiqueta}: {texto}")
+        self.validar(parametros)
+        return parametros
+
+    def validar(self, parametros):
+        pass
+
+    def titulo(self, parametros):
+        detalle = ", ".join(f"{etiqueta.split(' ')[0]}={parametros[clave]}"
+                            for clave, etiqueta, _, _ in self.parametros if not isinstance(parametros[clave], tuple))
+        return f"Distribución {self.nombre.capitalize()} [{detalle}]"
+
+    def transformacion(self, parametros):
+        # (transformar, uniformes_por_valor), como generadores._transformacion
+        return (lambda u: self.muestrear(parametros, u)), 1
+
+    def muestrear(self, parametros, u):
+        raise NotImplementedError
+
+    def cdf(self, parametros, x):
+        raise NotImplementedError
+
+    def intervalos(self, parametros, n_bins):
+        raise NotImplementedError
+
+
+class _Continua(Distribucion):
+    # Distribuciones positivas: la tabla va de 0 al percentil 99,5 teórico, como la exponencial
+
+    def cuantil(self, parametros, u):
+        raise NotImplementedError
+
+    def intervalos(self, parametros, n_bins):
+        maximo = float(self.cuantil(parametros, np.array([0.995]))[0])
+        return np.linspace(0.0, maximo, n_bins + 1)
+
+
+class _Discreta(Distribucion):
+    discreta = True
+
+    def soporte(self, parametros):
+        # (valores ordenados, probabilidades) de la distribución
+        raise NotImplementedError
+
+    def tabla(self, parametros):
+        return _tabla_alias(self.nombre, tuple(sorted(parametros.items())))
+
+    def muestrear(self, parametros, u):
+        return self.tabla(parametros).muestrear(u)
+
+    def cdf(self, parametros, x):
+        tabla = self.tabla(parametros)
+        acumuladas = np.concatenate(([0.0], np.cumsum(tabla.probabilidades)))
+        return np.minimum(acumuladas[np.searchsorted(tabla.valores, np.asarray(x, dtype=np.float64), side="right")],
+                          1.0)
+
+    def intervalos(self, parametros, n_bins):
+        # Los límites quedan a mitad de camino entre valores posibles consecutivos; si hay más
+        # valores que intervalos, se agrupan de a varios valores seguidos
+        tabla = self.tabla(parametros)
+        acumuladas = np.cumsum(tabla.probabilidades)
+        desde = int(np.searchsorted(acumuladas, 0.0005))
+        hasta = int(np.searchsorted(acumuladas, 0.9995)) + 1
+        valores = tabla.valores[desde:min(hasta, len(tabla.valores))]
+        grupos = [g for g in np.array_split(np.arange(len(valores)), min(n_bins, len(valores))) if len(g) > 0]
+        separacion = np.diff(valores).min() if len(valores) > 1 else 1.0
+        limites = [valores[0] - separacion / 2]
+        for anterior, siguiente in zip(grupos[:-1], grupos[1:]):
+            limites.append((valores[anterior[-1]] + valores[siguiente[0]]) / 2)
+        limites.append(valores[-1] + separacion / 2)
+        return np.array(limites)
+
+
+@lru_cache(maxsize=64)
+def _tabla_alias(nombre, clave_parametros):
+    return TablaAlias(*REGISTRO[nombre].soporte(dict(clave_parametros)))
+
+
+def _recortar_colas(valores, log_probabilidades):
+    # Quita las colas con probabilidad total menor que COLA_DESPRECIABLE de cada lado
+    probabilidades = np.exp(log_probabilidades - log_probabilidades.max())
+    probabilidades /= probabilidades.sum()
+    acumuladas = np.cumsum(probabilidades)
+    desde = int(np.searchsorted(acumuladas, COLA_DESPRECIABLE))
+    hasta = int(np.searchsorted(acumuladas, 1.0 - COLA_DESPRECIABLE)) + 1
+    return valores[desde:hasta], probabilidades[desde:hasta]
+
+
+class Poisson(_Discreta):
+    nombre = "poisson"
+    parametros = [("lambda_val", "λ (media)", "4", float)]
+
+    def validar(self, parametros):
+        if not 0 < parametros["lambda_val"] <= 1e7:
+            raise ValueError("λ debe ser mayor que 0 (y a lo sumo 10.000.000)")
+
+    def soporte(self, parametros):
+        lam = parametros["lambda_val"]
+        ancho = 40.0 * math.sqrt(lam) + 40.0
+        k = np.arange(max(0, math.floor(lam - ancho)), math.ceil(lam + ancho) + 1, dtype=np.float64)
+        return _recortar_colas(k, k * math.log(lam) - lam - _log_gamma(k + 1))
+
+
+class Binomial(_Discreta):
+    nombre = "binomial"
+    parametros = [("n", "n (ensayos)", "10", int), ("p", "p (probabilidad de éxito)", "0.5", float)]
+
+    def validar(self, parametros):
+        if parametros["n"] < 1:
+            raise ValueError("La cantidad de ensayos n debe ser al menos 1")
+        if not 0 < parametros["p"] < 1:
+            raise ValueError("La probabilidad p debe estar entre 0 y 1")
+
+    def soporte(self, parametros):
+        n, p = parametros["n"], parametros["p"]
+        ancho = 40.0 * math.sqrt(n * p * (1 - p)) + 40.0
+        k = np.arange(max(0, math.floor(n * p - ancho)), min(n, math.ceil(n * p + ancho)) + 1, dtype=np.float64)
+        log_probabilidades = (math.lgamma(n + 1) - _log_gamma(k + 1) - _log_gamma(n - k + 1)
+                              + k * math.log(p) + (n - k) * math.log1p(-p))
+        return _recortar_colas(k, log_probabilidades)
+
+
+class Empirica(_Discreta):
+    nombre = "empirica"
+    parametros = [("valores", "Valores", "1; 2; 3", _leer_lista),
+                  ("probabilidades", "Probabilidades", "0.2; 0.5; 0.3", _leer_lista)]
+
+    def validar(self, parametros):
+        valores, probabilidades = parametros["valores"], parametros["probabilidades"]
+        if len(valores) == 0 or len(valores) != len(probabilidades):
+            raise ValueError("Tiene que haber una probabilidad (o peso) por cada valor")
+        if min(probabilidades) < 0 or sum(probabilidades) <= 0:
+            raise ValueError("Las probabilidades deben ser no negativas y no todas 0")
+
+    def titulo(self, parametros):
+        return f"Distribución Empírica [{len(set(parametros['valores']))} valores]"
+
+    def soporte(self, parametros):
+        # Los pesos se normalizan; los valores repetidos suman sus pesos
+        valores, posiciones = np.unique(np.array(parametros["valores"]), return_inverse=True)
+        probabilidades = np.bincount(posiciones, weights=np.array(parametros["probabilidades"]))
+        return valores, probabilidades
+
+
+class Gamma(_Continua):
+    nombre = "gamma"
+    parametros = [("k", "k (forma)", "2", float), ("theta", "θ (escala)", "1", float)]
+
+    def validar(self, parametros):
+        if not 0 < parametros["k"] <= 1e4:
+            raise ValueError("La forma k debe ser mayor que 0 (y a lo sumo 10.000)")
+        if parametros["theta"] <= 0:
+            raise ValueError("La escala θ debe ser mayor que 0")
+
+    def muestrear(self, parametros, u):
+        return parametros["theta"] * _tabla_gamma_estandar(parametros["k"]).muestrear(u)
+
+    def cuantil(self, parametros, u):
+        return parametros["theta"] * _cuantil_gamma_estandar(parametros["k"], u)
+
+    def cdf(self, parametros, x):
+        return _gamma_inferior_regularizada(parametros["k"], np.maximum(np.asarray(x, dtype=np.float64), 0.0)
+                                            / parametros["theta"])
+
+
+class Lognormal(_Continua):
+    nombre = "lognormal"
+    parametros = [("mu", "μ (media del logaritmo)", "0", float), ("sigma", "σ (desvío del logaritmo)", "0.5", float)]
+
+    def validar(self, parametros):
+        if parametros["sigma"] <= 0:
+            raise ValueError("σ debe ser mayor que 0")
+
+    def muestrear(self, parametros, u):
+        # Se tabula una sola vez la inversa de la normal estándar, que sirve para cualquier μ y σ
+        return np.exp(parametros["mu"] + parametros["sigma"] * _tabla_normal_estandar().muestrear(u))
+
+    def cuantil(self, parametros, u):
+        return np.exp(parametros["mu"] + parametros["sigma"] * _cuantil_normal_estandar(u))
+
+    def cdf(self, parametros, x):
+        x = np.asarray(x, dtype=np.float64)
+        erf = np.frompyfunc(math.erf, 1, 1)
+        with np.errstate(divide="ignore"):
+            z = (np.log(np.maximum(x, 0.0)) - parametros["mu"]) / (parametros["sigma"] * math.sqrt(2.0))
+        return 0.5 * (1.0 + np.asarray(erf(z), dtype=np.float64))
+
+
+class Weibull(_Continua):
+    nombre = "weibull"
+    parametros = [("k", "k (forma)", "1.5", float), ("lambda_val", "λ (escala)", "1", float)]
+
+    def validar(self, parametros):
+        if parametros["k"] <= 0 or parametros["lambda_val"] <= 0:
+            raise ValueError("La forma k y la escala λ deben ser mayores que 0")
+
+    def muestrear(self, parametros, u):
+        return self.cuantil(parametros, u)
+
+    def cuantil(self, parametros, u):
+        return parametros["lambda_val"] * (-np.log1p(-np.asarray(u, dtype=np.float64))) ** (1.0 / parametros["k"])
+
+    def cdf(self, parametros, x):
+        x = np.maximum(np.asarray(x, dtype=np.float64), 0.0)
+        return -np.expm1(-(x / parametros["lambda_val"]) ** parametros["k"])
+
+
+for _distribucion in (Poisson(), Binomial(), Empirica(), Gamma(), Lognormal(), Weibull()):
+    registrar(_distribucion)
@@ -0,0 +1,196 @@
+import math
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import distribuciones
+import generadores
+'''
+Pruebas de bondad de ajuste para las muestras del TP2 (chi-cuadrado y Kolmogorov-Smirnov).
+
+Todas las funciones trabajan sobre las frecuencias por intervalo, y aceptan arreglos de
+una fila (una muestra) o de varias filas (una por semilla), calculando todo a la vez
+sobre el último eje.
+
+Uso por lotes: python estadisticas.py [cantidad_semillas] [tamaño_muestra] [intervalos]
+'''
+
+
+def _cdf_normal(x, mu, sigma):
+    erf = np.frompyfunc(math.erf, 1, 1)
+    return 0.5 * (1.0 + np.asarray(erf((np.asarray(x) - mu) / (sigma * math.sqrt(2.0))), dtype=np.float64))
+
+
+def cdf(distribucion, parametros, x):
+    # Función de distribución acumulada teórica evaluada en x
+    x = np.asarray(x, dtype=np.float64)
+    if distribucion == "uniforme":
+        a, b = parametros["a"], parametros["b"]
+        return np.clip((x - a) / (b - a), 0.0, 1.0)
+    if distribucion == "exponencial":
+        return np.where(x > 0, -np.expm1(-parametros["lambda_val"] * np.maximum(x, 0.0)), 0.0)
+    if distribucion == "normal":
+        return _cdf_normal(x, parametros["mu"], parametros["sigma"])
+    if distribucion in distribuciones.REGISTRO:
+        return distribuciones.REGISTRO[distribucion].cdf(parametros, x)
+    raise ValueError(f"Distribución desconocida: {distribucion}")
+
+
+def frecuencias_esperadas(distribucion, parametros, bins, total):
+    """
+    Frecuencias esperadas por intervalo para 'total' valores. Como la tabla deja afuera
+    los valores fuera de los límites (la cola de la exponencial y más allá de ±4σ en la
+    normal), las probabilidades se condicionan a caer dentro del rango de la tabla.
+    'total' puede ser un número o un arreglo (una cantidad por fila).
+    """
+    probabilidades = np.diff(cdf(distribucion, parametros, bins))
+    if probabilidades.sum() > 0:
+        probabilidades = probabilidades / probabilidades.sum()
+    return np.asarray(total, dtype=np.float64)[..., np.newaxis] * probabilidades
+
+
+def _gamma_regularizada_superior(a, x):
+    # Q(a, x) = Γ(a, x) / Γ(a): serie si x < a + 1, fracción continua de Lentz si no
+    if x <= 0:
+        return 1.0
+    if x < a + 1:
+        termino = suma = 1.0 / a
+        ap = a
+        for _ in range(1000):
+            ap += 1
+            termino *= x / ap
+            suma += termino
+            if abs(termino) < abs(suma) * 1e-15:
+                break
+        return max(0.0, 1.0 - suma * math.exp(-x + a * math.log(x) - math.lgamma(a)))
+    b = x + 1 - a
+    c = 1.0 / 1e-300
+    d = 1.0 / b
+    h = d
+    for i in range(1, 1000):
+        an = -i * (i - a)
+        b += 2
+        d = an * d + b
+        d = 1e-300 if abs(d) < 1e-300 else d
+        c = b + an / c
+        c = 1e-300 if abs(c) < 1e-300 else c
+        d = 1.0 / d
+        delta = d * c
+        h *= delta
+        if abs(delta - 1.0) < 1e-15:
+            break
+    return math.exp(-x + a * math.log(x) - math.lgamma(a)) * h
+
+
+def p_valor_chi_cuadrado(estadistico, grados_libertad):
+    # P(X > estadístico) para X ~ chi-cuadrado con esos grados de libertad
+    q = np.frompyfunc(lambda x: _gamma_regularizada_superior(grados_libertad / 2.0, x / 2.0), 1, 1)
+    return np.asarray(q(np.asarray(estadistico, dtype=np.float64)), dtype=np.float64)
+
+
+def p_valor_ks(estadistico, tamaño_muestra):
+    # Distribución asintótica de Kolmogorov con la corrección de Stephens para n finito
+    raiz_n = np.sqrt(np.asarray(tamaño_muestra, dtype=np.float64))
+    lam = (raiz_n + 0.12 + 0.11 / raiz_n) * np.asarray(estadistico, dtype=np.float64)
+    j = np.arange(1, 101).reshape((-1,) + (1,) * lam.ndim)
+    suma = 2.0 * np.sum((-1.0) ** (j - 1) * np.exp(-2.0 * j * j * lam * lam), axis=0)
+    return np.clip(np.where(lam < 0.2, 1.0, suma), 0.0, 1.0)
+
+
+def chi_cuadrado(observadas, esperadas):
+    """
+    Estadístico chi-cuadrado y su p-valor. Los grados de libertad son k - 1 (no se estiman
+    parámetros de la muestra, y el total se fija al condicionar las esperadas).
+    Los intervalos con frecuencia esperada 0 (límites propios fuera del rango posible) no
+    se cuentan; lo que cae ahí solo puede venir de una muestra guardada redondeada
+    (--decimales en generar_lote.py), ya que la interfaz redondea solo al mostrar.
+    """
+    observadas = np.asarray(observadas, dtype=np.float64)
+    esperadas = np.asarray(esperadas, dtype=np.float64)
+    validos = esperadas > 0
+    estadistico = np.sum(np.where(validos, (observadas - esperadas) ** 2 / np.where(validos, esperadas, 1.0), 0.0),
+                         axis=-1)
+    grados_libertad = int(np.count_nonzero(validos.reshape(-1, validos.shape[-1])[0])) - 1
+    return estadistico, p_valor_chi_cuadrado(estadistico, grados_libertad), grados_libertad
+
+
+def kolmogorov_smirnov(observadas, esperadas):
+    """
+    Estadístico KS sobre las frecuencias acumuladas en los límites de los intervalos
+    (versión agrupada, que es conservadora respecto de la KS sobre los valores) y su p-valor.
+    """
+    observadas = np.asarray(observadas, dtype=np.float64)
+    esperadas = np.asarray(esperadas, dtype=np.float64)
+    total = observadas.sum(axis=-1)
+    acumulada_obs = np.cumsum(observadas, axis=-1) / total[..., np.newaxis]
+    acumulada_esp = np.cumsum(esperadas, axis=-1) / esperadas.sum(axis=-1)[..., np.newaxis]
+    estadistico = np.max(np.abs(acumulada_obs - acumulada_esp), axis=-1)
+    return estadistico, p_valor_ks(estadistico, total)
+
+
+def pruebas_bondad(distribucion, parametros, counts, bins):
+    # Calcula esperadas, chi-cuadrado y KS para una tabla de frecuencias (o varias filas)
+    counts = np.asarray(counts)
+    esperadas = frecuencias_esperadas(distribucion, parametros, bins, counts.sum(axis=-1))
+    chi2, p_chi2, grados_libertad = chi_cuadrado(counts, esperadas)
+    ks, p_ks = kolmogorov_smirnov(counts, esperadas)
+    return {"esperadas": esperadas, "chi2": chi2, "p_chi2": p_chi2, "grados_libertad": grados_libertad,
+            "ks": ks, "p_ks": p_ks}
+
+
+def _frecuencias_semillas(distribucion, parametros, semillas, tamaño_muestra, bins):
+    # Una fila de frecuencias por semilla
+    counts = np.empty((len(semillas), len(bins) - 1), dtype=np.int64)
+    for i, semilla in enumerate(semillas):
+        counts[i] = generadores.contar_frecuencias(
+            generadores.generar_muestra(distribucion, parametros, semilla, tamaño_muestra), bins)
+    return counts
+
+
+def evaluar_semillas(semillas, tamaño_muestra, n_bins=10, distribucion="uniforme", parametros=None,
+                     procesos=None, max_val=None):
+    """
+    Genera una muestra por semilla, repartiendo las semillas entre procesos, y aplica
+    chi-cuadrado y KS a todas las tablas a la vez. Devuelve un diccionario con arreglos
+    alineados con 'semillas', ordenados de menor a mayor p-valor de chi-cuadrado para que
+    las semillas sospechosas queden primero.
+    Para la exponencial hay que indicar max_val (límite superior de la tabla) para que
+    todas las semillas usen los mismos intervalos; si no se indica se usa el percentil
+    99,5 teórico.
+    """
+    parametros = parametros if parametros is not None else {"a": 0.0, "b": 1.0}
+    if distribucion == "exponencial" and max_val is None:
+        max_val = -math.log(0.005) / parametros["lambda_val"]
+    bins = generadores.calcular_intervalos(distribucion, parametros, n_bins, max_val)
+    semillas = np.asarray(semillas, dtype=np.int64)
+
+    partes = procesos or os.cpu_count() or 1
+    grupos = [g for g in np.array_split(semillas, partes) if len(g) > 0]
+    if partes == 1:
+        counts = _frecuencias_semillas(distribucion, parametros, semillas, tamaño_muestra, bins)
+    else:
+        with ProcessPoolExecutor(max_workers=procesos) as ejecutor:
+            tareas = [ejecutor.submit(_frecuencias_semillas, distribucion, parametros, grupo,
+                                      tamaño_muestra, bins) for grupo in grupos]
+            counts = np.concatenate([tarea.result() for tarea in tareas])
+
+    resultados = pruebas_bondad(distribucion, parametros, counts, bins)
+    orden = np.argsort(resultados["p_chi2"], kind="stable")
+    return {"semillas": semillas[orden], "counts": counts[orden], "bins": bins,
+            "chi2": resultados["chi2"][orden], "p_chi2": resultados["p_chi2"][orden],
+            "ks": resultados["ks"][orden], "p_ks": resultados["p_ks"][orden],
+            "grados_libertad": resultados["grados_libertad"]}
+
+
+if __name__ == "__main__":
+    cantidad = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    tamaño = int(sys.argv[2]) if len(sys.argv) > 2 else 10000
+    intervalos = int(sys.argv[3]) if len(sys.argv) > 3 else 10
+    resultado = evaluar_semillas(np.arange(cantidad), tamaño, intervalos)
+    rechazos = np.mean(resultado["p_chi2"] < 0.05)
+    print(f"{cantidad} semillas, n={tamaño}, {intervalos} intervalos: "
+          f"{rechazos:.1%} rechazadas por chi-cuadrado al 5% (se esperaría ~5%)")
+    print("Semillas con menor p-valor:")
+    for i in range(min(10, cantidad)):
+        print(f"  semilla {resultado['semillas'][i]}: chi2={resultado['chi2'][i]:.2f} "
+              f"(p={resultado['p_chi2'][i]:.4f}), KS={resultado['ks'][i]:.4f} (p={resultado['p_ks'][i]:.4f})")
@@ -0,0 +1,1163 @@
+import numpy as np
+import math
+import os
+import sys
+import time
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+import distribuciones
+'''
+Núcleo numérico del Trabajo práctico 2 de Simulación Curso 4K3 2025 - Grupo 12
+
+Contiene las funciones de generación que no dependen de la interfaz gráfica,
+para poder usarlas tanto desde la ventana de Tk como desde otros scripts.
+'''
+
+# Parámetros del método congruencial lineal (los mismos que usa generar_rnd)
+A_LCG = 1664525      # Multiplicador
+C_LCG = 1013904223   # Incremento
+M_LCG = 2**32        # Módulo
+MASCARA_LCG = np.uint64(M_LCG - 1)
+
+# Cantidad de estados que se calculan de una sola vez
+TAMAÑO_BLOQUE = 65536
+
+_potencias_cache = {}
+
+
+def _potencias_lcg(tamaño_bloque):
+    # Precalcula, para k = 1..tamaño_bloque, los coeficientes A_k y C_k tales que
+    # x_k = (A_k * x_0 + C_k) mod m. Se arma por duplicación: si ya se tienen los
+    # primeros L coeficientes, los L siguientes son la composición con (A_L, C_L).
+    if tamaño_bloque not in _potencias_cache:
+        a_k = np.array([A_LCG], dtype=np.uint64)
+        c_k = np.array([C_LCG], dtype=np.uint64)
+        while len(a_k) < tamaño_bloque:
+            a_l, c_l = a_k[-1], c_k[-1]
+            a_sig = (a_k * a_l) & MASCARA_LCG
+            c_sig = (a_k * c_l + c_k) & MASCARA_LCG
+            a_k = np.concatenate((a_k, a_sig))
+            c_k = np.concatenate((c_k, c_sig))
+        _potencias_cache[tamaño_bloque] = (a_k[:tamaño_bloque], c_k[:tamaño_bloque])
+    return _potencias_cache[tamaño_bloque]
+
+
+def generar_estados(semilla, tamaño_muestra, tamaño_bloque=TAMAÑO_BLOQUE):
+    """
+    Devuelve los estados x_1..x_n del método congruencial lineal como arreglo uint64.
+    Cada bloque se calcula en forma vectorizada a partir del último estado del bloque
+    anterior: el producto A_k * x_0 entra en 64 bits y, como m = 2**32 divide a 2**64,
+    el desborde de uint64 no altera el resultado módulo m.
+    """
+    a_k, c_k = _potencias_lcg(tamaño_bloque)
+    estados = np.empty(tamaño_muestra, dtype=np.uint64)
+    x = np.uint64(int(semilla) % M_LCG)
+
+    for inicio in range(0, tamaño_muestra, tamaño_bloque):
+        fin = min(inicio + tamaño_bloque, tamaño_muestra)
+        bloque = estados[inicio:fin]
+        np.multiply(a_k[:fin - inicio], x, out=bloque)
+        np.add(bloque, c_k[:fin - inicio], out=bloque)
+        np.bitwise_and(bloque, MASCARA_LCG, out=bloque)
+        x = bloque[-1]
+
+    return estados
+
+
+def generar_rnd(semilla, tamaño_muestra, generador="lcg"):
+    """
+    Versión vectorizada del método congruencial lineal. Devuelve un arreglo float64
+    con exactamente los mismos valores que el bucle original (x / m es exacto porque
+    x < 2**32 y m es potencia de 2).
+    Con 'generador' se puede usar otra fuente de uniformes (ver FUENTES_UNIFORMES); por
+    defecto es siempre el LCG, para que las semillas del TP den los mismos valores.
+    """
+    if generador != "lcg":
+        return uniformes(semilla, 0, tamaño_muestra, generador)
+    estados = generar_estados(semilla, tamaño_muestra)
+    return estados.astype(np.float64) / M_LCG
+
+
+def generar_rnd_bucle(semilla, tamaño_muestra):
+    # Implementación original con bucle de Python, se conserva como referencia
+    a = A_LCG
+    c = C_LCG
+    m = M_LCG
+    x = semilla
+    numeros = []
+
+    for i in range(tamaño_muestra):
+        x = (a * x + c) % m  # Fórmula del MCL
+        u = x / m   # Normalización a [0,1)
+        numeros.append(u)
+
+    return numeros
+
+
+def coeficientes_salto(k):
+    """
+    Devuelve (A, C) tales que avanzar k pasos el generador equivale a x -> (A*x + C) mod m.
+    Se compone la función afín x -> a*x + c consigo misma por elevación al cuadrado,
+    así que el costo es O(log k).
+    """
+    a_total, c_total = 1, 0          # Identidad
+    a_pot, c_pot = A_LCG, C_LCG      # Función afín de 1 paso, luego 2, 4, 8...
+    while k > 0:
+        if k & 1:
+            # Aplicar primero lo acumulado y después el salto de esta potencia
+            a_total, c_total = (a_pot * a_total) % M_LCG, (a_pot * c_total + c_pot) % M_LCG
+        a_pot, c_pot = (a_pot * a_pot) % M_LCG, (a_pot * c_pot + c_pot) % M_LCG
+        k >>= 1
+    return a_total, c_total
+
+
+def saltar_estado(semilla, k):
+    # Estado del generador después de k pasos a partir de la semilla
+    # Con int() se evita el desborde si la semilla viene como entero de numpy
+    a_k, c_k = coeficientes_salto(int(k))
+    return (a_k * int(semilla) + c_k) % M_LCG
+
+
+def dividir_semilla(semilla, tamaño_muestra, partes):
+    """
+    Divide la secuencia de una semilla en subflujos consecutivos que no se solapan.
+    Devuelve una lista de (estado_inicial, cantidad): generar_rnd(estado_inicial, cantidad)
+    produce exactamente el tramo correspondiente de generar_rnd(semilla, tamaño_muestra).
+    """
+    base, resto = divmod(tamaño_muestra, partes)
+    subflujos = []
+    desplazamiento = 0
+    for i in range(partes):
+        cantidad = base + (1 if i < resto else 0)
+        subflujos.append((saltar_estado(semilla, desplazamiento), cantidad))
+        desplazamiento += cantidad
+    return subflujos
+
+
+def _generar_subflujo(nombre_memoria, tamaño_muestra, desde, subflujo):
+    # Cada proceso escribe su tramo directamente en la memoria compartida, así no
+    # hay que serializar el arreglo para devolverlo al proceso principal
+    estado_inicial, cantidad = subflujo
+    memoria = shared_memory.SharedMemory(name=nombre_memoria)
+    try:
+        destino = np.ndarray((tamaño_muestra,), dtype=np.float64, buffer=memoria.buf)
+        destino[desde:desde + cantidad] = generar_rnd(estado_inicial, cantidad)
+        del destino
+    finally:
+        memoria.close()
+
+
+def generar_rnd_paralelo(semilla, tamaño_muestra, procesos=None, partes=None):
+    """
+    Genera la misma secuencia que generar_rnd(semilla, tamaño_muestra) repartiendo
+    los subflujos entre varios procesos. Al concatenar los subflujos en orden se
+    obtiene la secuencia serial, por lo que el resultado no depende de 'procesos'.
+    """
+    if partes is None:
+        partes = procesos or os.cpu_count() or 1
+    subflujos = dividir_semilla(semilla, tamaño_muestra, partes)
+    desplazamientos = np.cumsum([0] + [cantidad for _, cantidad in subflujos])[:-1]
+
+    memoria = shared_memory.SharedMemory(create=True, size=max(tamaño_muestra, 1) * 8)
+    try:
+        with ProcessPoolExecutor(max_workers=procesos) as ejecutor:
+            tareas = [ejecutor.submit(_generar_subflujo, memoria.name, tamaño_muestra, int(desde), subflujo)
+                      for desde, subflujo in zip(desplazamientos, subflujos)]
+            for tarea in tareas:
+                tarea.result()
+        resultado = np.ndarray((tamaño_muestra,), dtype=np.float64, buffer=memoria.buf).copy()
+    finally:
+        memoria.close()
+        memoria.unlink()
+    return resultado
+
+
+# ---------------------------------------------------------------------------
+# Fuentes de uniformes
+# ---------------------------------------------------------------------------
+
+class FuenteLCG:
+    # El generador congruencial del TP, con el salto en O(log k) de saltar_estado
+    nombre = "lcg"
+
+    def uniformes(self, semilla, desde, cantidad):
+        return generar_rnd(saltar_estado(semilla, desde), cantidad)
+
+
+class FuentePCG64:
+    """
+    PCG64 de numpy. Cada salida de 64 bits se convierte a un double de [0;1) con sus
+    53 bits altos, igual que Generator.random, así que hay 2**53 valores posibles en lugar
+    de los 2**32 del LCG. advance() salta k salidas en O(log k), como saltar_estado.
+    """
+    nombre = "pcg64"
+
+    def _generador(self, semilla, desde):
+        generador = np.random.PCG64(int(semilla))
+        generador.advance(desde)
+        return generador, 0
+
+    def uniformes(self, semilla, desde, cantidad):
+        generador, descarte = self._generador(semilla, int(desde))
+        crudos = generador.random_raw(descarte + cantidad)[descarte:]
+        return (crudos >> np.uint64(11)).astype(np.float64) * 2.0**-53
+
+
+class FuentePhilox(FuentePCG64):
+    """
+    Philox4x64 de numpy, un generador basado en contador: la salida k es una función
+    (cifrado) de la clave y del contador k // 4, sin estado que arrastrar. Ir a cualquier
+    posición cuesta lo mismo que generar el primer valor, y cada proceso puede calcular
+    su tramo sin coordinarse con los demás.
+    """
+    nombre = "philox"
+
+    def _generador(self, semilla, desde):
+        # Cada valor del contador da 4 salidas de 64 bits; advance() mueve el contador
+        generador = np.random.Philox(int(semilla))
+        generador.advance(desde // 4)
+        return generador, desde % 4
+
+
+class FuenteSobol:
+    """
+    Cuasi Monte Carlo: secuencia de Sobol de 2 dimensiones con desplazamiento digital
+    aleatorio (XOR con 32 bits por dimensión sacados de la semilla). No es aleatoria: los
+    puntos se reparten más parejo que al azar, y el error de las frecuencias por intervalo
+    baja como ~1/n con la inversa (algo menos con Box-Muller) en lugar de ~1/sqrt(n). Por lo
+    mismo, las pruebas de bondad dan p-valores cercanos a 1 y las de independencia la
+    rechazan; la semilla solo cambia el desplazamiento.
+
+    La secuencia de uniformes intercala las dos dimensiones: la posición 2i es la dimensión 1
+    del punto i y la 2i + 1 la dimensión 2, así que Box-Muller y el método polar toman u1 de
+    una dimensión y u2 de la otra (los bloques empiezan siempre en posiciones pares). El
+    ziggurat usa tres uniformes por intento, que mezclarían puntos consecutivos, y no se
+    permite (ver verificar_generador).
+
+    El punto i es el XOR de los números de dirección de los bits de i, así que cualquier tramo
+    se calcula sin los anteriores, con una tabla precalculada para cada mitad de 16 bits de i.
+    Hay 2**32 puntos distintos y después se repiten, como el período del LCG.
+    """
+    nombre = "sobol"
+
+    def __init__(self):
+        self._tablas = None
+
+    @staticmethod
+    def _direcciones():
+        # Dimensión 1: van der Corput en base 2 (v_j = 2**-j). Dimensión 2: polinomio primitivo
+        # x + 1, con m_1 = 1 y m_j = 2*m_{j-1} XOR m_{j-1} (1, 3, 5, 15, 17, 51...). En 32 bits,
+        # v_j = m_j * 2**(32 - j)
+        primera = [1 << (32 - j) for j in range(1, 33)]
+        segunda = []
+        m = 1
+        for j in range(1, 33):
+            segunda.append(m << (32 - j))
+            m ^= m << 1
+        return primera, segunda
+
+    def _tablas_mitades(self):
+        # tablas[k][b]: XOR de las direcciones de los bits puestos de b en la mitad k del índice
+        # (16 bits bajos o altos), con las dos dimensiones juntas en un uint64 (la 2 arriba)
+        if self._tablas is None:
+            primera, segunda = self._direcciones()
+            valores = np.arange(2**16)
+            tablas = np.zeros((2, 2**16), dtype=np.uint64)
+            for k in range(2):
+                for bit in range(16):
+                    j = 16 * k + bit
+                    tablas[k, (valores >> bit) & 1 == 1] ^= np.uint64(primera[j] | (segunda[j] << 32))
+            self._tablas = tablas
+        return self._tablas
+
+    def puntos(self, semilla, desde, cantidad):
+        # Puntos desde..desde+cantidad-1 como uint64: dimensión 1 en los 32 bits bajos y
+        # dimensión 2 en los altos
+        tablas = self._tablas_mitades()
+        desplazamiento = np.random.SeedSequence(int(semilla)).generate_state(2, dtype=np.uint32)
+        # En uint32 el índice da la vuelta solo después de 2**32 puntos
+        indices = np.arange(cantidad, dtype=np.uint32) + np.uint32(desde % 2**32)
+        x = tablas[0][indices & np.uint32(0xFFFF)]
+        x ^= tablas[1][indices >> np.uint32(16)]
+        x ^= np.uint64(int(desplazamiento[0]) | (int(desplazamiento[1]) << 32))
+        return x
+
+    def uniformes(self, semilla, desde, cantidad):
+        desde = int(desde)
+        primero = desde // 2
+        x = self.puntos(semilla, primero, (desde + cantidad + 1) // 2 - primero)
+        intercalados = np.empty(2 * len(x))
+        intercalados[0::2] = x & MASCARA_LCG
+        intercalados[1::2] = x >> np.uint64(32)
+        intercalados /= 2**32
+        return intercalados[desde % 2:desde % 2 + cantidad]
+
+
+FUENTES_UNIFORMES = {fuente.nombre: fuente for fuente in (FuenteLCG(), FuentePCG64(), FuentePhilox(),
+                                                          FuenteSobol())}
+GENERADORES = list(FUENTES_UNIFORMES)
+
+
+def uniformes(semilla, desde, cantidad, generador="lcg"):
+    """
+    Tramo [desde, desde + cantidad) de la secuencia de uniformes de la semilla con la
+    fuente elegida, sin generar los valores anteriores. Todas las transformaciones piden
+    sus uniformes por acá, así que funcionan igual con cualquier fuente.
+    """
+    return FUENTES_UNIFORMES[generador].uniformes(semilla, desde, cantidad)
+
+
+# ---------------------------------------------------------------------------
+# Distribución normal
+# ---------------------------------------------------------------------------
+
+METODOS_NORMAL = ["box_muller", "polar", "ziggurat"]
+
+# Uniformes que consume cada método por cada intento (sin contar rechazos)
+UNIFORMES_POR_INTENTO = {"box_muller": 2, "polar": 2, "ziggurat": 3}
+
+# Constantes de Marsaglia y Tsang (2000) para 256 capas
+CAPAS_ZIGGURAT = 256
+R_ZIGGURAT_NORMAL = 3.6541528853610088
+V_ZIGGURAT_NORMAL = 0.00492867323399
+
+_tablas_ziggurat = {}
+
+
+def _tabla_ziggurat(nombre, f, f_inversa, r, v, capas=CAPAS_ZIGGURAT):
+    """
+    Arma los bordes x_0 > x_1 = r > ... > x_capas = 0 de las capas del ziggurat,
+    todas de área v, y los valores de la densidad f en esos bordes.
+    La capa 0 es la base: rectángulo de ancho r más la cola, de ancho efectivo v / f(r).
+    """
+    if nombre not in _tablas_ziggurat:
+        x = np.empty(capas + 1)
+        x[0] = v / f(r)
+        x[1] = r
+        for i in range(1, capas - 1):
+            x[i + 1] = f_inversa(min(v / x[i] + f(x[i]), 1.0))
+        x[capas] = 0.0
+        y = np.array([f(valor) for valor in x])
+        _tablas_ziggurat[nombre] = (x, y)
+    return _tablas_ziggurat[nombre]
+
+
+def _tabla_ziggurat_normal():
+    return _tabla_ziggurat("normal", lambda t: math.exp(-0.5 * t * t),
+                           lambda y: math.sqrt(-2.0 * math.log(y)),
+                           R_ZIGGURAT_NORMAL, V_ZIGGURAT_NORMAL)
+
+
+def _normal_box_muller(u):
+    # Misma transformación que el bucle original, aplicada a todos los pares a la vez
+    n = len(u) - len(u) % 2
+    u1 = np.maximum(u[0:n:2], 1e-10)  # Evitar el logaritmo de 0
+    u2 = u[1:n:2]
+    radio = np.sqrt(-2.0 * np.log(u1))
+    angulo = 2.0 * math.pi * u2
+    z = np.empty(n)
+    z[0::2] = radio * np.cos(angulo)
+    z[1::2] = radio * np.sin(angulo)
+    return z, n // 2, n
+
+
+def _normal_polar(u):
+    # Método polar de Marsaglia: se aceptan los pares (v1, v2) que caen dentro del círculo
+    # unitario, y se evita calcular seno y coseno
+    n = len(u) - len(u) % 2
+    v1 = 2.0 * u[0:n:2] - 1.0
+    v2 = 2.0 * u[1:n:2] - 1.0
+    s = v1 * v1 + v2 * v2
+    aceptados = (s > 0.0) & (s < 1.0)
+    s = s[aceptados]
+    factor = np.sqrt(-2.0 * np.log(s) / s)
+    z = np.empty(2 * len(s))
+    z[0::2] = v1[aceptados] * factor
+    z[1::2] = v2[aceptados] * factor
+    return z, n // 2, n
+
+
+def _normal_ziggurat(u, tamaño_reserva=None):
+    # Cada intento usa tres uniformes: la capa, la posición dentro de la capa (con signo)
+    # y la altura para la prueba de la cuña o de la cola. Las últimas uniformes del arreglo
+    # se reservan para repetir los intentos rechazados en la cola.
+    x_tabla, y_tabla = _tabla_ziggurat_normal()
+    if tamaño_reserva is None:
+        tamaño_reserva = len(u) // 1000 + 32
+    intentos = max(len(u) - tamaño_reserva, 0) // 3
+    reserva = u[3 * intentos:]
+    u_capa = u[0:3 * intentos:3] * CAPAS_ZIGGURAT
+    capa = u_capa.astype(np.intp)
+    u_altura = u[2:3 * intentos:3]
+
+    x = (2.0 * u[1:3 * intentos:3] - 1.0) * x_tabla[capa]
+    valor_abs = np.abs(x)
+    # La mayoría de los intentos caen en el rectángulo que está completamente bajo la curva
+    aceptados = valor_abs < x_tabla[capa + 1]
+
+    # Cuñas: se compara contra la densidad solo en los intentos que quedaron afuera
+    cuña = ~aceptados & (capa > 0)
+    altura = y_tabla[capa[cuña]] + u_altura[cuña] * (y_tabla[capa[cuña] + 1] - y_tabla[capa[cuña]])
+    aceptados[cuña] = altura < np.exp(-0.5 * valor_abs[cuña] ** 2)
+
+    # Cola (|x| > r) con el método de Marsaglia. El primer intento usa la altura y la parte
+    # fraccionaria de u_capa; los rechazados se repiten con pares de la reserva hasta aceptar
+    # (descartarlos y volver a empezar subestimaría la cola). Si la reserva no alcanza (muy
+    # raro), se descartan intentos enteros del final y sus uniformes pasan a la reserva.
+    pendientes = np.flatnonzero(~aceptados & (capa == 0))
+    u_a = u_altura[pendientes]
+    u_b = u_capa[pendientes] - capa[pendientes]
+    usadas = 0
+    consumidas = 0
+    while len(pendientes) > 0:
+        x_cola = -np.log1p(-u_a) / R_ZIGGURAT_NORMAL
+        y_cola = -np.log1p(-u_b)
+        ok = 2.0 * y_cola > x_cola * x_cola
+        x[pendientes[ok]] = np.copysign(R_ZIGGURAT_NORMAL + x_cola[ok], x[pendientes[ok]])
+        aceptados[pendientes[ok]] = True
+        pendientes = pendientes[~ok]
+        faltan = usadas + 2 * len(pendientes) - len(reserva)
+        if faltan > 0:
+            descartados = min(-(-faltan // 3), intentos)
+            reserva = np.concatenate((reserva[usadas:], u[3 * (intentos - descartados):3 * intentos]))
+            consumidas += usadas
+            usadas = 0
+            intentos -= descartados
+            pendientes = pendientes[pendientes < intentos]
+        u_a = reserva[usadas:usadas + 2 * len(pendientes):2]
+        u_b = reserva[usadas + 1:usadas + 2 * len(pendientes):2]
+        usadas += 2 * len(pendientes)
+
+    return x[:intentos][aceptados[:intentos]], intentos, 3 * intentos + consumidas + usadas
+
+
+_MUESTREADORES_NORMAL = {
+    "box_muller": _normal_box_muller,
+    "polar": _normal_polar,
+    "ziggurat": _normal_ziggurat,
+}
+
+
+def generar_normal(numeros_u, mu, sigma, metodo="box_muller", devolver_informe=False):
+    """
+    Transforma uniformes U[0;1) (por ejemplo las de generar_rnd) en valores Normal(mu, sigma).
+    - box_muller: misma transformación y mismo orden que el bucle original, vectorizada.
+    - polar: método polar de Marsaglia, rechaza ~21% de los pares.
+    - ziggurat: tabla de 256 capas, rechaza ~1% de los intentos.
+    Los métodos con rechazo devuelven menos valores que uniformes recibidas.
+    Con devolver_informe=True devuelve además un diccionario con la tasa de rechazo
+    y la velocidad en muestras por segundo.
+    """
+    inicio = time.perf_counter()
+    u = np.asarray(numeros_u, dtype=np.float64)
+    z, intentos, usadas = _MUESTREADORES_NORMAL[metodo](u)
+    numeros_normales = mu + sigma * z
+    duracion = time.perf_counter() - inicio
+
+    if not devolver_informe:
+        return numeros_normales
+    muestras_por_intento = 2 if metodo != "ziggurat" else 1
+    informe = {
+        "metodo": metodo,
+        "uniformes_usadas": usadas,
+        "muestras": len(numeros_normales),
+        "tasa_rechazo": 1.0 - len(numeros_normales) / (intentos * muestras_por_intento) if intentos else 0.0,
+        "muestras_por_seg": len(numeros_normales) / duracion if duracion > 0 else float("inf"),
+    }
+    return numeros_normales, informe
+
+
+def generar_normal_bucle(numeros_u, mu, sigma):
+    # Implementación original de Box-Muller con bucle de Python, se conserva como referencia
+    n = len(numeros_u)
+    if n % 2 != 0:
+        numeros_u = numeros_u[:-1]
+        n -= 1
+
+    numeros_normales = []
+    for i in range(0, n, 2):
+        u1 = max(numeros_u[i], 1e-10)
+        u2 = numeros_u[i+1]
+        z1 = math.sqrt(-2.0 * math.log(u1)) * math.cos(2.0 * math.pi * u2)
+        z2 = math.sqrt(-2.0 * math.log(u1)) * math.sin(2.0 * math.pi * u2)
+        numeros_normales.append(mu + sigma * z1)
+        numeros_normales.append(mu + sigma * z2)
+
+    return numeros_normales
+
+
+# ---------------------------------------------------------------------------
+# Distribución exponencial
+# ---------------------------------------------------------------------------
+
+METODOS_EXPONENCIAL = ["inversa", "ziggurat"]
+
+# Constantes de Marsaglia y Tsang (2000) para 256 capas, densidad exp(-x)
+R_ZIGGURAT_EXPONENCIAL = 7.69711747013104972
+V_ZIGGURAT_EXPONENCIAL = 0.0039496598225815571993
+
+
+def _tabla_ziggurat_exponencial():
+    return _tabla_ziggurat("exponencial", lambda t: math.exp(-t), lambda y: -math.log(y),
+                           R_ZIGGURAT_EXPONENCIAL, V_ZIGGURAT_EXPONENCIAL)
+
+
+def _exponencial_ziggurat(u):
+    # Igual que el ziggurat normal pero sin signo. La cola es r + Exponencial(1) por la
+    # falta de memoria, así que nunca se rechaza y es el único lugar donde hace falta un logaritmo
+    x_tabla, y_tabla = _tabla_ziggurat_exponencial()
+    intentos = len(u) // 3
+    capa = (u[0:3 * intentos:3] * CAPAS_ZIGGURAT).astype(np.intp)
+    u_altura = u[2:3 * intentos:3]
+
+    x = u[1:3 * intentos:3] * x_tabla[capa]
+    aceptados = x < x_tabla[capa + 1]
+
+    cuña = ~aceptados & (capa > 0)
+    altura = y_tabla[capa[cuña]] + u_altura[cuña] * (y_tabla[capa[cuña] + 1] - y_tabla[capa[cuña]])
+    aceptados[cuña] = altura < np.exp(-x[cuña])
+
+    cola = ~aceptados & (capa == 0)
+    x[cola] = R_ZIGGURAT_EXPONENCIAL - np.log1p(-u_altura[cola])
+    aceptados[cola] = True
+
+    return x[aceptados]
+
+
+def generar_exponencial(numeros_u, lambda_val, salida=None, metodo="inversa"):
+    """
+    Transforma uniformes U[0;1) en valores Exponencial(lambda).
+    - inversa (por defecto): X = -ln(1 - U) / λ, calculado con ufuncs de numpy directamente
+      sobre 'salida' (si no se pasa, se crea un arreglo nuevo), sin listas intermedias.
+    - ziggurat: tabla de 256 capas, usa tres uniformes por intento y devuelve menos
+      valores que uniformes recibidas. Si se pasa 'salida', se escribe al principio de ella.
+    """
+    u = np.asarray(numeros_u, dtype=np.float64)
+    if metodo == "inversa":
+        if salida is None:
+            salida = np.empty(len(u))
+        np.subtract(1.0, u, out=salida)
+        np.log(salida, out=salida)
+        np.divide(salida, -lambda_val, out=salida)
+        return salida
+
+    z = _exponencial_ziggurat(u)
+    if salida is None:
+        return z / lambda_val
+    np.divide(z, lambda_val, out=salida[:len(z)])
+    return salida[:len(z)]
+
+
+def generar_exponencial_bucle(numeros_u, lambda_val):
+    # Transformada inversa exacta, elemento por elemento con math, se conserva como referencia
+    return [-math.log(1.0 - u) / lambda_val for u in numeros_u]
+
+
+# ---------------------------------------------------------------------------
+# Generación por bloques
+# ---------------------------------------------------------------------------
+
+# Las tres del enunciado, más las del registro de distribuciones.py
+DISTRIBUCIONES = ["uniforme", "exponencial", "normal"] + list(distribuciones.REGISTRO)
+
+# Cantidad de valores por bloque en la generación por flujo
+TAMAÑO_BLOQUE_MUESTRA = 1000000
+
+# Los métodos con rechazo transforman siempre bloques de uniformes de este tamaño
+# (múltiplo de 2 y de 3 para no partir pares ni ternas), así los valores obtenidos
+# no dependen de cuántos se pidan ni de cómo se agrupen
+BLOQUE_UNIFORMES = 3 * 2**18
+
+
+class GeneracionCancelada(Exception):
+    # La lanza la función de progreso para cortar una generación que ya no hace falta
+    pass
+
+
+def semilla_de_secuencia(distribucion, semilla):
+    # La interfaz siempre generó la normal con la semilla + 1000; se centraliza acá para que
+    # la misma semilla dé los mismos valores en la ventana y en el modo por lotes
+    return semilla + 1000 if distribucion == "normal" else semilla
+
+
+def verificar_generador(distribucion, parametros):
+    # Con la secuencia de Sobol el ziggurat toma cada intento de tres uniformes de puntos
+    # consecutivos, que no son independientes, y la muestra sale sesgada
+    if _fuente_de(parametros) == "sobol" and parametros.get("metodo") == "ziggurat":
+        raise ValueError("El generador sobol no se puede usar con el método ziggurat "
+                         "(usar inversa, box_muller o polar)")
+
+
+def _transformacion(distribucion, parametros):
+    """
+    Devuelve (transformar, uniformes_por_valor) para la distribución. transformar
+    recibe uniformes U[0;1) y devuelve valores de la distribución; uniformes_por_valor
+    es None cuando el método tiene rechazo y no se sabe de antemano cuántas se usan.
+    """
+    verificar_generador(distribucion, parametros)
+    if distribucion == "uniforme":
+        a, b = parametros["a"], parametros["b"]
+
+        def transformar(u):
+            numeros = a + (b - a) * u  # Transformación a [a, b)
+            # Para asegurar que no hay valores exactamente iguales a b
+            return np.where(numeros == b, a, numeros)
+        return transformar, 1
+
+    if distribucion == "exponencial":
+        lambda_val = parametros["lambda_val"]
+        metodo = parametros.get("metodo", "inversa")
+        return (lambda u: generar_exponencial(u, lambda_val, metodo=metodo)), (1 if metodo == "inversa" else None)
+
+    if distribucion == "normal":
+        mu, sigma = parametros["mu"], parametros["sigma"]
+        metodo = parametros.get("metodo", "box_muller")
+        return (lambda u: generar_normal(u, mu, sigma, metodo)), (1 if metodo == "box_muller" else None)
+
+    if distribucion in distribuciones.REGISTRO:
+        return distribuciones.REGISTRO[distribucion].transformacion(parametros)
+
+    raise ValueError(f"Distribución desconocida: {distribucion}")
+
+
+def _fuente_de(parametros):
+    # Fuente de uniformes elegida; se guarda en los parámetros, como el método, para que llegue
+    # a los procesos y a la clave de la caché sin cambiar las firmas
+    return parametros.get("generador", "lcg")
+
+
+def _bloques_con_rechazo(semilla, transformar, generador="lcg"):
+    # Secuencia sin fin de bloques transformados a partir de bloques de uniformes de tamaño fijo
+    consumidas = 0
+    while True:
+        yield transformar(uniformes(semilla, consumidas, BLOQUE_UNIFORMES, generador))
+        consumidas += BLOQUE_UNIFORMES
+
+
+def _ajustar_bloque(bloque, decimales, dtype, maximo_abierto=None):
+    # Redondeo opcional (en el mismo arreglo) y conversión al tipo de dato de la muestra.
+    # Al pasar a float32 un valor apenas menor que el máximo de la uniforme puede quedar igual
+    # a él; se reemplaza por el float32 anterior para que el intervalo siga siendo [a, b)
+    if decimales is not None:
+        np.round(bloque, decimales, out=bloque)
+    bloque = bloque.astype(dtype, copy=False)
+    if maximo_abierto is not None and bloque.dtype != np.float64:
+        tope = np.nextafter(bloque.dtype.type(maximo_abierto), bloque.dtype.type(-np.inf))
+        np.minimum(bloque, tope, out=bloque)
+    return bloque
+
+
+def _maximo_abierto(distribucion, parametros, decimales):
+    # Límite superior excluido de la muestra (solo la uniforme sin redondear)
+    return parametros["b"] if distribucion == "uniforme" and decimales is None else None
+
+
+def generar_bloques(distribucion, parametros, semilla, tamaño_muestra,
+                    tamaño_bloque=TAMAÑO_BLOQUE_MUESTRA, decimales=None, bosquejo=None, dtype=np.float64):
+    """
+    Genera la muestra de a bloques de tamaño_bloque valores (el último puede ser menor)
+    con el tipo de dato 'dtype' (float32 ocupa la mitad que float64). Los valores no se
+    redondean salvo que se pida con 'decimales'; la interfaz redondea solo al mostrarlos.
+    Al concatenar los bloques se obtiene lo mismo que generando todo de una vez, así que
+    la memoria usada no depende del tamaño de la muestra. Si se pasa un BosquejoCuantiles,
+    se actualiza con cada bloque.
+    """
+    transformar, uniformes_por_valor = _transformacion(distribucion, parametros)
+    maximo_abierto = _maximo_abierto(distribucion, parametros, decimales)
+    if uniformes_por_valor is not None:
+        # Sin rechazo: cada bloque sale de su propio tramo de la secuencia (los pares de
+        # Box-Muller no se pueden partir, por eso el tamaño de bloque tiene que ser par)
+        tamaño_bloque += tamaño_bloque % 2
+        for inicio in range(0, tamaño_muestra, tamaño_bloque):
+            cantidad = min(tamaño_bloque, tamaño_muestra - inicio)
+            u = uniformes(semilla, inicio * uniformes_por_valor, (cantidad + cantidad % 2) * uniformes_por_valor,
+                          _fuente_de(parametros))
+            bloque = _ajustar_bloque(transformar(u)[:cantidad], decimales, dtype, maximo_abierto)
+            if bosquejo is not None:
+                bosquejo.actualizar(bloque)
+            yield bloque
+        return
+
+    # Con rechazo: se reagrupan los bloques transformados en bloques del tamaño pedido
+    pendientes = []
+    disponibles = 0
+    entregados = 0
+    for parte in _bloques_con_rechazo(semilla, transformar, _fuente_de(parametros)):
+        pendientes.append(parte)
+        disponibles += len(parte)
+        while disponibles >= tamaño_bloque or (entregados + disponibles >= tamaño_muestra and disponibles > 0):
+            cantidad = min(tamaño_bloque, tamaño_muestra - entregados)
+            juntos = np.concatenate(pendientes) if len(pendientes) > 1 else pendientes[0]
+            bloque = _ajustar_bloque(juntos[:cantidad], decimales, dtype, maximo_abierto)
+            if bosquejo is not None:
+                bosquejo.actualizar(bloque)
+            yield bloque
+            pendientes = [juntos[cantidad:]]
+            disponibles -= cantidad
+            entregados += cantidad
+            if entregados >= tamaño_muestra:
+                return
+
+
+def generar_muestra(distribucion, parametros, semilla, tamaño_muestra, decimales=None, bosquejo=None,
+                    salida=None, tamaño_bloque=TAMAÑO_BLOQUE_MUESTRA, progreso=None, dtype=np.float64):
+    """
+    Genera toda la muestra en un solo arreglo (equivale a concatenar generar_bloques).
+    Si se pasa 'salida' (por ejemplo un buffer de crear_buffer), los bloques se escriben
+    directamente en ella y no se arma ningún otro arreglo del tamaño de la muestra.
+    Con 'salida', progreso(generados, total) se llama después de cada bloque; si lanza
+    GeneracionCancelada, la generación se corta ahí. La muestra queda con el tipo de dato
+    de 'salida', o con 'dtype' si no se pasa.
+    """
+    if salida is None:
+        if tamaño_muestra <= 0:
+            return np.empty(0, dtype=dtype)
+        if np.dtype(dtype) == np.float64:
+            bloques = list(generar_bloques(distribucion, parametros, semilla, tamaño_muestra,
+                                           tamaño_bloque=tamaño_muestra, decimales=decimales, bosquejo=bosquejo))
+            return bloques[0]
+        # Con float32 se escribe de a bloques, así nunca hay una copia float64 de toda la muestra
+        salida = np.empty(tamaño_muestra, dtype=dtype)
+
+    inicio = 0
+    for bloque in generar_bloques(distribucion, parametros, semilla, tamaño_muestra,
+                                  tamaño_bloque, decimales, bosquejo, dtype=salida.dtype):
+        salida[inicio:inicio + len(bloque)] = bloque
+        inicio += len(bloque)
+        if progreso is not None:
+            progreso(inicio, tamaño_muestra)
+    if isinstance(salida, np.memmap):
+        salida.flush()
+    return salida
+
+
+def crear_buffer(tamaño_muestra, ruta=None, dtype=np.float64):
+    """
+    Arreglo donde guardar la muestra. Sin ruta es un arreglo común en memoria; con ruta
+    es un np.memmap respaldado por ese archivo (en formato .npy si la ruta termina así),
+    y el sistema operativo solo mantiene en memoria las páginas que se están usando,
+    por lo que la muestra puede ser más grande que la RAM.
+    """
+    if ruta is None:
+        return np.empty(tamaño_muestra, dtype=dtype)
+    if ruta.endswith(".npy"):
+        return np.lib.format.open_memmap(ruta, mode="w+", dtype=dtype, shape=(tamaño_muestra,))
+    return np.memmap(ruta, mode="w+", dtype=dtype, shape=(tamaño_muestra,))
+
+
+def contar_frecuencias(muestra, bins, tamaño_bloque=TAMAÑO_BLOQUE_MUESTRA):
+    # Frecuencias por intervalo recorriendo la muestra en tramos (vistas, sin copiarla);
+    # sirve igual para arreglos en memoria y para np.memmap
+    frecuencias = FrecuenciasIncrementales(bins)
+    for inicio in range(0, len(muestra), tamaño_bloque):
+        frecuencias.actualizar(muestra[inicio:inicio + tamaño_bloque])
+    return frecuencias.counts
+
+
+def memoria_pico_mb():
+    # Memoria residente máxima del proceso en MB, o None si no se puede obtener
+    try:
+        import resource
+        pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Linux informa en KB y macOS en bytes
+        return pico / 1024**2 if sys.platform == "darwin" else pico / 1024
+    except ImportError:
+        pass
+    try:
+        import psutil
+        informacion = psutil.Process().memory_info()
+        return getattr(informacion, "peak_wset", informacion.rss) / 1024**2
+    except ImportError:
+        return None
+
+
+def calcular_intervalos(distribucion, parametros, n_bins, max_val=None):
+    """
+    Límites de los intervalos del histograma:
+    - uniforme: exactamente [a, b]
+    - exponencial: [0, max_val], donde max_val es el percentil 99,5 de la muestra
+      (estimado con BosquejoCuantiles)
+    - normal: ±4 desviaciones desde la media, para cubrir ~99.99% de los datos
+    - las del registro de distribuciones.py definen sus propios intervalos
+    """
+    if distribucion == "uniforme":
+        return np.linspace(parametros["a"], parametros["b"], n_bins + 1)
+    if distribucion == "exponencial":
+        return np.linspace(0, max_val, n_bins + 1)
+    if distribucion == "normal":
+        mu, sigma = parametros["mu"], parametros["sigma"]
+        return np.linspace(mu - 4 * sigma, mu + 4 * sigma, n_bins + 1)
+    if distribucion in distribuciones.REGISTRO:
+        return distribuciones.REGISTRO[distribucion].intervalos(parametros, n_bins)
+    raise ValueError(f"Distribución desconocida: {distribucion}")
+
+
+class FrecuenciasIncrementales:
+    # Frecuencias observadas por intervalo, acumuladas bloque a bloque
+
+    def __init__(self, bins):
+        self.bins = np.asarray(bins, dtype=np.float64)
+        self.counts = np.zeros(len(self.bins) - 1, dtype=np.int64)
+        self.total = 0
+
+    def actualizar(self, bloque):
+        counts, _ = np.histogram(bloque, bins=self.bins)
+        self.counts += counts
+        self.total += len(bloque)
+
+
+class IndiceOrdenado:
+    """
+    Copia ordenada de la muestra para recalcular la tabla con cualquier conjunto de
+    límites en O(intervalos · log n) con searchsorted, sin volver a recorrer la muestra.
+    Los intervalos son semiabiertos [a, b) salvo el último, que incluye su límite
+    superior, igual que np.histogram y contar_frecuencias.
+    Con una matriz de generar_matriz se ordenan todas las filas en una sola llamada y
+    contar() devuelve una fila de frecuencias por muestra.
+    """
+
+    def __init__(self, muestra):
+        self.valores = np.sort(muestra, axis=-1)
+
+    def __len__(self):
+        return len(self.valores)
+
+    def _limites_en_tipo(self, bins, hacia_arriba):
+        # Pasa los límites al tipo de dato de la muestra sin cambiar qué valores quedan de cada
+        # lado: para 'x < límite' sirve el menor valor representable >= límite, y para
+        # 'x <= límite' el mayor <= límite. Así searchsorted no convierte toda la muestra
+        convertidos = bins.astype(self.valores.dtype)
+        if hacia_arriba:
+            corregir = convertidos < bins
+            convertidos[corregir] = np.nextafter(convertidos[corregir], np.inf)
+        else:
+            corregir = convertidos > bins
+            convertidos[corregir] = np.nextafter(convertidos[corregir], -np.inf)
+        return convertidos
+
+    def contar(self, bins):
+        bins = np.asarray(bins, dtype=np.float64)
+        izquierdos = self._limites_en_tipo(bins, True)
+        ultimo = self._limites_en_tipo(bins[-1:], False)[0]
+        filas = self.valores if self.valores.ndim == 2 else self.valores[None, :]
+        posiciones = np.empty((len(filas), len(bins)), dtype=np.int64)
+        for fila, valores in zip(posiciones, filas):
+            fila[:] = np.searchsorted(valores, izquierdos, side="left")
+            fila[-1] = np.searchsorted(valores, ultimo, side="right")
+        counts = np.diff(posiciones, axis=1)
+        return counts if self.valores.ndim == 2 else counts[0]
+
+
+def clave_muestra(distribucion, parametros, semilla, tamaño_muestra, dtype=np.float64):
+    # Identifica una muestra: con la misma distribución, parámetros, semilla, tamaño y tipo
+    # de dato se generan siempre los mismos valores
+    return (distribucion, tuple(sorted(parametros.items())), int(semilla), int(tamaño_muestra),
+            np.dtype(dtype).name)
+
+
+class CacheLRU:
+    """
+    Caché de resultados con un presupuesto de memoria: al superarlo se descartan primero
+    los que hace más tiempo que no se usan. Quien guarda indica cuántos bytes ocupa cada
+    valor (por ejemplo la suma de los nbytes de sus arreglos). Se puede usar desde varios
+    hilos a la vez.
+    """
+
+    def __init__(self, presupuesto_mb=256):
+        self.presupuesto = int(presupuesto_mb * 1024**2)
+        self.entradas = OrderedDict()
+        self.bytes = 0
+        self.aciertos = 0
+        self.fallos = 0
+        self._candado = threading.Lock()
+
+    def __len__(self):
+        return len(self.entradas)
+
+    def obtener(self, clave):
+        with self._candado:
+            if clave not in self.entradas:
+                self.fallos += 1
+                return None
+            self.entradas.move_to_end(clave)
+            self.aciertos += 1
+            return self.entradas[clave][0]
+
+    def guardar(self, clave, valor, tamaño_bytes):
+        with self._candado:
+            if clave in self.entradas:
+                self.bytes -= self.entradas.pop(clave)[1]
+            if tamaño_bytes > self.presupuesto:
+                # No entra ni vaciando la caché: no se guarda
+                return False
+            while self.bytes + tamaño_bytes > self.presupuesto:
+                _, (_, tamaño_viejo) = self.entradas.popitem(last=False)
+                self.bytes -= tamaño_viejo
+            self.entradas[clave] = (valor, tamaño_bytes)
+            self.bytes += tamaño_bytes
+            return True
+
+    def actualizar_tamaño(self, clave, tamaño_bytes):
+        # Para un valor guardado que cambió de tamaño después (por ejemplo, se le agregó una
+        # tabla): corrige la cuenta y descarta otros si se pasó del presupuesto. Devuelve si
+        # el valor sigue en la caché
+        with self._candado:
+            if clave not in self.entradas:
+                return False
+            valor, tamaño_viejo = self.entradas.pop(clave)
+            self.bytes -= tamaño_viejo
+            if tamaño_bytes > self.presupuesto:
+                return False
+            while self.bytes + tamaño_bytes > self.presupuesto:
+                _, (_, tamaño_otro) = self.entradas.popitem(last=False)
+                self.bytes -= tamaño_otro
+            self.entradas[clave] = (valor, tamaño_bytes)
+            self.bytes += tamaño_bytes
+            return True
+
+    def limpiar(self):
+        with self._candado:
+            self.entradas.clear()
+            self.bytes = 0
+
+
+class _AlmacenCubetas:
+    # Contadores de cubetas consecutivas, desde el índice 'inicio', que crece según haga falta
+
+    def __init__(self):
+        self.inicio = 0
+        self.contadores = np.zeros(0, dtype=np.int64)
+
+    def _ampliar(self, minimo, maximo):
+        if len(self.contadores) == 0:
+            self.inicio = minimo
+            self.contadores = np.zeros(maximo - minimo + 1, dtype=np.int64)
+            return
+        nuevo_inicio = min(minimo, self.inicio)
+        nuevo_fin = max(maximo, self.inicio + len(self.contadores) - 1)
+        if nuevo_inicio != self.inicio or nuevo_fin - nuevo_inicio + 1 != len(self.contadores):
+            contadores = np.zeros(nuevo_fin - nuevo_inicio + 1, dtype=np.int64)
+            desde = self.inicio - nuevo_inicio
+            contadores[desde:desde + len(self.contadores)] = self.contadores
+            self.inicio, self.contadores = nuevo_inicio, contadores
+
+    def agregar(self, indices):
+        if len(indices) == 0:
+            return
+        minimo, maximo = int(indices.min()), int(indices.max())
+        self._ampliar(minimo, maximo)
+        desde = minimo - self.inicio
+        self.contadores[desde:desde + maximo - minimo + 1] += np.bincount(indices - minimo)
+
+    def combinar(self, otro):
+        if len(otro.contadores) == 0:
+            return
+        fin = otro.inicio + len(otro.contadores) - 1
+        self._ampliar(otro.inicio, fin)
+        desde = otro.inicio - self.inicio
+        self.contadores[desde:desde + len(otro.contadores)] += otro.contadores
+
+
+class BosquejoCuantiles:
+    """
+    Estimador de cuantiles en una sola pasada con error relativo acotado (como DDSketch).
+    Cada valor x > 0 se cuenta en la cubeta i = ceil(log_γ(x)), con γ = (1 + α) / (1 - α),
+    y el cuantil se estima con el centro de su cubeta, que está a menos de α·x del valor
+    real. Los negativos se guardan aparte con su valor absoluto.
+    Dos bosquejos se combinan sumando los contadores, así que el resultado no depende de
+    cómo se haya dividido la muestra en bloques o entre procesos.
+    """
+
+    def __init__(self, error_relativo=0.001):
+        self.error_relativo = error_relativo
+        self.gamma = (1 + error_relativo) / (1 - error_relativo)
+        self._log_gamma = math.log(self.gamma)
+        self.positivos = _AlmacenCubetas()
+        self.negativos = _AlmacenCubetas()
+        self.ceros = 0
+        self.total = 0
+
+    def _indices(self, valores):
+        return np.ceil(np.log(valores) / self._log_gamma).astype(np.int64)
+
+    def actualizar(self, valores):
+        valores = np.asarray(valores, dtype=np.float64)
+        minimo = np.finfo(np.float64).tiny
+        self.positivos.agregar(self._indices(valores[valores >= minimo]))
+        self.negativos.agregar(self._indices(-valores[valores <= -minimo]))
+        self.ceros += int(np.count_nonzero(np.abs(valores) < minimo))
+        self.total += len(valores)
+
+    def combinar(self, otro):
+        if otro.gamma != self.gamma:
+            raise ValueError("Solo se pueden combinar bosquejos con el mismo error relativo")
+        self.positivos.combinar(otro.positivos)
+        self.negativos.combinar(otro.negativos)
+        self.ceros += otro.ceros
+        self.total += otro.total
+        return self
+
+    def _valor_cubeta(self, indice):
+        return 2.0 * self.gamma ** indice / (self.gamma + 1.0)
+
+    def cuantil(self, q):
+        # Cuantil q en [0, 1], tomando la posición q*(n-1) de la muestra ordenada
+        if self.total == 0:
+            raise ValueError("El bosquejo está vacío")
+        posicion = q * (self.total - 1)
+        acumulado = 0
+        # Primero los negativos, de mayor a menor valor absoluto
+        for i in range(len(self.negativos.contadores) - 1, -1, -1):
+            acumulado += self.negativos.contadores[i]
+            if acumulado > posicion:
+                return -self._valor_cubeta(self.negativos.inicio + i)
+        acumulado += self.ceros
+        if acumulado > posicion:
+            return 0.0
+        acumulados = acumulado + np.cumsum(self.positivos.contadores)
+        i = min(int(np.searchsorted(acumulados, posicion, side="right")), len(acumulados) - 1)
+        return self._valor_cubeta(self.positivos.inicio + i)
+
+    def percentil(self, p):
+        return self.cuantil(p / 100)
+
+
+def _bosquejo_rango(distribucion, parametros, semilla, desde, hasta, error_relativo, tamaño_bloque,
+                    dtype=np.float64):
+    # Bosquejo de los valores desde..hasta-1 de la muestra (solo métodos sin rechazo)
+    bosquejo = BosquejoCuantiles(error_relativo)
+    transformar, _ = _transformacion(distribucion, parametros)
+    tamaño_bloque += tamaño_bloque % 2
+    for inicio in range(desde, hasta, tamaño_bloque):
+        cantidad = min(tamaño_bloque, hasta - inicio)
+        u = uniformes(semilla, inicio, cantidad + cantidad % 2, _fuente_de(parametros))
+        bosquejo.actualizar(_ajustar_bloque(transformar(u)[:cantidad], None, dtype,
+                                            _maximo_abierto(distribucion, parametros, None)))
+    return bosquejo
+
+
+def bosquejo_paralelo(distribucion, parametros, semilla, tamaño_muestra, procesos=None,
+                      error_relativo=0.001, tamaño_bloque=TAMAÑO_BLOQUE_MUESTRA, dtype=np.float64):
+    """
+    Arma el bosquejo de cuantiles de la muestra repartiendo tramos entre procesos y
+    combinando los bosquejos parciales. Da lo mismo que actualizar un solo bosquejo
+    con todos los bloques. Los métodos con rechazo se procesan en serie, porque no se
+    sabe de antemano qué uniformes le corresponden a cada tramo.
+    """
+    _, uniformes_por_valor = _transformacion(distribucion, parametros)
+    if uniformes_por_valor is None or procesos == 1:
+        bosquejo = BosquejoCuantiles(error_relativo)
+        for _ in generar_bloques(distribucion, parametros, semilla, tamaño_muestra, tamaño_bloque,
+                                 bosquejo=bosquejo, dtype=dtype):
+            pass
+        return bosquejo
+
+    partes = procesos or os.cpu_count() or 1
+    # Tramos de tamaño par para no partir los pares de Box-Muller
+    largo = -(-tamaño_muestra // partes)
+    largo += largo % 2
+    tramos = [(inicio, min(inicio + largo, tamaño_muestra)) for inicio in range(0, tamaño_muestra, largo)]
+    bosquejo = BosquejoCuantiles(error_relativo)
+    with ProcessPoolExecutor(max_workers=procesos) as ejecutor:
+        tareas = [ejecutor.submit(_bosquejo_rango, distribucion, parametros, semilla, desde, hasta,
+                                  error_relativo, tamaño_bloque, dtype) for desde, hasta in tramos]
+        for tarea in tareas:
+            bosquejo.combinar(tarea.result())
+    return bosquejo
+
+
+def tabla_frecuencias_flujo(distribucion, parametros, semilla, tamaño_muestra, n_bins,
+                            tamaño_bloque=TAMAÑO_BLOQUE_MUESTRA, procesos=1, progreso=None, bins=None,
+                            dtype=np.float64):
+    """
+    Calcula las frecuencias por intervalo generando la muestra de a bloques, sin guardarla.
+    Devuelve (counts, bins), iguales a los de la muestra generada de una sola vez.
+    Para la exponencial, el límite superior (percentil 99,5) sale del bosquejo de cuantiles,
+    que se arma en una pasada previa (en paralelo si se piden varios procesos).
+    Si se pasan los límites en 'bins', se usan esos (y n_bins se ignora). Con dtype=float32
+    las frecuencias son las de la muestra guardada como float32.
+    progreso(hechos, total) se llama después de cada bloque, contando las dos pasadas de
+    la exponencial; si lanza GeneracionCancelada, el cálculo se corta ahí.
+    """
+    max_val = None
+    pasadas = 1
+    if bins is None and distribucion == "exponencial":
+        pasadas = 2
+        if progreso is not None and procesos == 1:
+            bosquejo = BosquejoCuantiles()
+            hechos = 0
+            for bloque in generar_bloques(distribucion, parametros, semilla, tamaño_muestra, tamaño_bloque,
+                                          bosquejo=bosquejo, dtype=dtype):
+                hechos += len(bloque)
+                progreso(hechos, pasadas * tamaño_muestra)
+        else:
+            bosquejo = bosquejo_paralelo(distribucion, parametros, semilla, tamaño_muestra, procesos,
+                                         tamaño_bloque=tamaño_bloque, dtype=dtype)
+        max_val = bosquejo.percentil(99.5)
+    if bins is None:
+        bins = calcular_intervalos(distribucion, parametros, n_bins, max_val)
+    frecuencias = FrecuenciasIncrementales(bins)
+    for bloque in generar_bloques(distribucion, parametros, semilla, tamaño_muestra, tamaño_bloque, dtype=dtype):
+        frecuencias.actualizar(bloque)
+        if progreso is not None:
+            progreso((pasadas - 1) * tamaño_muestra + frecuencias.total, pasadas * tamaño_muestra)
+    return frecuencias.counts, frecuencias.bins
+
+
+# ---------------------------------------------------------------------------
+# Varias muestras a la vez
+# ---------------------------------------------------------------------------
+
+def semillas_lote(semilla, cantidad):
+    """
+    Semillas para 'cantidad' muestras independientes a partir de una sola. No se usan
+    semillas consecutivas: con el LCG, x_k(s + 1) - x_k(s) = A_k mod m para todo k, así que
+    dos muestras de semillas vecinas son la misma corrida desplazada. SeedSequence las mezcla.
+    """
+    return [int(s) for s in np.random.SeedSequence(int(semilla)).generate_state(cantidad, dtype=np.uint32)]
+
+
+def generar_matriz(distribucion, parametros, semillas, tamaño_muestra, dtype=np.float64, progreso=None):
+    """
+    Devuelve una matriz (len(semillas) × tamaño_muestra) cuya fila i es exactamente
+    generar_muestra(distribucion, parametros, semillas[i], tamaño_muestra).
+    Con el LCG y un método sin rechazo se generan todas las filas juntas, por bloques de
+    columnas: las uniformes de cada bloque salen de una sola operación vectorizada sobre
+    todas las semillas y se transforman juntas (los bloques tienen ancho par, así que los
+    pares de Box-Muller no cruzan de una fila a otra). Con otras fuentes o con rechazo cada
+    fila consume una cantidad distinta de uniformes y se generan de a una.
+    progreso(generados, total) se llama después de cada bloque, contando los valores de
+    todas las filas; si lanza GeneracionCancelada, la generación se corta ahí.
+    """
+    matriz = np.empty((len(semillas), tamaño_muestra), dtype=dtype)
+    transformar, uniformes_por_valor = _transformacion(distribucion, parametros)
+    if _fuente_de(parametros) != "lcg" or uniformes_por_valor is None:
+        total = len(semillas) * tamaño_muestra
+        for i, (fila, semilla) in enumerate(zip(matriz, semillas)):
+            progreso_fila = None
+            if progreso is not None:
+                progreso_fila = lambda hechos, _, previos=i * tamaño_muestra: progreso(previos + hechos, total)
+            generar_muestra(distribucion, parametros, semilla, tamaño_muestra, salida=fila, progreso=progreso_fila)
+        return matriz
+
+    # Cada bloque tiene ~TAMAÑO_BLOQUE valores en total, para que los temporales entren en caché
+    ancho = max(2, TAMAÑO_BLOQUE // max(len(semillas), 1))
+    ancho += ancho % 2
+    a_k, c_k = _potencias_lcg(ancho * uniformes_por_valor)
+    maximo_abierto = _maximo_abierto(distribucion, parametros, None)
+    # Mismo cálculo que generar_estados, con una columna de estados en lugar de un escalar:
+    # x = (A_k * x_0 + C_k) mod m para todas las filas a la vez
+    x = np.array([int(s) % M_LCG for s in semillas], dtype=np.uint64)
+    for inicio in range(0, tamaño_muestra, ancho):
+        cantidad = min(ancho, tamaño_muestra - inicio)
+        columnas = (cantidad + cantidad % 2) * uniformes_por_valor
+        estados = (a_k[None, :columnas] * x[:, None] + c_k[None, :columnas]) & MASCARA_LCG
+        x = estados[:, -1].copy()
+        u = estados.astype(np.float64) / M_LCG
+        valores = transformar(u.ravel()).reshape(len(semillas), -1)[:, :cantidad]
+        matriz[:, inicio:inicio + cantidad] = _ajustar_bloque(valores, None, dtype, maximo_abierto)
+        if progreso is not None:
+            progreso(len(semillas) * (inicio + cantidad), len(semillas) * tamaño_muestra)
+    return matriz
@@ -0,0 +1,187 @@
+import argparse
+import random
+import sys
+import time
+import numpy as np
+import distribuciones
+import exportar
+import generadores
+'''
+Generación por lotes del TP2 sin interfaz gráfica.
+
+Usa solo el núcleo de generadores.py (numpy), sin tkinter ni matplotlib, para poder
+correrlo en servidores sin pantalla. Escribe la muestra y/o la tabla de frecuencias
+en archivos .npy o binarios crudos (.bin, float64 en el orden de bytes de la máquina),
+o en .csv, .csv.gz o .parquet con la semilla y los parámetros como metadatos (ver
+exportar.py). La muestra se escribe directamente sobre el archivo con np.memmap (o de a
+bloques en CSV/Parquet), así que puede ser más grande que la memoria disponible.
+
+Ejemplos:
+    python generar_lote.py uniforme -n 1000000 --a 0 --b 10 --semilla 42 --muestras muestra.npy
+    python generar_lote.py exponencial -n 100000000 --lambda 0.5 --tabla tabla.npy
+    python generar_lote.py normal -n 5000 --mu 10 --sigma 2 --metodo polar --muestras normal.bin
+    python generar_lote.py uniforme -n 100000000 --muestras muestra.csv.gz --tabla tabla.csv
+    python generar_lote.py poisson -n 1000000 --param lambda_val=3.5 --tabla poisson.npy
+    python generar_lote.py empirica -n 1000 --param "valores=1;2;5" --param "probabilidades=0.2;0.5;0.3"
+
+Las distribuciones del registro (distribuciones.py) reciben sus parámetros con --param
+clave=valor; los que no se indican toman el valor por defecto.
+
+La muestra se guarda sin redondear, como float64 o como float32 (--tipo float32, la
+mitad de espacio); con --decimales se redondea antes de guardarla (solo con --muestras).
+La tabla de frecuencias tiene una fila por intervalo con las columnas
+[límite inferior, límite superior, frecuencia, frecuencia relativa].
+'''
+
+
+def leer_argumentos(argumentos=None):
+    parser = argparse.ArgumentParser(description="Generador de números aleatorios del TP2 (modo por lotes)")
+    parser.add_argument("distribucion", choices=generadores.DISTRIBUCIONES)
+    parser.add_argument("-n", "--tamano", type=int, required=True, help="Tamaño de muestra")
+    parser.add_argument("--semilla", type=int, help="Semilla del generador (al azar si no se indica)")
+    parser.add_argument("--a", type=float, default=0.0, help="Mínimo de la uniforme")
+    parser.add_argument("--b", type=float, default=1.0, help="Máximo de la uniforme")
+    parser.add_argument("--lambda", dest="lambda_val", type=float, default=1.0, help="λ de la exponencial")
+    parser.add_argument("--mu", type=float, default=0.0, help="Media de la normal")
+    parser.add_argument("--sigma", type=float, default=1.0, help="Desviación de la normal")
+    parser.add_argument("--metodo", help="Método de la exponencial (inversa, ziggurat) "
+                                         "o de la normal (box_muller, polar, ziggurat)")
+    parser.add_argument("--param", action="append", default=[], metavar="CLAVE=VALOR",
+                        help="Parámetro de una distribución del registro (se puede repetir)")
+    parser.add_argument("--generador", choices=generadores.GENERADORES, default="lcg",
+                        help="Fuente de las uniformes (lcg es el generador del TP; sobol es cuasi aleatoria)")
+    parser.add_argument("--intervalos", type=int, default=10, help="Cantidad de intervalos de la tabla")
+    parser.add_argument("--tipo", choices=["float64", "float32"], default="float64",
+                        help="Tipo de dato de la muestra")
+    parser.add_argument("--decimales", type=int, help="Redondear la muestra guardada con --muestras a esta cantidad de decimales")
+    parser.add_argument("--bloque", type=int, default=generadores.TAMAÑO_BLOQUE_MUESTRA,
+                        help="Valores generados por bloque")
+    parser.add_argument("--muestras", help="Archivo de salida para la muestra (.npy o .bin)")
+    parser.add_argument("--tabla", help="Archivo de salida para la tabla de frecuencias (.npy o .bin)")
+    return parser.parse_args(argumentos)
+
+
+def armar_parametros(args):
+    parametros = _parametros_distribucion(args)
+    parametros["generador"] = args.generador
+    generadores.verificar_generador(args.distribucion, parametros)
+    return parametros
+
+
+def _parametros_distribucion(args):
+    if args.tamano <= 0:
+        raise ValueError("El tamaño de muestra debe ser mayor a 0")
+    if args.distribucion == "uniforme":
+        if args.a >= args.b:
+            raise ValueError("El valor de 'a' debe ser menor que 'b'")
+        return {"a": args.a, "b": args.b}
+    if args.distribucion == "exponencial":
+        if args.lambda_val <= 0:
+            raise ValueError("Lambda debe ser mayor que 0")
+        metodo = args.metodo or "inversa"
+        if metodo not in generadores.METODOS_EXPONENCIAL:
+            raise ValueError(f"Método desconocido para la exponencial: {metodo}")
+        return {"lambda_val": args.lambda_val, "metodo": metodo}
+    if args.distribucion in distribuciones.REGISTRO:
+        textos = {}
+        for param in args.param:
+            clave, separador, valor = param.partition("=")
+            if not separador:
+                raise ValueError(f"Parámetro sin '=': {param}")
+            textos[clave.strip()] = valor
+        return distribuciones.REGISTRO[args.distribucion].leer(textos)
+    if args.sigma <= 0:
+        raise ValueError("La desviación estándar debe ser mayor que 0")
+    metodo = args.metodo or "box_muller"
+    if metodo not in generadores.METODOS_NORMAL:
+        raise ValueError(f"Método desconocido para la normal: {metodo}")
+    return {"mu": args.mu, "sigma": args.sigma, "metodo": metodo}
+
+
+def contar_bloques(bloques, frecuencias):
+    # Deja pasar los bloques sin cambiarlos, sumándolos antes a las frecuencias
+    for bloque in bloques:
+        frecuencias.actualizar(bloque)
+        yield bloque
+
+
+def escribir_tabla(ruta, counts, bins):
+    total = counts.sum()
+    tabla = np.column_stack((bins[:-1], bins[1:], counts, counts / total if total else counts * 0.0))
+    if ruta.endswith(".npy"):
+        np.save(ruta, tabla)
+    else:
+        tabla.tofile(ruta)
+    return tabla
+
+
+def main(argumentos=None):
+    args = leer_argumentos(argumentos)
+    try:
+        parametros = armar_parametros(args)
+        for ruta in (args.muestras, args.tabla):
+            if ruta and exportar.es_exportable(ruta):
+                exportar.verificar_formato(ruta)
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 2
+
+    semilla = args.semilla if args.semilla is not None else random.randint(0, 4294967295)
+    semilla_secuencia = generadores.semilla_de_secuencia(args.distribucion, semilla)
+    inicio = time.perf_counter()
+    datos = exportar.metadatos(args.distribucion, parametros, semilla, semilla_secuencia, args.tamano, args.tipo)
+
+    if args.muestras and exportar.es_exportable(args.muestras):
+        # CSV o Parquet: se escribe de a bloques y la tabla se cuenta con esos mismos bloques
+        # (ya redondeados con --decimales) a medida que se escriben. Los intervalos de la
+        # exponencial dependen del percentil 99,5 de la muestra, que se estima antes con una
+        # pasada del bosquejo (no se puede releer el archivo como arreglo)
+        max_val = None
+        if args.distribucion == "exponencial":
+            bosquejo = generadores.BosquejoCuantiles()
+            for _ in generadores.generar_bloques(args.distribucion, parametros, semilla_secuencia, args.tamano,
+                                                 args.bloque, decimales=args.decimales, bosquejo=bosquejo,
+                                                 dtype=args.tipo):
+                pass
+            max_val = bosquejo.percentil(99.5)
+        frecuencias = generadores.FrecuenciasIncrementales(
+            generadores.calcular_intervalos(args.distribucion, parametros, args.intervalos, max_val))
+        bloques = generadores.generar_bloques(args.distribucion, parametros, semilla_secuencia, args.tamano,
+                                              args.bloque, decimales=args.decimales, dtype=args.tipo)
+        exportar.exportar_muestra(args.muestras, contar_bloques(bloques, frecuencias), datos,
+                                  decimales=args.decimales if args.decimales is not None else 6)
+        counts, bins = frecuencias.counts, frecuencias.bins
+    elif args.muestras:
+        # La muestra se escribe de a bloques en un np.memmap sobre el archivo de salida, y
+        # la tabla se cuenta leyendo ese mismo archivo, sin volver a generar ni copiar
+        bosquejo = generadores.BosquejoCuantiles()
+        salida = generadores.crear_buffer(args.tamano, args.muestras, args.tipo)
+        muestra = generadores.generar_muestra(args.distribucion, parametros, semilla_secuencia, args.tamano,
+                                              decimales=args.decimales, bosquejo=bosquejo, salida=salida,
+                                              tamaño_bloque=args.bloque)
+        max_val = bosquejo.percentil(99.5) if args.distribucion == "exponencial" else None
+        bins = generadores.calcular_intervalos(args.distribucion, parametros, args.intervalos, max_val)
+        counts = generadores.contar_frecuencias(muestra, bins, args.bloque)
+    else:
+        counts, bins = generadores.tabla_frecuencias_flujo(args.distribucion, parametros, semilla_secuencia,
+                                                           args.tamano, args.intervalos, args.bloque,
+                                                           dtype=args.tipo)
+
+    if args.tabla and exportar.es_exportable(args.tabla):
+        exportar.exportar_tabla(args.tabla, counts, bins, datos)
+    elif args.tabla:
+        escribir_tabla(args.tabla, counts, bins)
+    for i in range(len(counts)):
+        print(f"[{bins[i]:.4f}, {bins[i + 1]:.4f})\t{counts[i]}")
+
+    # Con --muestras incluye las páginas del archivo que el sistema tiene cargadas, que se
+    # liberan solas si hace falta memoria
+    memoria = generadores.memoria_pico_mb()
+    if memoria is not None:
+        print(f"Memoria pico: {memoria:.0f} MB", file=sys.stderr)
+    print(f"Semilla {semilla}: {args.tamano} valores en {time.perf_counter() - inicio:.2f} s", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,137 @@
+import numpy as np
+from matplotlib.collections import LineCollection
+from matplotlib.transforms import blended_transform_factory
+'''
+Dibujo del histograma del TP2 a partir de las frecuencias ya contadas.
+
+Las barras, líneas de los límites y anotaciones se crean una sola vez y después solo se
+les cambian la posición, la altura y el texto. Las barras son artistas animados: si los
+límites, el título y la escala del eje y no cambian, se restaura el fondo guardado y se
+redibujan solo ellas (blitting), sin volver a dibujar ejes, etiquetas ni textos. El tiempo
+no depende del tamaño de la muestra, solo de la cantidad de intervalos.
+
+Con varias muestras a la vez las barras son la frecuencia media, y encima se superponen
+la tabla de cada muestra (escalones) y el desvío de cada intervalo (segmentos verticales).
+'''
+
+
+class HistogramaRapido:
+    def __init__(self, fig, ax, canvas):
+        self.fig = fig
+        self.ax = ax
+        self.canvas = canvas
+        self.barras = []
+        self.lineas = []
+        self.anotaciones = []
+        self.superpuestas = []
+        self.bins = None
+        self.titulo = None
+        self.tope = None
+        self.fondo = None
+
+        # Lo que no cambia entre histogramas se configura una sola vez
+        self.ax.set_xlabel("Valor")
+        self.ax.set_ylabel("Frecuencia")
+        self.ax.grid(True, which='both', axis='y', linestyle='--', alpha=0.7)
+        self.ax.set_axisbelow(True)
+
+        # Cada vez que se dibuja la figura completa (también al cambiar el tamaño de la
+        # ventana) se guarda el fondo y se dibujan encima los artistas animados
+        self.canvas.mpl_connect("draw_event", self._al_dibujar)
+
+    def _al_dibujar(self, event):
+        self.fondo = self.canvas.copy_from_bbox(self.fig.bbox)
+        for artista in self.barras + self.superpuestas:
+            self.ax.draw_artist(artista)
+
+    def _ajustar_cantidad(self, n_bins):
+        # Crea o quita artistas solo si cambió la cantidad de intervalos
+        if len(self.barras) == n_bins:
+            return False
+        for artista in self.barras + self.lineas + self.anotaciones:
+            artista.remove()
+        self.barras = list(self.ax.bar(np.arange(n_bins), np.zeros(n_bins), color='C0', edgecolor='black',
+                                       alpha=0.7, animated=True))
+        self.lineas = [self.ax.axvline(x=0, color='gray', linestyle='--', alpha=0.5) for _ in range(n_bins + 1)]
+        # Las anotaciones van a media altura del gráfico (x en datos, y en fracción de los ejes),
+        # así no dependen de las frecuencias y quedan en el fondo
+        transformacion = blended_transform_factory(self.ax.transData, self.ax.transAxes)
+        self.anotaciones = [self.ax.text(0, 0.5, "", transform=transformacion, ha='center', va='center',
+                                         rotation=90, color='blue', alpha=0.5) for _ in range(n_bins)]
+        return True
+
+    def _superponer(self, filas, bins):
+        # Escalones con las frecuencias de cada muestra y, en cada intervalo, un segmento de
+        # media - desvío a media + desvío. Son animados, para que queden encima de las barras
+        for artista in self.superpuestas:
+            artista.remove()
+        self.superpuestas = []
+        if filas is None:
+            return
+        filas = np.asarray(filas, dtype=np.float64)
+        x = np.repeat(bins, 2)[1:-1]
+        escalones = np.stack(np.broadcast_arrays(x, np.repeat(filas, 2, axis=1)), axis=-1)
+        centros = 0.5 * (bins[:-1] + bins[1:])
+        media, desvio = filas.mean(axis=0), filas.std(axis=0, ddof=1)
+        segmentos = np.stack([np.column_stack((centros, media - desvio)), np.column_stack((centros, media + desvio))],
+                             axis=1)
+        self.superpuestas = [
+            self.ax.add_collection(LineCollection(escalones, colors='black', linewidths=0.8,
+                                                  alpha=max(0.05, min(0.5, 5.0 / len(filas))), animated=True)),
+            self.ax.add_collection(LineCollection(segmentos, colors='C3', linewidths=2, animated=True))]
+
+    def actualizar(self, counts, bins, titulo, filas=None):
+        """
+        Muestra el histograma de las frecuencias 'counts' en los intervalos 'bins'.
+        Si solo cambiaron las frecuencias (y siguen entrando en la escala del eje y), se
+        redibujan las barras con blitting; si no, se acomodan los artistas existentes y se
+        redibuja la figura completa.
+        Con 'filas' (una fila de frecuencias por muestra, y 'counts' su media) se superponen
+        las frecuencias de cada muestra; en ese caso se redibuja siempre la figura completa.
+        """
+        counts = np.asarray(counts)
+        bins = np.asarray(bins, dtype=np.float64)
+        maximo = counts.max() if len(counts) > 0 and counts.max() > 0 else 1
+        if filas is not None:
+            maximo = max(maximo, np.max(filas))
+
+        if (self.fondo is not None and self.bins is not None and np.array_equal(bins, self.bins)
+                and titulo == self.titulo and 0.6 * self.tope <= maximo <= self.tope
+                and filas is None and not self.superpuestas):
+            self.canvas.restore_region(self.fondo)
+            for barra, frecuencia in zip(self.barras, counts):
+                barra.set_height(frecuencia)
+                self.ax.draw_artist(barra)
+            self.canvas.blit(self.fig.bbox)
+            return
+
+        nuevos = self._ajustar_cantidad(len(counts))
+        anchos = np.diff(bins)
+        centros = 0.5 * (bins[:-1] + bins[1:])
+        for i, barra in enumerate(self.barras):
+            # Cada barra ocupa el 90% de su intervalo, como el rwidth=0.9 de ax.hist
+            barra.set_x(centros[i] - 0.45 * anchos[i])
+            barra.set_width(0.9 * anchos[i])
+            barra.set_height(counts[i])
+            self.anotaciones[i].set_text(f"[{bins[i]:.2f}, {bins[i + 1]:.2f})")
+            self.anotaciones[i].set_position((centros[i], 0.5))
+        for linea, limite in zip(self.lineas, bins):
+            linea.set_xdata([limite, limite])
+        self._superponer(filas, bins)
+
+        # Mostrar todos los límites de los intervalos en el eje x
+        self.ax.set_xticks(bins)
+        self.ax.set_xticklabels([f"{b:.4f}" for b in bins], rotation=45)
+        margen = 0.05 * (bins[-1] - bins[0])
+        self.ax.set_xlim(bins[0] - margen, bins[-1] + margen)
+        # Se deja lugar arriba para que una nueva muestra parecida entre sin cambiar la escala
+        self.tope = maximo * 1.1
+        self.ax.set_ylim(0, self.tope)
+        self.ax.set_title(titulo)
+        self.bins = bins
+        self.titulo = titulo
+
+        # Ajustar diseño para evitar cortar etiquetas (solo si cambió la cantidad de intervalos)
+        if nuevos:
+            self.fig.tight_layout()
+        self.canvas.draw()
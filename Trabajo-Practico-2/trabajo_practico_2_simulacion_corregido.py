@@ -1,10 +1,16 @@
 import numpy as np
 import matplotlib.pyplot as plt
 import tkinter as tk
-from tkinter import ttk, scrolledtext, messagebox
+from tkinter import ttk, scrolledtext, messagebox, filedialog
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 import random
-import math
+import threading
+import re
+import distribuciones
+import generadores
+import estadisticas
+import exportar
+from histograma import HistogramaRapido
 '''
 Trabajo práctico 2 de Simulación Curso 4K3 2025 - Grupo 12
 
@@ -19,6 +25,19 @@ Integrantes:
 - Delgado Alexis 95227
 - Tobias Jurgens 97342
 '''
+# Hasta este tamaño la muestra se guarda completa; por encima se genera por bloques
+LIMITE_EN_MEMORIA = 1000000
+# Valores por bloque cuando se genera en segundo plano (cada bloque actualiza el progreso)
+BLOQUE_PROGRESO = 100000
+# Memoria máxima para guardar muestras ya generadas (se descartan las menos usadas)
+PRESUPUESTO_CACHE_MB = 256
+# Tipos de dato para guardar la muestra
+TIPOS_DATO = ["float64", "float32"]
+# Máximo de valores en total (muestras × tamaño) al generar varias muestras juntas, que
+# se guardan todas en memoria (más una copia ordenada)
+LIMITE_LOTE = 10000000
+
+
 class GeneradorNumerosAleatorios:
     def __init__(self, root):
         self.root = root
@@ -27,6 +46,21 @@ class GeneradorNumerosAleatorios:
         
         # Variables para almacenar los datos generados
         self.numeros_generados = []
+        # Generación en segundo plano: cada pedido tiene un número y un evento para cancelarlo;
+        # los resultados de un pedido que ya fue reemplazado por otro se descartan
+        self.pedido_actual = 0
+        self.cancelacion = None
+        self.hilo_generacion = None
+        self.generando = False
+        # Última muestra generada y su índice ordenado, para recalcular la tabla sin regenerar
+        self.resultado_actual = None
+        self.indice = None
+        # Tabla que se está mostrando (counts, bins, esperadas), para exportarla
+        self.tabla_actual = None
+        # Parámetros de la última muestra mostrada
+        self.parametros_actuales = None
+        # Muestras ya generadas, por (distribución, parámetros, semilla, tamaño)
+        self.cache = generadores.CacheLRU(PRESUPUESTO_CACHE_MB)
         self.distribucion_actual = tk.StringVar(value="uniforme")
         self.intervalos = tk.IntVar(value=10)
         
@@ -40,8 +74,8 @@ class GeneradorNumerosAleatorios:
         
         # Selección de distribución
         ttk.Label(panel_izquierdo, text="Distribución:").grid(row=0, column=0, sticky=tk.W, pady=5)
-        distribuciones = ["uniforme", "exponencial", "normal"]
-        distribucion_combo = ttk.Combobox(panel_izquierdo, textvariable=self.distribucion_actual, values=distribuciones, state="readonly")
+        distribucion_combo = ttk.Combobox(panel_izquierdo, textvariable=self.distribucion_actual,
+                                          values=generadores.DISTRIBUCIONES, state="readonly")
         distribucion_combo.grid(row=0, column=1, sticky=tk.W, pady=5)
         distribucion_combo.bind("<<ComboboxSelected>>", self.actualizar_parametros)
         
@@ -50,10 +84,16 @@ class GeneradorNumerosAleatorios:
         self.tamano_muestra = ttk.Entry(panel_izquierdo)
         self.tamano_muestra.insert(0, "1000")
         self.tamano_muestra.grid(row=1, column=1, sticky=tk.W, pady=5)
+
+        # Semilla del generador: si se deja vacía se elige una al azar (y se muestra al terminar,
+        # para poder repetir la muestra)
+        ttk.Label(panel_izquierdo, text="Semilla:").grid(row=2, column=0, sticky=tk.W, pady=5)
+        self.semilla = ttk.Entry(panel_izquierdo)
+        self.semilla.grid(row=2, column=1, sticky=tk.W, pady=5)
         
         # Frame para parámetros específicos de cada distribución
         self.params_frame = ttk.LabelFrame(panel_izquierdo, text="Parámetros específicos", padding="10")
-        self.params_frame.grid(row=2, column=0, columnspan=2, sticky=tk.W, pady=10)
+        self.params_frame.grid(row=3, column=0, columnspan=2, sticky=tk.W, pady=10)
         
         # Parámetros para uniforme (valores iniciales)
         self.param_a = ttk.Entry(self.params_frame)
@@ -64,25 +104,94 @@ class GeneradorNumerosAleatorios:
         # Parámetros para exponencial
         self.param_lambda = ttk.Entry(self.params_frame)
         self.param_lambda.insert(0, "1")
+        self.metodo_exponencial = tk.StringVar(value="inversa")
+        self.metodo_exponencial_combo = ttk.Combobox(self.params_frame, textvariable=self.metodo_exponencial,
+                                                     values=generadores.METODOS_EXPONENCIAL, state="readonly")
         
         # Parámetros para normal
         self.param_mu = ttk.Entry(self.params_frame)
         self.param_mu.insert(0, "0")
         self.param_sigma = ttk.Entry(self.params_frame)
         self.param_sigma.insert(0, "1")
+        self.metodo_normal = tk.StringVar(value="box_muller")
+        self.metodo_normal_combo = ttk.Combobox(self.params_frame, textvariable=self.metodo_normal,
+                                                values=generadores.METODOS_NORMAL, state="readonly")
+
+        # Parámetros de las distribuciones del registro (distribuciones.py): un campo por
+        # parámetro, con su valor por defecto
+        self.params_registro = {}
+        for nombre, distribucion in distribuciones.REGISTRO.items():
+            self.params_registro[nombre] = {}
+            for clave, _, defecto, _ in distribucion.parametros:
+                entrada = ttk.Entry(self.params_frame)
+                entrada.insert(0, defecto)
+                self.params_registro[nombre][clave] = entrada
         
         # Inicialmente mostrar parámetros de uniforme
         self.mostrar_params_uniforme()
         
         # Número de intervalos para el histograma
-        ttk.Label(panel_izquierdo, text="Intervalos:").grid(row=3, column=0, sticky=tk.W, pady=5)
+        ttk.Label(panel_izquierdo, text="Intervalos:").grid(row=4, column=0, sticky=tk.W, pady=5)
         intervalos_opciones = [10, 15, 20, 30]
         intervalos_combo = ttk.Combobox(panel_izquierdo, textvariable=self.intervalos, values=intervalos_opciones, state="readonly")
-        intervalos_combo.grid(row=3, column=1, sticky=tk.W, pady=5)
-        
-        # Botón para generar números
+        intervalos_combo.grid(row=4, column=1, sticky=tk.W, pady=5)
+        # Al cambiar la cantidad de intervalos se recalcula la tabla de la última muestra
+        intervalos_combo.bind("<<ComboboxSelected>>", self.reagrupar)
+
+        # Límites de intervalos elegidos por el usuario (por ejemplo "0; 0.25; 0.5; 1"). Si se
+        # completan, reemplazan a la cantidad de intervalos; se aplican con Enter
+        ttk.Label(panel_izquierdo, text="Límites propios:").grid(row=5, column=0, sticky=tk.W, pady=5)
+        self.limites_propios = ttk.Entry(panel_izquierdo)
+        self.limites_propios.grid(row=5, column=1, sticky=tk.W, pady=5)
+        self.limites_propios.bind("<Return>", self.reagrupar)
+        
+        # Archivo opcional para guardar la muestra en disco (np.memmap) en lugar de en memoria,
+        # para muestras más grandes que la RAM
+        ttk.Label(panel_izquierdo, text="Archivo de muestra:").grid(row=6, column=0, sticky=tk.W, pady=5)
+        self.archivo_muestra = ttk.Entry(panel_izquierdo)
+        self.archivo_muestra.grid(row=6, column=1, sticky=tk.W, pady=5)
+
+        # Tipo de dato de la muestra: float32 ocupa la mitad de memoria que float64
+        ttk.Label(panel_izquierdo, text="Tipo de dato:").grid(row=7, column=0, sticky=tk.W, pady=5)
+        self.tipo_dato = tk.StringVar(value="float64")
+        ttk.Combobox(panel_izquierdo, textvariable=self.tipo_dato, values=TIPOS_DATO, state="readonly").grid(
+            row=7, column=1, sticky=tk.W, pady=5)
+
+        # Fuente de las uniformes: el LCG del TP (por defecto, reproduce las semillas de siempre),
+        # PCG64 o Philox de numpy, o la secuencia cuasi aleatoria de Sobol (ver generadores.FUENTES_UNIFORMES)
+        ttk.Label(panel_izquierdo, text="Generador:").grid(row=8, column=0, sticky=tk.W, pady=5)
+        self.generador = tk.StringVar(value="lcg")
+        ttk.Combobox(panel_izquierdo, textvariable=self.generador, values=generadores.GENERADORES,
+                     state="readonly").grid(row=8, column=1, sticky=tk.W, pady=5)
+
+        # Cantidad de muestras: con más de una se generan todas juntas, con semillas derivadas de
+        # la semilla (ver generadores.semillas_lote), y la tabla muestra la media ± el desvío de
+        # la frecuencia de cada intervalo
+        ttk.Label(panel_izquierdo, text="Muestras (K):").grid(row=9, column=0, sticky=tk.W, pady=5)
+        self.cantidad_muestras = ttk.Entry(panel_izquierdo)
+        self.cantidad_muestras.insert(0, "1")
+        self.cantidad_muestras.grid(row=9, column=1, sticky=tk.W, pady=5)
+
+        # Botones para generar números y cancelar la generación en curso
         generar_btn = ttk.Button(panel_izquierdo, text="Generar Números", command=self.generar_numeros)
-        generar_btn.grid(row=4, column=0, columnspan=2, pady=10)
+        generar_btn.grid(row=10, column=0, pady=10)
+        self.cancelar_btn = ttk.Button(panel_izquierdo, text="Cancelar", command=self.cancelar_generacion,
+                                       state=tk.DISABLED)
+        self.cancelar_btn.grid(row=10, column=1, pady=10)
+
+        # Exportar la última muestra y su tabla a CSV (.csv o .csv.gz) o Parquet (ver exportar.py)
+        ttk.Button(panel_izquierdo, text="Exportar...", command=self.exportar).grid(row=11, column=0, pady=5)
+
+        # Progreso de la generación en segundo plano
+        self.progreso = tk.DoubleVar(value=0)
+        ttk.Progressbar(panel_izquierdo, variable=self.progreso, maximum=100).grid(
+            row=12, column=0, columnspan=2, sticky=tk.W + tk.E, pady=5)
+        self.estado_label = ttk.Label(panel_izquierdo, text="")
+        self.estado_label.grid(row=13, column=0, columnspan=2, sticky=tk.W, pady=5)
+
+        # Memoria máxima usada por el proceso
+        self.memoria_label = ttk.Label(panel_izquierdo, text="")
+        self.memoria_label.grid(row=14, column=0, columnspan=2, sticky=tk.W, pady=5)
         
         # Panel derecho para visualización
         panel_derecho = ttk.Frame(main_frame)
@@ -98,6 +207,8 @@ class GeneradorNumerosAleatorios:
         self.canvas = FigureCanvasTkAgg(self.fig, master=panel_derecho)
         self.canvas_widget = self.canvas.get_tk_widget()
         self.canvas_widget.pack(fill=tk.BOTH, expand=True, pady=5)
+        # Las barras se reutilizan entre histogramas y se redibujan con blitting (ver histograma.py)
+        self.histograma = HistogramaRapido(self.fig, self.ax, self.canvas)
         
         # Área para la tabla de frecuencias
         ttk.Label(panel_derecho, text="Tabla de Frecuencias:").pack(anchor=tk.W, pady=5)
@@ -121,6 +232,8 @@ class GeneradorNumerosAleatorios:
         
         ttk.Label(self.params_frame, text="λ (lambda):").grid(row=0, column=0, sticky=tk.W, pady=5)
         self.param_lambda.grid(row=0, column=1, sticky=tk.W, pady=5)
+        ttk.Label(self.params_frame, text="Método:").grid(row=1, column=0, sticky=tk.W, pady=5)
+        self.metodo_exponencial_combo.grid(row=1, column=1, sticky=tk.W, pady=5)
     
     def mostrar_params_normal(self):
         # Limpiar frame de parámetros
@@ -131,7 +244,18 @@ class GeneradorNumerosAleatorios:
         self.param_mu.grid(row=0, column=1, sticky=tk.W, pady=5)
         ttk.Label(self.params_frame, text="σ (desviación):").grid(row=1, column=0, sticky=tk.W, pady=5)
         self.param_sigma.grid(row=1, column=1, sticky=tk.W, pady=5)
+        ttk.Label(self.params_frame, text="Método:").grid(row=2, column=0, sticky=tk.W, pady=5)
+        self.metodo_normal_combo.grid(row=2, column=1, sticky=tk.W, pady=5)
     
+    def mostrar_params_registro(self, distribucion):
+        # Limpiar frame de parámetros
+        for widget in self.params_frame.winfo_children():
+            widget.grid_forget()
+
+        for fila, (clave, etiqueta, _, _) in enumerate(distribuciones.REGISTRO[distribucion].parametros):
+            ttk.Label(self.params_frame, text=f"{etiqueta}:").grid(row=fila, column=0, sticky=tk.W, pady=5)
+            self.params_registro[distribucion][clave].grid(row=fila, column=1, sticky=tk.W, pady=5)
+
     def actualizar_parametros(self, event=None):
         distribucion = self.distribucion_actual.get()
         if distribucion == "uniforme":
@@ -140,81 +264,60 @@ class GeneradorNumerosAleatorios:
             self.mostrar_params_exponencial()
         elif distribucion == "normal":
             self.mostrar_params_normal()
+        else:
+            self.mostrar_params_registro(distribucion)
 
     @staticmethod
     def generar_rnd(semilla, tamaño_muestra):
         #Utilizamos el metodo congruencial lineal para generar numeros random [0;1)
-        k = 4
-        a = 1664525   # Multiplicador
-        c   = 1013904223 # Incremento
-        m = 2**32    # Módulo
-        x = semilla    
-        numeros = []
-
-        for i in range(tamaño_muestra):
-            x = (a * x + c) % m  # Fórmula del MCL
-            u = x / m   # Normalización a [0,1)
-            numeros.append(u)
-
-        return numeros
+        # (a=1664525, c=1013904223, m=2**32). El cálculo vectorizado por bloques está en
+        # generadores.py y devuelve la misma secuencia que el bucle original como arreglo float64.
+        return generadores.generar_rnd(semilla, tamaño_muestra)
     #El numero devuelto nunca será 1 ya que xi asume valores entre (0;m-1) y al dividir por m nunca dará 1.
 
     # Recibe como parametro el arreglo de s U[0;1) y lambda
     @staticmethod
-    def generar_exponencial(numeros_u, lambda_val):
+    def generar_exponencial(numeros_u, lambda_val, salida=None, metodo="inversa"):
         # Método de la transformada inversa para distribución exponencial
         # Si U ~ Uniforme(0,1), entonces X = -ln(U)/λ ~ Exponencial(λ)
-        return [-math.log(1.0 - u) / lambda_val for u in numeros_u]
+        # Se calcula con numpy sobre el arreglo 'salida' (opcional), sin armar una lista.
+        # Con metodo="ziggurat" se evitan la mayoría de los logaritmos (ver generadores.py)
+        return generadores.generar_exponencial(numeros_u, lambda_val, salida, metodo)
     
 
     # Recibe como parametro el arreglo de numeros U[0;1), la media y la desviación estandar
     @staticmethod
-    def generar_normal(numeros_u, mu, sigma):
+    def generar_normal(numeros_u, mu, sigma, metodo="box_muller"):
         # Método de Box-Muller para distribución normal
         # Si U1, U2 ~ Uniforme(0,1), entonces:
         # Z1 = sqrt(-2*ln(U1))*cos(2π*U2) ~ Normal(0,1)
         # Z2 = sqrt(-2*ln(U1))*sin(2π*U2) ~ Normal(0,1)
         # X = mu + sigma*Z ~ Normal(mu, sigma)
-        
-        n = len(numeros_u)
-        # Aseguramos un número par para generar pares de valores
-        if n % 2 != 0:
-            numeros_u = numeros_u[:-1]
-            n -= 1
-            
-        numeros_normales = []
-
-
-        # Recorre todo el arreglo de numero U[0;1) del primero hasta el ultimo y toma cada par para generar 2 numeros
-        # con distribución normal
-        for i in range(0, n, 2):
-            # Evitar el logaritmo de 0
-            u1 = max(numeros_u[i], 1e-10)
-            u2 = numeros_u[i+1]
-            
-            # Aplicar transformación Box-Muller
-            z1 = math.sqrt(-2.0 * math.log(u1)) * math.cos(2.0 * math.pi * u2)
-            z2 = math.sqrt(-2.0 * math.log(u1)) * math.sin(2.0 * math.pi * u2)
-            
-            # Transformar a la distribución normal deseada
-            x1 = mu + sigma * z1
-            x2 = mu + sigma * z2
-            
-            numeros_normales.append(x1)
-            numeros_normales.append(x2)
-            
-        return numeros_normales
+        # Toma cada par de numeros U[0;1) y genera 2 numeros con distribución normal, todos los
+        # pares a la vez con numpy. También se puede elegir el método polar o el ziggurat,
+        # que descartan algunos valores (ver generadores.generar_normal).
+        return generadores.generar_normal(numeros_u, mu, sigma, metodo)
     
 
     def generar_numeros(self):
         try:
             # Obtener tamaño de muestra
             n = int(self.tamano_muestra.get())
-            if n <= 0 or n > 1000000:
-                raise ValueError("El tamaño de muestra debe ser mayor a 0 y menor o igual a 1.000.000")
+            if n <= 0:
+                raise ValueError("El tamaño de muestra debe ser mayor a 0")
 
             # Generar números según la distribución seleccionada
             distribucion = self.distribucion_actual.get()
+            if self.semilla.get().strip():
+                if not self.semilla.get().strip().isdigit():
+                    raise ValueError("La semilla debe ser un entero mayor o igual a 0")
+                semilla_aleatoria = int(self.semilla.get())
+            else:
+                semilla_aleatoria = random.randint(0, 4294967295)
+            texto_muestras = self.cantidad_muestras.get().strip() or "1"
+            if not texto_muestras.isdigit() or int(texto_muestras) < 1:
+                raise ValueError("La cantidad de muestras debe ser un entero mayor o igual a 1")
+            cantidad_muestras = int(texto_muestras)
 
             if distribucion == "uniforme":
                 a = float(self.param_a.get())
@@ -222,21 +325,15 @@ class GeneradorNumerosAleatorios:
                 if a >= b:
                     raise ValueError("El valor de 'a' debe ser menor que 'b'")
                 # Generamos números en el rango [a, b)
-                semilla_aleatoria = random.randint(0, 4294967295)
-                numeros_u = GeneradorNumerosAleatorios.generar_rnd(semilla_aleatoria, n)  # Números con distribución [0,1)
-                self.numeros_generados = [a + (b - a) * u for u in numeros_u]  # Transformación a [a, b)
-                print(self.numeros_generados)
-                # Para asegurar que no hay valores exactamente iguales a b
-                self.numeros_generados = np.where(self.numeros_generados == b, a, self.numeros_generados)
+                parametros = {"a": a, "b": b}
                 titulo = f"Distribución Uniforme [{a}, {b})"
 
             elif distribucion == "exponencial":
                 lambda_val = float(self.param_lambda.get())
                 if lambda_val <= 0:
                     raise ValueError("Lambda debe ser mayor que 0")
-                semilla_aleatoria = random.randint(0, 4294967295)
-                numeros_u = GeneradorNumerosAleatorios.generar_rnd(semilla_aleatoria, n)  # Números con distribución [0,1)
-                self.numeros_generados = GeneradorNumerosAleatorios.generar_exponencial(numeros_u, lambda_val)
+                # Con la transformada inversa se usan n números [0,1); el ziggurat pide más si le faltan
+                parametros = {"lambda_val": lambda_val, "metodo": self.metodo_exponencial.get()}
                 titulo = f"Distribución Exponencial [λ={lambda_val}]"
 
             elif distribucion == "normal":
@@ -244,116 +341,405 @@ class GeneradorNumerosAleatorios:
                 sigma = float(self.param_sigma.get())
                 if sigma <= 0:
                     raise ValueError("La desviación estándar debe ser mayor que 0")
-                # Método Box-Muller para generar números con distribución normal
-                # Si se requieren por ejemplo 11 valores, vamos a generar 12 
-                temp_n = n
-                if n % 2 != 0:
-                    temp_n += 1  # Asegurarnos de tener un número par de valores uniformes
+                # Con Box-Muller, si se requieren por ejemplo 11 valores, vamos a generar 12 uniformes.
+                # Polar y ziggurat piden más uniformes a la misma secuencia hasta completar n valores
+                parametros = {"mu": mu, "sigma": sigma, "metodo": self.metodo_normal.get()}
+                titulo = f"Distribución Normal [μ={mu}, σ={sigma}]"
 
-                semilla_aleatoria = random.randint(0, 4294967295)
-                numeros_u_adicionales = GeneradorNumerosAleatorios.generar_rnd(semilla_aleatoria + 1000, temp_n)
-                self.numeros_generados = GeneradorNumerosAleatorios.generar_normal(numeros_u_adicionales, mu, sigma)
+            else:
+                # Distribuciones del registro: cada una convierte y valida sus parámetros
+                registrada = distribuciones.REGISTRO[distribucion]
+                parametros = registrada.leer({clave: entrada.get()
+                                              for clave, entrada in self.params_registro[distribucion].items()})
+                titulo = registrada.titulo(parametros)
 
-                # Por ultimo tomamos la cantidad de numeros que necesitabamos inicialmente (n)
-                self.numeros_generados = self.numeros_generados[:n]
-                titulo = f"Distribución Normal [μ={mu}, σ={sigma}]"
+            # La fuente de uniformes viaja con los parámetros, como el método (y forma parte de la
+            # clave de la caché)
+            parametros["generador"] = self.generador.get()
+            generadores.verificar_generador(distribucion, parametros)
 
-            # Redondear a 4 dígitos decimales
-            self.numeros_generados = np.round(self.numeros_generados, 4)
+            # La normal usa la semilla + 1000 (ver generadores.semilla_de_secuencia)
+            semilla = generadores.semilla_de_secuencia(distribucion, semilla_aleatoria)
+            ruta_muestra = self.archivo_muestra.get().strip() or None
+            limites = self.leer_limites()
+            dtype = np.dtype(self.tipo_dato.get())
 
-            # Mostrar los primeros 100 números generados
-            self.numeros_text.delete(1.0, tk.END)
-            numeros_mostrar = self.numeros_generados[:100]
-            texto_numeros = ", ".join([str(num) for num in numeros_mostrar])
-            if n > 100:
-                texto_numeros += "... (y " + str(n - 100) + " más)"
-            self.numeros_text.insert(tk.END, texto_numeros)
+            if cantidad_muestras > 1:
+                # Varias muestras: se generan todas juntas en memoria y no pasan por la caché
+                if ruta_muestra is not None:
+                    raise ValueError("Con varias muestras no se puede usar un archivo de muestra")
+                if cantidad_muestras * n > LIMITE_LOTE:
+                    raise ValueError(f"Con varias muestras, muestras × tamaño no puede superar {LIMITE_LOTE:,}")
+                self.generando = True
+                self.iniciar_pedido(self.generar_lote_en_segundo_plano, f"Generando {cantidad_muestras} muestras...",
+                                    distribucion, parametros, titulo, semilla_aleatoria, cantidad_muestras, n, dtype)
+                return
 
-            # Generar histograma
-            self.generar_histograma(titulo, distribucion, a if distribucion == "uniforme" else None,
-                                   b if distribucion == "uniforme" else None)
+            # Si la misma muestra se generó hace poco, se muestra directamente desde la caché (las
+            # muestras escritas en un archivo no se guardan, el archivo puede cambiar)
+            clave = generadores.clave_muestra(distribucion, parametros, semilla, n, dtype)
+            if ruta_muestra is None:
+                resultado = self.resultado_de_cache(clave, self.clave_tabla(limites, self.intervalos.get()), titulo)
+                if resultado is not None:
+                    self.cancelar_generacion()
+                    self.pedido_actual += 1
+                    self.mostrar_resultado(self.pedido_actual, resultado)
+                    return
+
+            # Los widgets de Tk solo se tocan desde el hilo principal: acá se leyeron todos los
+            # datos del formulario y el hilo devuelve los resultados con root.after
+            self.generando = True
+            self.iniciar_pedido(self.generar_en_segundo_plano, "Generando...", distribucion, parametros, titulo,
+                                semilla_aleatoria, semilla, n, dtype, self.intervalos.get(), limites, ruta_muestra)
 
         except ValueError as e:
             messagebox.showerror("Error", str(e))
         except Exception as e:
             messagebox.showerror("Error", f"Error inesperado: {str(e)}")
+
+    def leer_limites(self):
+        # Límites propios separados por ';', ',' o espacios; None si no se completaron
+        texto = self.limites_propios.get().strip()
+        if not texto:
+            return None
+        try:
+            limites = np.array([float(valor) for valor in re.split(r"[;,\s]+", texto) if valor], dtype=np.float64)
+        except ValueError:
+            raise ValueError("Los límites propios deben ser números separados por ';'")
+        if len(limites) < 2:
+            raise ValueError("Se necesitan al menos 2 límites para armar un intervalo")
+        if np.any(np.diff(limites) <= 0):
+            raise ValueError("Los límites propios deben estar en orden creciente y sin repetirse")
+        return limites
+
+    @staticmethod
+    def clave_tabla(limites, n_bins):
+        # Identifica los intervalos de una tabla: límites propios o cantidad de intervalos
+        return ("limites", tuple(limites)) if limites is not None else ("intervalos", n_bins)
+
+    def resultado_de_cache(self, clave, clave_tabla, titulo):
+        # Resultado guardado listo para mostrar, o None si no está (o si es una muestra por
+        # bloques y todavía no se contó con esos intervalos)
+        guardado = self.cache.obtener(clave)
+        if guardado is None:
+            return None
+        counts, bins = None, None
+        if guardado["indice"] is None:
+            if clave_tabla not in guardado["tablas"]:
+                return None
+            counts, bins = guardado["tablas"][clave_tabla]
+        return dict(guardado, titulo=titulo, counts=counts, bins=bins,
+                    estado=f"Listo desde la caché (semilla {guardado['semilla_usuario']})")
+
+    @staticmethod
+    def tamaño_resultado(resultado):
+        # Bytes que ocupan los arreglos del resultado, para el presupuesto de la caché
+        tamaño = sum(counts.nbytes + bins.nbytes for counts, bins in resultado["tablas"].values())
+        if resultado["numeros"] is not None:
+            tamaño += resultado["numeros"].nbytes
+        if resultado["indice"] is not None:
+            tamaño += resultado["indice"].valores.nbytes
+        return tamaño
+
+    def intervalos_por_defecto(self, resultado, n_bins):
+        # Límites de la tabla según la distribución; para exponencial el máximo (percentil 99,5)
+        # sale del bosquejo de cuantiles armado al generar
+        max_val = None
+        if resultado["distribucion"] == "exponencial":
+            max_val = resultado["bosquejo"].percentil(99.5)
+        return generadores.calcular_intervalos(resultado["distribucion"], resultado["parametros"], n_bins, max_val)
+
+    def iniciar_pedido(self, funcion, estado, *args):
+        # Un pedido nuevo reemplaza al que todavía esté corriendo
+        if self.cancelacion is not None:
+            self.cancelacion.set()
+        self.pedido_actual += 1
+        self.cancelacion = threading.Event()
+        self.progreso.set(0)
+        self.estado_label.config(text=estado)
+        self.cancelar_btn.config(state=tk.NORMAL)
+        self.hilo_generacion = threading.Thread(target=funcion, args=(self.pedido_actual, self.cancelacion) + args,
+                                                daemon=True)
+        self.hilo_generacion.start()
+
+    def cancelar_generacion(self):
+        if self.cancelacion is not None:
+            self.cancelacion.set()
+
+    def funcion_progreso(self, pedido, cancelacion):
+        # Se llama desde el hilo después de cada bloque: corta si se canceló el pedido y si no
+        # le pasa el porcentaje a la interfaz
+        def progreso(hechos, total):
+            if cancelacion.is_set():
+                raise generadores.GeneracionCancelada()
+            self.root.after(0, self.mostrar_progreso, pedido, 100.0 * hechos / total)
+        return progreso
+
+    def generar_en_segundo_plano(self, pedido, cancelacion, distribucion, parametros, titulo, semilla_usuario,
+                                 semilla, n, dtype, n_bins, limites, ruta_muestra):
+        # Corre en un hilo aparte: genera la muestra y cuenta las frecuencias sin tocar la interfaz
+        progreso = self.funcion_progreso(pedido, cancelacion)
+        try:
+            indice = None
+            if n <= LIMITE_EN_MEMORIA or ruta_muestra is not None:
+                # Los números se guardan sin redondear en un arreglo del tipo elegido (se muestran con
+                # 4 decimales). Para exponencial el bosquejo de cuantiles se actualiza mientras
+                # tanto, así el percentil del último intervalo no necesita otra pasada; las demás
+                # distribuciones no lo usan.
+                # Si se indicó un archivo, la muestra se escribe de a bloques en un np.memmap
+                bosquejo = generadores.BosquejoCuantiles() if distribucion == "exponencial" else None
+                salida = generadores.crear_buffer(n, ruta_muestra, dtype)
+                numeros = generadores.generar_muestra(distribucion, parametros, semilla, n, bosquejo=bosquejo,
+                                                      salida=salida, tamaño_bloque=BLOQUE_PROGRESO,
+                                                      progreso=progreso)
+                numeros_mostrar = numeros[:100]
+                if n <= LIMITE_EN_MEMORIA:
+                    # Con la muestra ordenada la tabla se arma (y se rearma) con searchsorted; las
+                    # frecuencias se cuentan al mostrar el resultado, con los intervalos elegidos en ese momento
+                    indice = generadores.IndiceOrdenado(numeros)
+                    counts, bins = None, None
+                else:
+                    bins = limites
+                    if bins is None:
+                        bins = self.intervalos_por_defecto(
+                            {"distribucion": distribucion, "parametros": parametros, "bosquejo": bosquejo}, n_bins)
+                    counts = generadores.contar_frecuencias(numeros, bins)
+            else:
+                # Muestras grandes: se generan de a bloques y solo se acumulan las frecuencias,
+                # que dan igual que si se hubiera generado todo junto
+                bosquejo, numeros = None, None
+                numeros_mostrar = generadores.generar_muestra(distribucion, parametros, semilla, 100, dtype=dtype)
+                counts, bins = generadores.tabla_frecuencias_flujo(distribucion, parametros, semilla, n, n_bins,
+                                                                   progreso=progreso, bins=limites, dtype=dtype)
+
+            resultado = {"distribucion": distribucion, "parametros": parametros, "titulo": titulo,
+                         "semilla_usuario": semilla_usuario, "semilla": semilla, "n": n, "dtype": dtype,
+                         "numeros": numeros,
+                         "bosquejo": bosquejo, "indice": indice, "counts": counts, "bins": bins,
+                         "texto": self.texto_numeros(distribucion, numeros_mostrar, n), "tablas": {},
+                         "estado": f"Listo (semilla {semilla_usuario})"}
+            if ruta_muestra is None:
+                # Las muestras por bloques guardan sus tablas ya contadas, una por juego de intervalos
+                if indice is None:
+                    resultado["tablas"][self.clave_tabla(limites, n_bins)] = (counts, bins)
+                self.cache.guardar(generadores.clave_muestra(distribucion, parametros, semilla, n, dtype), resultado,
+                                   self.tamaño_resultado(resultado))
+            self.root.after(0, self.mostrar_resultado, pedido, resultado)
+        except generadores.GeneracionCancelada:
+            self.root.after(0, self.terminar_pedido, pedido, "Generación cancelada")
+        except Exception as e:
+            self.root.after(0, self.mostrar_error_generacion, pedido, e)
+
+    def generar_lote_en_segundo_plano(self, pedido, cancelacion, distribucion, parametros, titulo, semilla_usuario,
+                                      cantidad_muestras, n, dtype):
+        # Corre en un hilo aparte: genera las K muestras como una matriz (una por fila) y guarda
+        # solo su copia ordenada, con la que se cuentan las frecuencias de todas las filas
+        try:
+            # Semillas derivadas de la elegida; la normal usa cada una + 1000, como con una sola
+            semillas = [generadores.semilla_de_secuencia(distribucion, semilla)
+                        for semilla in generadores.semillas_lote(semilla_usuario, cantidad_muestras)]
+            # La matriz ocupa la primera mitad de la barra; la otra mitad es ordenarla
+            progreso = self.funcion_progreso(pedido, cancelacion)
+            matriz = generadores.generar_matriz(distribucion, parametros, semillas, n, dtype,
+                                                progreso=lambda hechos, total: progreso(hechos, 2 * total))
+            bosquejo = None
+            if distribucion == "exponencial":
+                bosquejo = generadores.BosquejoCuantiles()
+                bosquejo.actualizar(matriz.ravel())
+            indice = generadores.IndiceOrdenado(matriz)
+            texto = self.texto_numeros(distribucion, matriz[0, :100], n) + f"\n(muestra 1 de {cantidad_muestras})"
+            resultado = {"distribucion": distribucion, "parametros": parametros, "titulo": titulo,
+                         "semilla_usuario": semilla_usuario, "semilla": semillas[0], "n": n, "dtype": dtype,
+                         "numeros": None, "bosquejo": bosquejo, "indice": indice, "counts": None, "bins": None,
+                         "texto": texto, "tablas": {}, "lote": cantidad_muestras,
+                         "estado": f"Listo: {cantidad_muestras} muestras (semilla {semilla_usuario})"}
+            self.root.after(0, self.mostrar_resultado, pedido, resultado)
+        except generadores.GeneracionCancelada:
+            self.root.after(0, self.terminar_pedido, pedido, "Generación cancelada")
+        except Exception as e:
+            self.root.after(0, self.mostrar_error_generacion, pedido, e)
+
+    @staticmethod
+    def texto_numeros(distribucion, numeros_mostrar, n):
+        # El redondeo a 4 decimales es solo para mostrar (las discretas se muestran sin decimales)
+        discreta = distribucion in distribuciones.REGISTRO and distribuciones.REGISTRO[distribucion].discreta
+        texto_numeros = ", ".join([f"{num:g}" if discreta else f"{num:.4f}" for num in numeros_mostrar])
+        if n > 100:
+            texto_numeros += "... (y " + str(n - 100) + " más)"
+        return texto_numeros
+
+    def reagrupar(self, event=None):
+        # Recalcula la tabla y el histograma de la última muestra con los intervalos elegidos
+        if self.resultado_actual is None or self.generando:
+            # Si se está generando, la muestra nueva ya usa los intervalos elegidos al terminar
+            return
+        try:
+            limites = self.leer_limites()
+        except ValueError as e:
+            messagebox.showerror("Error", str(e))
+            return
+        resultado = self.resultado_actual
+        if self.indice is not None:
+            # Muestra en memoria: searchsorted sobre la muestra ordenada, sin volver a recorrerla
+            bins = limites if limites is not None else self.intervalos_por_defecto(resultado, self.intervalos.get())
+            self.generar_histograma(resultado["titulo"], resultado["distribucion"], self.indice.contar(bins), bins)
+            return
+        # Muestra en archivo o generada por bloques: se cuenta de nuevo en segundo plano
+        self.iniciar_pedido(self.contar_en_segundo_plano, "Recalculando tabla...", resultado, limites,
+                            self.intervalos.get())
+
+    def contar_en_segundo_plano(self, pedido, cancelacion, resultado, limites, n_bins):
+        progreso = self.funcion_progreso(pedido, cancelacion)
+        try:
+            if resultado["numeros"] is not None:
+                bins = limites if limites is not None else self.intervalos_por_defecto(resultado, n_bins)
+                counts = generadores.contar_frecuencias(resultado["numeros"], bins)
+            elif self.clave_tabla(limites, n_bins) in resultado["tablas"]:
+                counts, bins = resultado["tablas"][self.clave_tabla(limites, n_bins)]
+            else:
+                # La muestra no se guardó: se vuelve a generar por bloques con la misma semilla, y
+                # la tabla queda guardada junto al resultado (también en la caché)
+                counts, bins = generadores.tabla_frecuencias_flujo(
+                    resultado["distribucion"], resultado["parametros"], resultado["semilla"], resultado["n"],
+                    n_bins, progreso=progreso, bins=limites, dtype=resultado["dtype"])
+                resultado["tablas"][self.clave_tabla(limites, n_bins)] = (counts, bins)
+                # La entrada de la caché comparte el dict de tablas: ahora ocupa más
+                self.cache.actualizar_tamaño(
+                    generadores.clave_muestra(resultado["distribucion"], resultado["parametros"],
+                                              resultado["semilla"], resultado["n"], resultado["dtype"]),
+                    self.tamaño_resultado(resultado))
+            self.root.after(0, self.mostrar_tabla_reagrupada, pedido, resultado, counts, bins)
+        except generadores.GeneracionCancelada:
+            self.root.after(0, self.terminar_pedido, pedido, "Cálculo cancelado")
+        except Exception as e:
+            self.root.after(0, self.mostrar_error_generacion, pedido, e)
+
+    def mostrar_tabla_reagrupada(self, pedido, resultado, counts, bins):
+        if self.terminar_pedido(pedido, "Listo"):
+            self.progreso.set(100)
+            self.generar_histograma(resultado["titulo"], resultado["distribucion"], counts, bins)
+
+    def exportar(self):
+        if self.resultado_actual is not None and self.resultado_actual.get("lote"):
+            messagebox.showerror("Error", "Solo se puede exportar una muestra (K = 1)")
+            return
+        if self.resultado_actual is None or self.tabla_actual is None:
+            messagebox.showerror("Error", "Primero hay que generar una muestra")
+            return
+        ruta = filedialog.asksaveasfilename(
+            defaultextension=".csv.gz",
+            filetypes=[("CSV comprimido", "*.csv.gz"), ("CSV", "*.csv"), ("Parquet", "*.parquet")])
+        if not ruta:
+            return
+        try:
+            exportar.verificar_formato(ruta)
+        except ValueError as e:
+            messagebox.showerror("Error", str(e))
+            return
+        self.iniciar_pedido(self.exportar_en_segundo_plano, "Exportando...", self.resultado_actual, self.tabla_actual,
+                            ruta)
+
+    def exportar_en_segundo_plano(self, pedido, cancelacion, resultado, tabla, ruta):
+        # La muestra va de a bloques: si está en memoria (o en su archivo) se recorre por tramos;
+        # si se generó por bloques se vuelve a generar con la misma semilla, sin guardarla
+        progreso = self.funcion_progreso(pedido, cancelacion)
+        try:
+            datos = exportar.metadatos(resultado["distribucion"], resultado["parametros"],
+                                       resultado["semilla_usuario"], resultado["semilla"], resultado["n"],
+                                       resultado["dtype"])
+            if resultado["numeros"] is not None:
+                bloques = exportar.bloques_de(resultado["numeros"], BLOQUE_PROGRESO)
+            else:
+                bloques = generadores.generar_bloques(resultado["distribucion"], resultado["parametros"],
+                                                      resultado["semilla"], resultado["n"], BLOQUE_PROGRESO,
+                                                      dtype=resultado["dtype"])
+            discreta = (resultado["distribucion"] in distribuciones.REGISTRO
+                        and distribuciones.REGISTRO[resultado["distribucion"]].discreta)
+            exportar.exportar_muestra(ruta, bloques, datos, decimales=0 if discreta else 6, progreso=progreso,
+                                      total=resultado["n"])
+            counts, bins, esperadas = tabla
+            exportar.exportar_tabla(exportar.ruta_tabla(ruta), counts, bins, datos, esperadas)
+            self.root.after(0, self.terminar_pedido, pedido, f"Exportado a {ruta}")
+        except generadores.GeneracionCancelada:
+            self.root.after(0, self.terminar_pedido, pedido, "Exportación cancelada")
+        except Exception as e:
+            self.root.after(0, self.mostrar_error_generacion, pedido, e)
+
+    def mostrar_progreso(self, pedido, porcentaje):
+        if pedido == self.pedido_actual:
+            self.progreso.set(porcentaje)
+
+    def terminar_pedido(self, pedido, estado):
+        # Devuelve True si el pedido sigue siendo el último; si no, sus resultados se ignoran
+        if pedido != self.pedido_actual:
+            return False
+        self.cancelacion = None
+        self.generando = False
+        self.cancelar_btn.config(state=tk.DISABLED)
+        self.estado_label.config(text=estado)
+        return True
+
+    def mostrar_error_generacion(self, pedido, error):
+        if self.terminar_pedido(pedido, "Error en la generación"):
+            messagebox.showerror("Error", f"Error inesperado: {str(error)}")
+
+    def mostrar_resultado(self, pedido, resultado):
+        if not self.terminar_pedido(pedido, resultado["estado"]):
+            return
+        self.progreso.set(100)
+        self.resultado_actual = resultado
+        self.indice = resultado["indice"]
+        self.parametros_actuales = resultado["parametros"]
+        self.numeros_generados = resultado["numeros"]
+
+        # Mostrar los primeros 100 números generados
+        self.numeros_text.delete(1.0, tk.END)
+        self.numeros_text.insert(tk.END, resultado["texto"])
+
+        # Generar histograma: con índice ordenado se cuenta ahora con los intervalos elegidos; si
+        # no, con las frecuencias ya contadas en el hilo
+        if self.indice is not None:
+            self.reagrupar()
+        else:
+            self.generar_histograma(resultado["titulo"], resultado["distribucion"], resultado["counts"],
+                                    resultado["bins"])
+
+        memoria = generadores.memoria_pico_mb()
+        texto_memoria = f"Caché: {len(self.cache)} muestras, {self.cache.bytes / 1024**2:.0f} MB"
+        if memoria is not None:
+            texto_memoria = f"Memoria pico: {memoria:.0f} MB - " + texto_memoria
+        self.memoria_label.config(text=texto_memoria)
     
-    def generar_histograma(self, titulo, distribucion, a=None, b=None):
-        # Limpiar gráfico anterior
-        self.ax.clear()
-        
-        # Obtener número de intervalos
-        n_bins = self.intervalos.get()
-        
-        # Calcular límites de los intervalos según la distribución
-        if distribucion == "uniforme":
-            # Para distribución uniforme, respetamos exactamente los límites a y b
-            bins = np.linspace(a, b, n_bins + 1)
-        elif distribucion == "exponencial":
-            # Para exponencial, tomamos el parámetro lambda
-            lambda_val = float(self.param_lambda.get())
-            # El mínimo es siempre 0 para exponencial
-            min_val = 0
-            # El máximo podemos calcularlo para cubrir un porcentaje alto de la distribución
-            # Por ejemplo, para cubrir aprox. el 99% de los valores
-            max_val = np.percentile(self.numeros_generados, 99.5)
-            bins = np.linspace(min_val, max_val, n_bins + 1)
-        elif distribucion == "normal":
-            # Para normal, usamos los parámetros mu y sigma
-            mu = float(self.param_mu.get())
-            sigma = float(self.param_sigma.get())
-            # Definimos límites a ±4 sigmas desde la media para cubrir ~99.99% de los datos
-            min_val = mu - 4 * sigma
-            max_val = mu + 4 * sigma
-            bins = np.linspace(min_val, max_val, n_bins + 1)
-        
-        # Crear histograma con límites explícitos
-        counts, bins, patches = self.ax.hist(self.numeros_generados, bins=bins, edgecolor='black', alpha=0.7, rwidth=0.9)
-        
-        # Configurar el gráfico
-        self.ax.set_title(titulo)
-        self.ax.set_xlabel("Valor")
-        self.ax.set_ylabel("Frecuencia")
-        
-        # Mejorar la visualización de los límites en el eje x
-        # Mostrar todos los límites de los intervalos
-        self.ax.set_xticks(bins)
-        # Formatear etiquetas
-        self.ax.set_xticklabels([f"{b:.4f}" for b in bins], rotation=45)
-        
-        # Añadir líneas verticales para cada límite de intervalo
-        for bin_edge in bins:
-            self.ax.axvline(x=bin_edge, color='gray', linestyle='--', alpha=0.5)
-        
-        # Añadir anotaciones para mostrar claramente cada intervalo
-        bin_centers = 0.5 * (bins[:-1] + bins[1:])
-        for i in range(len(bin_centers)):
-            # Formato del intervalo según la distribución
-            intervalo_texto = f"[{bins[i]:.2f}, {bins[i+1]:.2f})"
-            self.ax.annotate(intervalo_texto,
-                           xy=(bin_centers[i], max(counts)/2 if len(counts) > 0 and max(counts) > 0 else 1),
-                           ha='center', va='center',
-                           rotation=90, color='blue', alpha=0.5)
-        
-        # Añadir grid
-        self.ax.grid(True, which='both', axis='y', linestyle='--', alpha=0.7)
-        
-        # Ajustar diseño para evitar cortar etiquetas
-        plt.tight_layout()
-        
-        # Actualizar canvas
-        self.canvas.draw()
+    def generar_histograma(self, titulo, distribucion, counts, bins):
+        # Dibujar las frecuencias ya contadas: las barras, líneas de los límites y anotaciones
+        # de cada intervalo se reutilizan en lugar de limpiar el gráfico y volver a crearlas.
+        # Con varias muestras (una fila de frecuencias por muestra) las barras son la media y
+        # las tablas de cada muestra se dibujan superpuestas
+        if np.ndim(counts) == 2:
+            self.histograma.actualizar(counts.mean(axis=0), bins, titulo, filas=counts)
+        else:
+            self.histograma.actualizar(counts, bins, titulo)
         
         # Generar y mostrar tabla de frecuencias
         self.mostrar_tabla_frecuencias(counts, bins, distribucion)
     
     def mostrar_tabla_frecuencias(self, counts, bins, distribucion):
+        if self.parametros_actuales is None:
+            return
+
         # Limpiar tabla anterior
         for widget in self.tabla_frame.winfo_children():
             widget.destroy()
         
-        # Crear tabla de frecuencias
-        columns = ("Intervalo", "Límite Inferior", "Límite Superior", "Frecuencia", "Frecuencia Relativa")
+        # Crear tabla de frecuencias. Con varias muestras cada intervalo muestra la media ± el
+        # desvío estándar de su frecuencia entre las muestras, y el mínimo y el máximo
+        lote = np.ndim(counts) == 2
+        if lote:
+            columns = ("Intervalo", "Límite Inferior", "Límite Superior", "Frecuencia (media ± desvío)",
+                       "Mínimo - Máximo", "Frecuencia Relativa", "Frecuencia Esperada")
+        else:
+            columns = ("Intervalo", "Límite Inferior", "Límite Superior", "Frecuencia", "Frecuencia Relativa",
+                       "Frecuencia Esperada")
         tabla = ttk.Treeview(self.tabla_frame, columns=columns, show='headings')
         
         # Configurar encabezados
@@ -361,9 +747,15 @@ class GeneradorNumerosAleatorios:
             tabla.heading(col, text=col)
             tabla.column(col, width=120, anchor=tk.CENTER)
         
+        # Frecuencias esperadas y pruebas de bondad de ajuste (ver estadisticas.py), una por fila
+        # si hay varias muestras
+        pruebas = estadisticas.pruebas_bondad(distribucion, self.parametros_actuales, counts, bins)
+        self.tabla_actual = None if lote else (counts, bins, pruebas["esperadas"])
+        esperadas = pruebas["esperadas"].mean(axis=0) if lote else pruebas["esperadas"]
+
         # Insertar datos
-        total = sum(counts)
-        for i in range(len(counts)):
+        total = counts.sum(axis=1).mean() if lote else sum(counts)
+        for i in range(len(bins) - 1):
             intervalo = f"Intervalo {i+1}"
             lim_inf = round(bins[i], 4)
             lim_sup = round(bins[i+1], 4)
@@ -374,10 +766,38 @@ class GeneradorNumerosAleatorios:
             else:
                 rango_intervalo = f"[{lim_inf}, {lim_sup}]"
                 
+            frec_esperada = round(float(esperadas[i]), 2)
+
+            if lote:
+                columna = counts[:, i]
+                frecuencia = f"{columna.mean():.1f} ± {columna.std(ddof=1):.1f}"
+                rango = f"{columna.min()} - {columna.max()}"
+                frec_relativa = round(columna.mean() / total, 4)
+                tabla.insert('', tk.END, values=(intervalo, lim_inf, lim_sup, frecuencia, rango, frec_relativa,
+                                                 frec_esperada))
+                continue
+
             frecuencia = int(counts[i])
             frec_relativa = round(counts[i] / total, 4)
             
-            tabla.insert('', tk.END, values=(intervalo, lim_inf, lim_sup, frecuencia, frec_relativa))
+            tabla.insert('', tk.END, values=(intervalo, lim_inf, lim_sup, frecuencia, frec_relativa, frec_esperada))
+        
+        # Resultado de las pruebas de chi-cuadrado y Kolmogorov-Smirnov
+        pruebas_frame = ttk.Frame(self.tabla_frame)
+        pruebas_frame.pack(fill=tk.X, pady=5)
+        if lote:
+            # Con muestras independientes cada prueba tendría que rechazar alrededor del 5%
+            texto_pruebas = (
+                f"{len(counts)} muestras - Chi-cuadrado ({pruebas['grados_libertad']} g.l.): "
+                f"{np.mean(pruebas['p_chi2'] < 0.05):.1%} rechazadas al 5%    "
+                f"Kolmogorov-Smirnov: {np.mean(pruebas['p_ks'] < 0.05):.1%} rechazadas al 5%")
+        else:
+            texto_pruebas = (
+                f"Chi-cuadrado: {float(pruebas['chi2']):.4f} ({pruebas['grados_libertad']} g.l., "
+                f"p = {float(pruebas['p_chi2']):.4f})    "
+                f"Kolmogorov-Smirnov: {float(pruebas['ks']):.4f} (p = {float(pruebas['p_ks']):.4f})")
+        pruebas_label = ttk.Label(pruebas_frame, text=texto_pruebas)
+        pruebas_label.pack(anchor=tk.W)
         
         # Añadir una nota explicativa para distribución uniforme
         if distribucion == "uniforme":
@@ -6,43 +6,288 @@ import random
 import io
 import os
 from datetime import datetime
+from functools import lru_cache
 
 app = Flask(__name__)
 
 # --- Variables globales para almacenar los datos de Euler ---
 euler_data_storage = {}
 
-def resolver_euler(C, T, h, d_corte):
+# Largo de cola hasta el que se precalculan los tiempos de atención al empezar cada
+# simulación (con colas más largas se calcula en el momento)
+COLA_MAXIMA_TABLA = 15
+
+def resolver_euler(C, T, h, d_corte, traza=False):
     """
     Resuelve la ecuación diferencial dD/dt = C + 0.2*T + t^2 usando el método de Euler.
-    Devuelve el tiempo 't' final, el valor 'D' final, y un DataFrame con los pasos
-    INCLUYENDO la primera fila que supera dicho umbral.
+    Devuelve el tiempo 't' final y el valor 'D' final. Con traza=True devuelve además un
+    DataFrame con los pasos INCLUYENDO la primera fila que supera dicho umbral (armado con
+    columnas_euler); sin traza el tercer valor es None y no se guarda nada por paso.
     """
+    if traza:
+        columnas, t_final, D_final = columnas_euler(C, T, h, d_corte)
+        return t_final, D_final, pd.DataFrame(columnas)
+
     t = 0
     D = 0
-    dD_dt_func = lambda t_actual, D_actual: C + 0.2 * T + t_actual**2
-    pasos = []
-    
+    K = C + 0.2 * T
     while D <= d_corte:
-        dD_dt_valor = dD_dt_func(t, D)
-        f_por_h = dD_dt_valor * h
-        D_siguiente = D + f_por_h
-        
-        pasos.append({
-            't (minutos)': t, 
-            'D (valor actual)': D, 
-            'dD/dt': dD_dt_valor,
-            'f(t,D)*h': f_por_h,
-            'D_i+1': D_siguiente
-        })
-        
-        D = D_siguiente
+        D = D + (K + t**2) * h
         t += h
-    
-    t_final = t - h 
-    D_final = D 
-    pasos_df = pd.DataFrame(pasos)
-    return t_final, D_final, pasos_df
+    return t - h, D, None
+
+def columnas_euler(C, T, h, d_corte):
+    """
+    Tabla de pasos de Euler como columnas de numpy reservadas de una vez (la cantidad de
+    pasos se conoce antes con pasos_hasta_corte). Las sumas acumuladas van en el mismo
+    orden que el bucle, así que los valores son idénticos a los de recorrerlo paso a paso.
+    Devuelve las columnas (un dict), 't' final y 'D' final.
+    """
+    n = pasos_hasta_corte(C, T, h, d_corte)
+    if n is None:
+        t_final, _, _ = resolver_euler(C, T, h, d_corte)
+        n = round(t_final / h) + 1
+
+    t, dD_dt, f_por_h, D_siguiente = _acumular_euler(C, T, h, n)
+    D = np.zeros(n)
+    D[1:] = D_siguiente[:-1]
+    columnas = {
+        't (minutos)': t[:n],
+        'D (valor actual)': D,
+        'dD/dt': dD_dt,
+        'f(t,D)*h': f_por_h,
+        'D_i+1': D_siguiente
+    }
+    return columnas, float(t[n] - h), float(D_siguiente[-1]) if n else 0
+
+def _acumular_euler(C, T, h, n):
+    """
+    Los n pasos de Euler con numpy: t (n + 1 valores, desde 0), dD/dt, f*h y D_i+1.
+    np.cumsum suma en orden, igual que el bucle, así que los valores son idénticos.
+    """
+    t = np.zeros(n + 1)
+    np.cumsum(np.full(n, h), out=t[1:])
+    # float_power usa pow() de C como t**2 con floats de Python; t[:n]**2 usa t*t, que
+    # a veces difiere en el último bit
+    dD_dt = (C + 0.2 * T) + np.float_power(t[:n], 2.0)
+    f_por_h = dD_dt * h
+    return t, dD_dt, f_por_h, np.cumsum(f_por_h)
+
+def _D_cerrada(n, K, h):
+    """D después de n pasos de Euler: h*n*K + h^3 * (0^2 + 1^2 + ... + (n-1)^2)."""
+    return h * n * K + h**3 * (n - 1) * n * (2 * n - 1) / 6
+
+def pasos_hasta_corte(C, T, h, d_corte):
+    """
+    Cantidad de pasos n que hace el bucle de resolver_euler, es decir el primer n con
+    D_n > d_corte, sin recorrer los pasos: se resuelve la cúbica D(x) = d_corte con Newton
+    y se corrige n con un par de comparaciones enteras. Devuelve None si D_n o D_(n-1)
+    quedan tan cerca del corte que el redondeo acumulado del bucle podría decidir distinto.
+    """
+    if not h > 0:
+        raise ValueError("El paso h debe ser mayor que 0")
+    if d_corte < 0:
+        return 0  # D(0) = 0 ya supera el corte: el bucle no da ningún paso
+    K = C + 0.2 * T
+    D = lambda x: _D_cerrada(x, K, h) - d_corte
+    # Punto de partida a la derecha de la raíz (donde D es convexa y creciente), así
+    # Newton baja sin pasarse
+    x = 1 + (3 * d_corte / h**3) ** (1 / 3) + abs(K) / h
+    while D(x) <= 0:
+        x *= 2
+    for _ in range(100):
+        derivada = h * K + h**3 * (6 * x * x - 6 * x + 1) / 6
+        x_nuevo = x - D(x) / derivada
+        if x_nuevo >= x - 1e-9:
+            break
+        x = x_nuevo
+    n = max(int(x), 1)
+    while D(n) <= 0:
+        n += 1
+    while n > 1 and D(n - 1) > 0:
+        n -= 1
+    # El bucle acumula D sumando n términos: su error relativo es del orden de n * 1e-16
+    escala = h * n * abs(K) + h**3 * (n - 1) * n * (2 * n - 1) / 6 + abs(d_corte)
+    if min(abs(D(n)), abs(D(n - 1))) <= 1e-9 * escala:
+        return None
+    return n
+
+def resolver_euler_exacto(C, T, h, d_corte):
+    """
+    Igual que resolver_euler pero sin el bucle de Python ni la tabla: la cantidad de pasos
+    sale de la fórmula cerrada de la iteración de Euler y 't' final y 'D' final se
+    acumulan con numpy en el mismo orden que el bucle, así que coinciden bit a bit.
+    Si el corte queda prácticamente empatado con un paso usa el bucle.
+    """
+    n = pasos_hasta_corte(C, T, h, d_corte)
+    if n is None:
+        t_final, D_final, _ = resolver_euler(C, T, h, d_corte)
+        return t_final, D_final
+    if n == 0:
+        return -h, 0
+    t, _, _, D_siguiente = _acumular_euler(C, T, h, n)
+    return float(t[n] - h), float(D_siguiente[-1])
+
+def resolver_euler_lote(C, T, h, d_corte):
+    """
+    resolver_euler para muchos pares (C, T) a la vez: C, T y d_corte son arreglos (o
+    escalares) que se combinan como en numpy y todas las trayectorias avanzan juntas, un
+    paso de Euler por vuelta. Las que ya superaron el corte se sacan del arreglo activo.
+    Hace exactamente las mismas operaciones que el bucle de resolver_euler (t se acumula
+    sumando h), así que 't' final y 'D' final coinciden bit a bit. Devuelve dos arreglos
+    con la forma combinada de las entradas.
+    """
+    if not h > 0:
+        raise ValueError("El paso h debe ser mayor que 0")
+    C, T, d_corte = np.broadcast_arrays(np.asarray(C, dtype=float), np.asarray(T, dtype=float),
+                                        np.asarray(d_corte, dtype=float))
+    forma = C.shape
+    K = (C + 0.2 * T).ravel()
+    corte = d_corte.ravel()
+    t_final = np.full(K.size, -h)  # las que no dan ningún paso (d_corte < 0)
+    D_final = np.zeros(K.size)
+
+    # Solo las trayectorias activas, compactadas: índice original, K, corte y D actual
+    indices = np.flatnonzero(corte >= 0)
+    K, corte = K[indices], corte[indices]
+    D = np.zeros(indices.size)
+    t = 0
+    while indices.size:
+        D += (K + t**2) * h
+        t += h
+        terminadas = D > corte
+        if terminadas.any():
+            t_final[indices[terminadas]] = t - h
+            D_final[indices[terminadas]] = D[terminadas]
+            seguir = ~terminadas
+            indices, K, corte, D = indices[seguir], K[seguir], corte[seguir], D[seguir]
+    return t_final.reshape(forma), D_final.reshape(forma)
+
+def tabla_tiempos_servicio(atencion_a, atencion_b, h, d_corte, cola_maxima=COLA_MAXIMA_TABLA):
+    """
+    Tiempo de atención para cada largo de cola C = 0..cola_maxima (filas) y cada RND
+    0.00..1.00 con 2 decimales (columnas), con T = a + (b - a) * RND como en /simular.
+    Se resuelven todos los pares en una sola llamada a resolver_euler_lote.
+    """
+    rnd = np.round(np.arange(101) / 100, 2)
+    T = atencion_a + (atencion_b - atencion_a) * rnd
+    t_final, _ = resolver_euler_lote(np.arange(cola_maxima + 1)[:, None], T[None, :], h, d_corte)
+    return t_final
+
+def _cruce_hermite(t0, D0, f0, t1, D1, f1, d_corte):
+    """
+    Instante en [t0, t1] en que D cruza d_corte, buscado por bisección sobre el polinomio
+    cúbico de Hermite que pasa por (t0, D0) y (t1, D1) con pendientes f0 y f1. Devuelve
+    el primer instante encontrado con D > d_corte y el valor interpolado de D ahí.
+    """
+    h = t1 - t0
+    def D(t):
+        s = (t - t0) / h
+        return ((2 * s**3 - 3 * s**2 + 1) * D0 + (s**3 - 2 * s**2 + s) * h * f0
+                + (-2 * s**3 + 3 * s**2) * D1 + (s**3 - s**2) * h * f1)
+    a, b = t0, t1
+    for _ in range(100):
+        medio = (a + b) / 2
+        if medio <= a or medio >= b:
+            break
+        if D(medio) > d_corte:
+            b = medio
+        else:
+            a = medio
+    return b, D(b)
+
+def resolver_rk4(C, T, h, d_corte):
+    """
+    Igual que resolver_euler pero con Runge-Kutta de orden 4 y paso fijo h. En el paso que
+    supera el corte se busca el instante exacto del cruce D = d_corte (interpolación de
+    Hermite), así que 't' final es el tiempo de cruce y no el comienzo de ese paso, y
+    'D' final es D interpolado en ese instante (apenas mayor que d_corte). Devuelve 't'
+    final, 'D' final y la cantidad de pasos.
+    """
+    if not h > 0:
+        raise ValueError("El paso h debe ser mayor que 0")
+    f = lambda t_actual, D_actual: C + 0.2 * T + t_actual**2
+    t, D = 0.0, 0.0
+    pasos = 0
+    if D > d_corte:
+        return -h, D, pasos  # como resolver_euler cuando no da ningún paso
+    while True:
+        k1 = f(t, D)
+        k2 = f(t + h / 2, D + h / 2 * k1)
+        k3 = f(t + h / 2, D + h / 2 * k2)
+        k4 = f(t + h, D + h * k3)
+        D_siguiente = D + h / 6 * (k1 + 2 * k2 + 2 * k3 + k4)
+        pasos += 1
+        if D_siguiente > d_corte:
+            t_cruce, D_cruce = _cruce_hermite(t, D, k1, t + h, D_siguiente, f(t + h, D_siguiente), d_corte)
+            return t_cruce, D_cruce, pasos
+        t, D = t + h, D_siguiente
+
+# Tabla de Butcher de Dormand-Prince 5(4): nodos, coeficientes, pesos de orden 5 y
+# diferencia con los de orden 4 (estimación del error)
+_DP_C = (0, 1/5, 3/10, 4/5, 8/9, 1, 1)
+_DP_A = ((),
+         (1/5,),
+         (3/40, 9/40),
+         (44/45, -56/15, 32/9),
+         (19372/6561, -25360/2187, 64448/6561, -212/729),
+         (9017/3168, -355/33, 46732/5247, 49/176, -5103/18656),
+         (35/384, 0, 500/1113, 125/192, -2187/6784, 11/84))
+_DP_E = (71/57600, 0, -71/16695, 71/1920, -17253/339200, 22/525, -1/40)
+
+def resolver_rk_adaptativo(C, T, h, d_corte, tolerancia=1e-8):
+    """
+    Dormand-Prince 5(4) con control del paso: cada paso se acepta si el error estimado
+    es menor que tolerancia * (1 + |D|) y el paso siguiente se ajusta según ese error
+    (h es solo el paso inicial). El cruce D = d_corte se busca como en resolver_rk4.
+    Devuelve 't' final, 'D' final y la cantidad de pasos (aceptados y rechazados).
+    """
+    if not h > 0:
+        raise ValueError("El paso h debe ser mayor que 0")
+    f = lambda t_actual, D_actual: C + 0.2 * T + t_actual**2
+    t, D = 0.0, 0.0
+    pasos = 0
+    if D > d_corte:
+        return -h, D, pasos  # como resolver_euler cuando no da ningún paso
+    k = [f(t, D)] + [0.0] * 6
+    while True:
+        for i in range(1, 7):
+            k[i] = f(t + _DP_C[i] * h, D + h * sum(a * kj for a, kj in zip(_DP_A[i], k)))
+        D_siguiente = D + h * sum(a * kj for a, kj in zip(_DP_A[6], k))
+        error = abs(h * sum(e * kj for e, kj in zip(_DP_E, k))) / (tolerancia * (1 + abs(D_siguiente)))
+        pasos += 1
+        if error <= 1:
+            if D_siguiente > d_corte:
+                t_cruce, D_cruce = _cruce_hermite(t, D, k[0], t + h, D_siguiente, k[6], d_corte)
+                return t_cruce, D_cruce, pasos
+            # k7 es f al final del paso: es el k1 del paso siguiente
+            t, D, k[0] = t + h, D_siguiente, k[6]
+        h *= min(5.0, max(0.2, 0.9 * error ** -0.2)) if error > 0 else 5.0
+
+# Integradores que se pueden elegir en /simular: todos reciben (C, T, h, d_corte) y
+# devuelven (t final, D final, extra), con t final = -h y D final = 0 si d_corte < 0.
+# Euler devuelve el comienzo del paso que supera el corte y la D al final de ese paso;
+# RK4 y el adaptativo, el instante del cruce y la D interpolada ahí. El tercer valor es
+# la tabla de pasos (o None) en Euler y la cantidad de pasos en los otros dos
+INTEGRADORES = {
+    'euler': resolver_euler,
+    'rk4': resolver_rk4,
+    'adaptativo': resolver_rk_adaptativo,
+}
+
+@lru_cache(maxsize=4096)
+def tiempo_servicio_rk(integrador, C, T, h, d_corte):
+    """Como tiempo_servicio_euler pero con resolver_rk4 o resolver_rk_adaptativo."""
+    return INTEGRADORES[integrador](C, T, h, d_corte)[:2]
+
+@lru_cache(maxsize=4096)
+def tiempo_servicio_euler(C, T, h, d_corte):
+    """
+    resolver_euler_exacto con caché LRU: en /simular T sale de un RND con 2 decimales
+    (101 valores posibles) y C es el largo de la cola, así que los mismos cuatro valores
+    se repiten muchísimo entre clientes y días.
+    """
+    return resolver_euler_exacto(C, T, h, d_corte)
 
 @app.route('/')
 def index():
@@ -57,6 +302,7 @@ def descargar_euler():
         paso_h = float(request.form.get('paso_h_euler'))
         cliente_id_str = request.form.get('cliente_id_euler')
         dia_str = request.form.get('dia_euler')
+        integrador = request.form.get('integrador', 'euler')
         
         if not cliente_id_str or not dia_str:
             return "Por favor, ingrese un día y un ID de cliente.", 400
@@ -66,11 +312,17 @@ def descargar_euler():
             
     except (ValueError, TypeError):
         return "Parámetros inválidos.", 400
+    if not paso_h > 0:
+        return "Error: El paso (h) de Euler debe ser mayor que 0.", 400
         
     if dia in euler_data_storage and cliente_id in euler_data_storage[dia]:
         datos_cliente = euler_data_storage[dia][cliente_id]
         C, T, d_corte = datos_cliente['C'], datos_cliente['T'], datos_cliente['d_corte']
-        t_final, D_final, pasos_df = resolver_euler(C, T, h=paso_h, d_corte=d_corte)
+        # Los pasos solo se pueden mostrar para Euler: con RK4 o el adaptativo la tabla no
+        # coincidiría con los tiempos de atención de la simulación
+        if integrador != 'euler' or datos_cliente['integrador'] != 'euler':
+            return "La descarga de pasos solo está disponible para simulaciones hechas con Euler.", 400
+        t_final, D_final, pasos_df = resolver_euler(C, T, h=paso_h, d_corte=d_corte, traza=True)
         
         output = io.BytesIO()
         with pd.ExcelWriter(output, engine='xlsxwriter') as writer:
@@ -134,11 +386,34 @@ def simular():
         atencion_a = float(request.form['atencion_a'])
         atencion_b = float(request.form['atencion_b'])
         d_corte = float(request.form['d_corte'])
+        integrador = request.form.get('integrador', 'euler')
     except (ValueError, KeyError) as e:
         return f"Error en los parámetros de entrada: {e}. Por favor, verifique los valores.", 400
 
     if llegada_a >= llegada_b or atencion_a >= atencion_b:
         return "Error: El valor de 'b' debe ser mayor que el valor de 'a' para las distribuciones.", 400
+    if not paso_h_inicial > 0:
+        return "Error: El paso (h) de Euler debe ser mayor que 0.", 400
+    if integrador not in INTEGRADORES:
+        return f"Error: Integrador desconocido: {integrador}.", 400
+
+    # Con Euler, todos los tiempos de atención posibles con colas cortas, de una vez
+    if integrador == 'euler':
+        tabla_servicio = tabla_tiempos_servicio(atencion_a, atencion_b, paso_h_inicial, d_corte)
+        cache_servicio = tiempo_servicio_euler
+    else:
+        tabla_servicio = np.empty((0, 101))
+        cache_servicio = tiempo_servicio_rk
+    aciertos_tabla = 0
+
+    def calcular_tiempo_servicio(C, rnd, T):
+        nonlocal aciertos_tabla
+        if C < tabla_servicio.shape[0]:
+            aciertos_tabla += 1
+            return float(tabla_servicio[C, int(round(rnd * 100))])
+        if integrador == 'euler':
+            return tiempo_servicio_euler(C, T, paso_h_inicial, d_corte)[0]
+        return tiempo_servicio_rk(integrador, C, T, paso_h_inicial, d_corte)[0]
         
     dias_a_simular = 0
     tiempo_a_simular_min = float('inf') 
@@ -180,6 +455,7 @@ def simular():
     iteracion_num_procesada = 0
     
     limite_seguridad_iteraciones = 200000 
+    cache_al_inicio = cache_servicio.cache_info()
     
     while iteracion_num_procesada < limite_seguridad_iteraciones:
         reloj_absoluto_actual = tiempo_dias_completos + reloj
@@ -262,9 +538,9 @@ def simular():
                 rnd_atencion = round(random.random(), 2)
                 T_atencion = atencion_a + (atencion_b - atencion_a) * rnd_atencion
                 cola_actual_para_calculo = len(cola_clientes)
-                tiempo_servicio, _, _ = resolver_euler(C=cola_actual_para_calculo, T=T_atencion, h=paso_h_inicial, d_corte=d_corte)
+                tiempo_servicio = calcular_tiempo_servicio(cola_actual_para_calculo, rnd_atencion, T_atencion)
                 duracion_atencion_actual = round(tiempo_servicio, 2)
-                euler_data_storage.setdefault(dia, {})[cliente_en_atencion_id] = {'C': cola_actual_para_calculo, 'T': T_atencion, 'd_corte': d_corte}
+                euler_data_storage.setdefault(dia, {})[cliente_en_atencion_id] = {'C': cola_actual_para_calculo, 'T': T_atencion, 'd_corte': d_corte, 'integrador': integrador}
                 inicio_atencion_tiempos[cliente_en_atencion_id], duracion_servicios[cliente_en_atencion_id] = reloj, tiempo_servicio
                 fin_atencion = reloj + tiempo_servicio
             else:
@@ -289,9 +565,9 @@ def simular():
                 estilista_estado = "Ocupado"
                 rnd_atencion = round(random.random(), 2)
                 T_atencion = atencion_a + (atencion_b - atencion_a) * rnd_atencion
-                tiempo_servicio, _, _ = resolver_euler(C=cola_actual_para_calculo, T=T_atencion, h=paso_h_inicial, d_corte=d_corte)
+                tiempo_servicio = calcular_tiempo_servicio(cola_actual_para_calculo, rnd_atencion, T_atencion)
                 duracion_atencion_actual = round(tiempo_servicio, 2)
-                euler_data_storage.setdefault(dia, {})[cliente_en_atencion_id] = {'C': cola_actual_para_calculo, 'T': T_atencion, 'd_corte': d_corte}
+                euler_data_storage.setdefault(dia, {})[cliente_en_atencion_id] = {'C': cola_actual_para_calculo, 'T': T_atencion, 'd_corte': d_corte, 'integrador': integrador}
                 inicio_atencion_tiempos[cliente_en_atencion_id], duracion_servicios[cliente_en_atencion_id] = reloj, tiempo_servicio
                 fin_atencion = reloj + tiempo_servicio
             else:
@@ -342,17 +618,25 @@ def simular():
     formula_params = {
         'llegada_a': llegada_a, 'llegada_b': llegada_b,
         'atencion_a': atencion_a, 'atencion_b': atencion_b,
-        'd_corte': d_corte
+        'd_corte': d_corte,
+        'integrador': {'euler': 'Euler', 'rk4': 'Runge-Kutta 4', 'adaptativo': 'Dormand-Prince (paso adaptativo)'}[integrador]
     }
     
+    cache_al_final = cache_servicio.cache_info()
     metricas = {
         "total_atendidos": total_atendidos, "total_acumulado": round(total_acumulado, 2),
         "promedio_atencion": round(promedio_atencion, 2),
-        "dias_cierre_a_horario": dias_cierre_a_horario
+        "dias_cierre_a_horario": dias_cierre_a_horario,
+        "tabla_aciertos": aciertos_tabla,
+        # Aciertos y fallos de la caché de tiempos de atención en esta simulación (colas
+        # más largas que la tabla precalculada)
+        "cache_aciertos": cache_al_final.hits - cache_al_inicio.hits,
+        "cache_fallos": cache_al_final.misses - cache_al_inicio.misses
     }
 
     return render_template('resultado.html', data=resultados_finales,
-                           paso_h_inicial=paso_h_inicial, metricas=metricas, formula_params=formula_params)
+                           paso_h_inicial=paso_h_inicial, metricas=metricas, formula_params=formula_params,
+                           integrador=integrador)
 
 
 if __name__ == '__main__':
@@ -433,7 +717,15 @@ if __name__ == '__main__':
                             <input type="number" class="form-control" id="d_corte" name="d_corte" value="700" step="any">
                         </div>
                         <div class="mb-3">
-                            <label for="paso_h_euler" class="form-label">Paso (h) para Método de Euler</label>
+                            <label for="integrador" class="form-label">Integrador</label>
+                            <select class="form-select" id="integrador" name="integrador">
+                                <option value="euler" selected>Euler</option>
+                                <option value="rk4">Runge-Kutta 4</option>
+                                <option value="adaptativo">Dormand-Prince (paso adaptativo)</option>
+                            </select>
+                        </div>
+                        <div class="mb-3">
+                            <label for="paso_h_euler" class="form-label">Paso (h) del Integrador (paso inicial si es adaptativo)</label>
                             <input type="number" class="form-control" id="paso_h_euler" name="paso_h_euler" step="0.001" required min="0.001" value="0.1">
                         </div>
                         <div class="d-grid">
@@ -504,6 +796,7 @@ if __name__ == '__main__':
             <h2 class="text-center mb-4">Resultados de la Simulación</h2>
             
             {% if data %}
+            {% if integrador == 'euler' %}
             <div class="download-form-container">
                 <div class="download-form card">
                     <div class="card-body">
@@ -522,11 +815,17 @@ if __name__ == '__main__':
                                 <label for="paso_h_euler" class="form-label">Paso (h)</label>
                                 <input type="number" class="form-control" id="paso_h_euler" name="paso_h_euler" step="0.001" required min="0.001" value="{{ paso_h_inicial or 0.1 }}">
                             </div>
+                            <input type="hidden" name="integrador" value="{{ integrador }}">
                             <button type="submit" class="btn btn-success">Descargar</button>
                         </form>
                     </div>
                 </div>
             </div>
+            {% else %}
+            <div class="alert alert-info text-center" role="alert">
+              La descarga de los pasos de integración solo está disponible para simulaciones hechas con Euler.
+            </div>
+            {% endif %}
 
             <div class="row justify-content-center mb-4">
                 <div class="col-lg-3 col-md-6">
@@ -554,6 +853,7 @@ if __name__ == '__main__':
                     </div>
                 </div>
             </div>
+            <p class="text-center text-muted small mb-4">Tiempos de atención: {{ metricas.tabla_aciertos }} de la tabla precalculada; caché: {{ metricas.cache_aciertos }} aciertos, {{ metricas.cache_fallos }} cálculos</p>
 
             <div class="row justify-content-center mb-4">
                 <div class="col-lg-9">
@@ -565,7 +865,7 @@ if __name__ == '__main__':
                             <li class="list-group-item bg-transparent"><strong>Tiempo entre Llegadas (min):</strong> <code>{{ formula_params.llegada_a }} + RND * ({{ formula_params.llegada_b }} - {{ formula_params.llegada_a }})</code></li>
                             <li class="list-group-item bg-transparent"><strong>Parámetro T de Atención:</strong> <code>{{ formula_params.atencion_a }} + RND * ({{ formula_params.atencion_b }} - {{ formula_params.atencion_a }})</code></li>
                             <li class="list-group-item bg-transparent"><strong>Fin Impaciencia Cliente (min):</strong> <code>Reloj de Llegada + 30</code></li>
-                            <li class="list-group-item bg-transparent"><strong>Duración de Atención (t):</strong> Se obtiene resolviendo <code>dD/dt = C + 0.2*T + t²</code> hasta que <code>D > {{ formula_params.d_corte }}</code>.</li>
+                            <li class="list-group-item bg-transparent"><strong>Duración de Atención (t):</strong> Se obtiene resolviendo <code>dD/dt = C + 0.2*T + t²</code> hasta que <code>D > {{ formula_params.d_corte }}</code> (integrador: {{ formula_params.integrador }}).</li>
                         </ul>
                     </div>
                 </div>
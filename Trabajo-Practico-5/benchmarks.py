@@ -0,0 +1,119 @@
+import itertools
+import time
+import numpy as np
+import pandas as pd
+import TP5
+'''
+Verificaciones y mediciones de rendimiento de los integradores del tiempo de atención
+del TP5.
+
+Uso: python benchmarks.py
+'''
+
+VALORES_C = [0, 1, 3, 10]
+VALORES_T = [130.0, 151.5, 180.0, 0.0, -50.0]
+VALORES_H = [0.5, 0.1, 0.03, 0.001]
+VALORES_CORTE = [-1.0, 0.0, 1.0, 123.456, 700.0]
+
+
+def medir(funcion, *args, repeticiones=3):
+    # Devuelve el mejor tiempo (en segundos) de varias ejecuciones
+    mejor = float("inf")
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        funcion(*args)
+        mejor = min(mejor, time.perf_counter() - inicio)
+    return mejor
+
+
+def resolver_euler_original(C, T, h, d_corte):
+    # El resolver_euler original (un dict por paso), como referencia
+    t = 0
+    D = 0
+    dD_dt_func = lambda t_actual, D_actual: C + 0.2 * T + t_actual**2
+    pasos = []
+    while D <= d_corte:
+        dD_dt_valor = dD_dt_func(t, D)
+        f_por_h = dD_dt_valor * h
+        D_siguiente = D + f_por_h
+        pasos.append({'t (minutos)': t, 'D (valor actual)': D, 'dD/dt': dD_dt_valor,
+                      'f(t,D)*h': f_por_h, 'D_i+1': D_siguiente})
+        D = D_siguiente
+        t += h
+    return t - h, D, pd.DataFrame(pasos)
+
+
+def casos_empate():
+    # Cortes iguales a un D_n alcanzable (el bucle para un paso después), donde
+    # pasos_hasta_corte tiene que devolver None y usar el bucle
+    for C, T, h, n in [(0, 0.0, 0.5, 40), (2, 150.0, 0.25, 40), (3, 147.5, 0.5, 17)]:
+        yield C, T, h, TP5._D_cerrada(n, C + 0.2 * T, h)
+
+
+def verificar_paridad_euler():
+    # Todas las variantes tienen que dar exactamente el t final, el D final y la tabla del bucle
+    casos = list(itertools.product(VALORES_C, VALORES_T, VALORES_H, VALORES_CORTE)) + list(casos_empate())
+    empates = 0
+    for C, T, h, d_corte in casos:
+        t_ref, D_ref, tabla_ref = resolver_euler_original(C, T, h, d_corte)
+        caso = f"C={C}, T={T}, h={h}, d_corte={d_corte}"
+
+        n = TP5.pasos_hasta_corte(C, T, h, d_corte)
+        empates += n is None
+        assert n is None or n == len(tabla_ref), f"pasos_hasta_corte: {n} pasos en vez de {len(tabla_ref)} ({caso})"
+        assert TP5.resolver_euler(C, T, h, d_corte)[:2] == (t_ref, D_ref), f"resolver_euler ({caso})"
+        assert TP5.resolver_euler_exacto(C, T, h, d_corte) == (t_ref, D_ref), f"resolver_euler_exacto ({caso})"
+        t_lote, D_lote = TP5.resolver_euler_lote(C, T, h, d_corte)
+        assert (float(t_lote), float(D_lote)) == (t_ref, D_ref), f"resolver_euler_lote ({caso})"
+
+        t_traza, D_traza, tabla = TP5.resolver_euler(C, T, h, d_corte, traza=True)
+        assert (t_traza, D_traza) == (t_ref, D_ref), f"resolver_euler con traza ({caso})"
+        assert len(tabla) == len(tabla_ref), f"columnas_euler: {len(tabla)} filas ({caso})"
+        if len(tabla_ref):
+            assert list(tabla.columns) == list(tabla_ref.columns)
+            assert (tabla.to_numpy() == tabla_ref.to_numpy()).all(), f"columnas_euler ({caso})"
+
+    # El lote con todos los pares juntos (y cortes distintos por fila) da lo mismo que de a uno
+    C = np.array(VALORES_C)[:, None, None]
+    T = np.array(VALORES_T)[None, :, None]
+    cortes = np.array(VALORES_CORTE)[None, None, :]
+    for h in VALORES_H:
+        t_lote, D_lote = TP5.resolver_euler_lote(C, T, h, cortes)
+        for i, j, k in np.ndindex(t_lote.shape):
+            t_ref, D_ref, _ = resolver_euler_original(VALORES_C[i], VALORES_T[j], h, VALORES_CORTE[k])
+            assert (t_lote[i, j, k], D_lote[i, j, k]) == (t_ref, D_ref), f"resolver_euler_lote en lote (h={h})"
+    print(f"Euler: {len(casos)} casos ({empates} por el bucle) idénticos al bucle original [OK]")
+
+
+def verificar_validacion_paso():
+    # Un paso h no positivo o NaN se rechaza con 400, tanto al simular como al descargar
+    cliente = TP5.app.test_client()
+    formulario = {'tiempo_simulacion': '1', 'unidad_tiempo': 'horas', 'cantidad_iteraciones': '10',
+                  'hora_comienzo': '8', 'llegada_a': '2', 'llegada_b': '4', 'atencion_a': '130',
+                  'atencion_b': '180', 'd_corte': '700', 'integrador': 'euler'}
+    for paso in ['nan', '0', '-0.1']:
+        respuesta = cliente.post('/simular', data=dict(formulario, paso_h_euler=paso))
+        assert respuesta.status_code == 400, f"/simular con h={paso}: {respuesta.status_code}"
+        respuesta = cliente.post('/descargar_euler', data={'paso_h_euler': paso, 'cliente_id_euler': '1',
+                                                            'dia_euler': '1', 'integrador': 'euler'})
+        assert respuesta.status_code == 400, f"/descargar_euler con h={paso}: {respuesta.status_code}"
+    assert cliente.post('/simular', data=dict(formulario, paso_h_euler='0.1')).status_code == 200
+    print("Validación del paso h (nan, 0, negativo): 400 [OK]")
+
+
+def rendimiento_euler(C=2, T=155.0, h=0.001, d_corte=700.0):
+    t_original = medir(resolver_euler_original, C, T, h, d_corte, repeticiones=1)
+    for nombre, funcion, args in [("bucle sin tabla", TP5.resolver_euler, (C, T, h, d_corte)),
+                                  ("tabla por columnas", TP5.columnas_euler, (C, T, h, d_corte)),
+                                  ("exacto", TP5.resolver_euler_exacto, (C, T, h, d_corte))]:
+        segundos = medir(funcion, *args)
+        print(f"{nombre}: {segundos * 1000:.3f} ms ({t_original / segundos:.0f}x el original)")
+    rnd = np.round(np.arange(101) / 100, 2)
+    segundos = medir(TP5.tabla_tiempos_servicio, 130.0, 180.0, h, d_corte)
+    print(f"tabla de tiempos de atención ({TP5.COLA_MAXIMA_TABLA + 1}x{len(rnd)}): {segundos * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    verificar_paridad_euler()
+    verificar_validacion_paso()
+    rendimiento_euler()
@@ -0,0 +1,94 @@
+import time
+import TP5
+'''
+Comparación de los integradores del tiempo de atención del TP5 (Euler, RK4 y
+Dormand-Prince adaptativo): error contra el tiempo de cruce exacto, cantidad de pasos y
+evaluaciones de dD/dt, y tiempo de cálculo.
+
+La ecuación dD/dt = C + 0.2*T + t^2 con D(0) = 0 tiene solución D(t) = K*t + t^3/3
+(K = C + 0.2*T), así que el tiempo exacto en que D llega a d_corte es la raíz de esa cúbica.
+Como dD/dt depende solo de t, un paso de RK4 es la regla de Simpson, que integra exacto
+un polinomio de grado 2: con cualquier h el único error de RK4 es el de redondeo y el de
+ubicar el cruce dentro del último paso. Dormand-Prince también es exacto acá, así que su
+error estimado es ~0 y el paso crece lo máximo permitido (x5) sin importar la tolerancia.
+Euler además devuelve el comienzo del paso que cruza el corte, no el cruce.
+
+Uso: python comparar_integradores.py
+'''
+
+CASOS = [(0, 130.0), (3, 155.0), (10, 180.0)]
+D_CORTE = 700.0
+
+
+def medir(funcion, *args, repeticiones=3):
+    # Devuelve el resultado y el mejor tiempo (en segundos) de varias ejecuciones
+    mejor = float("inf")
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        resultado = funcion(*args)
+        mejor = min(mejor, time.perf_counter() - inicio)
+    return resultado, mejor
+
+
+def cruce_exacto(C, T, d_corte):
+    # Raíz de t^3/3 + K*t - d_corte = 0 por Newton, desde la derecha de la raíz
+    K = C + 0.2 * T
+    t = (3 * d_corte) ** (1 / 3) + abs(K)
+    for _ in range(200):
+        t_nuevo = t - (t**3 / 3 + K * t - d_corte) / (t * t + K)
+        if t_nuevo >= t:
+            break
+        t = t_nuevo
+    return t
+
+
+# Evaluaciones de dD/dt por paso y extra: en RK4 4 por paso más 1 para el cruce, en
+# Dormand-Prince 6 por paso (la 7.a es la 1.a del paso siguiente) más la inicial
+EVALUACIONES = {"rk4": (4, 1), "adaptativo": (6, 1)}
+
+
+def filas_caso(C, T, d_corte):
+    exacto = cruce_exacto(C, T, d_corte)
+    filas = []
+    for h in [0.1, 0.01, 0.001, 0.0001]:
+        (t_final, _, _), segundos = medir(TP5.resolver_euler, C, T, h, d_corte, repeticiones=1)
+        pasos = TP5.pasos_hasta_corte(C, T, h, d_corte) or round(t_final / h) + 1
+        filas.append(("Euler", f"h={h:g}", pasos, pasos, t_final, abs(t_final - exacto), segundos))
+    metodos = [("rk4", "RK4", [(h, f"h={h:g}") for h in [2.0, 0.5, 0.1]]),
+               ("adaptativo", "Dormand-Prince", [(tol, f"tol={tol:g}") for tol in [1e-6, 1e-10]])]
+    for integrador, nombre, argumentos in metodos:
+        por_paso, extra = EVALUACIONES[integrador]
+        for valor, etiqueta in argumentos:
+            if integrador == "rk4":
+                (t_final, _, pasos), segundos = medir(TP5.resolver_rk4, C, T, valor, d_corte)
+            else:
+                (t_final, _, pasos), segundos = medir(
+                    lambda: TP5.resolver_rk_adaptativo(C, T, 0.1, d_corte, tolerancia=valor))
+            filas.append((nombre, etiqueta, pasos, por_paso * pasos + extra, t_final, abs(t_final - exacto),
+                          segundos))
+    return exacto, filas
+
+
+def informe(casos=CASOS, d_corte=D_CORTE):
+    for C, T in casos:
+        exacto, filas = filas_caso(C, T, d_corte)
+        print(f"\nC={C}, T={T:g}, d_corte={d_corte:g}: cruce exacto t*={exacto:.12f} min")
+        print(f"{'Integrador':<16}{'Parámetro':<12}{'Pasos':>9}{'Evaluaciones':>14}{'t final':>18}"
+              f"{'|t - t*|':>12}{'Tiempo (ms)':>13}")
+        for nombre, etiqueta, pasos, evaluaciones, t_final, error, segundos in filas:
+            print(f"{nombre:<16}{etiqueta:<12}{pasos:>9}{evaluaciones:>14}{t_final:>18.12f}"
+                  f"{error:>12.2e}{segundos * 1000:>13.3f}")
+
+        # Pasos que necesita cada método para igualar la precisión de Euler con h=0.001
+        error_euler = next(f[5] for f in filas if f[0] == "Euler" and f[1] == "h=0.001")
+        pasos_euler = next(f[2] for f in filas if f[0] == "Euler" and f[1] == "h=0.001")
+        for nombre in ["RK4", "Dormand-Prince"]:
+            suficientes = [f for f in filas if f[0] == nombre and f[5] <= error_euler]
+            if suficientes:
+                pasos = min(f[2] for f in suficientes)
+                print(f"{nombre}: {pasos} pasos para un error <= {error_euler:.1e} "
+                      f"(Euler h=0.001: {pasos_euler} pasos, {pasos_euler / pasos:.0f} veces más)")
+
+
+if __name__ == "__main__":
+    informe()